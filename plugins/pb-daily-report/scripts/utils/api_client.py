@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+API Client - Notion / Slack REST 직접 호출
+
+duplicate_checker.py, verify_artifacts.py가 검색 한 번, 조회 한 번을 위해
+`claude -p` 에이전트 세션을 띄우지 않도록 Notion / Slack REST API를 직접
+호출하는 얇은 클라이언트입니다. 호스트별 keep-alive 연결을 풀에 두고
+스레드 간에 재사용합니다 (표준 라이브러리만 사용).
+
+환경 변수:
+    NOTION_TOKEN        Notion integration token (없으면 Notion 클라이언트 없음)
+    SLACK_BOT_TOKEN     Slack bot token (없으면 Slack 클라이언트 없음)
+    SLACK_CHANNEL_ID    자동화 운영 채널 ID (verify_artifacts.py)
+    PB_NOTION_API_URL   Notion API 주소 (기본: https://api.notion.com)
+    PB_SLACK_API_URL    Slack API 주소 (기본: https://slack.com)
+
+토큰이 없거나 호출이 실패하면 호출하는 쪽에서 기존 claude 경로로 대체합니다.
+오프라인 테스트는 fake_api_server.py를 PB_*_API_URL로 지정해서 실행합니다.
+"""
+
+import http.client
+import json
+import os
+import threading
+import time
+from urllib.parse import urlencode, urlsplit
+
+NOTION_API_URL = "https://api.notion.com"
+SLACK_API_URL = "https://slack.com"
+NOTION_VERSION = "2022-06-28"
+
+REQUEST_TIMEOUT = 15
+POOL_SIZE = 4  # 호스트별 유휴 연결 수
+MAX_RETRY_AFTER = 10  # 429 응답 시 최대 대기 (초)
+MAX_BLOCKS = 2000  # page_contains가 읽는 최대 블록 수
+
+class ApiError(Exception):
+    """API 호출 실패 (HTTP 오류, Slack ok=false, 잘못된 응답, 프로토콜 오류)"""
+
+    def __init__(self, message, status=None, code=None):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+
+class ConnectionPool:
+    """(scheme, host, port)별 keep-alive HTTP 연결 풀 (스레드 안전)"""
+
+    def __init__(self, size=POOL_SIZE):
+        self.size = size
+        self._idle = {}
+        self._lock = threading.Lock()
+
+    def _get(self, key, timeout):
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, host, port = key
+        conn_cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+        return conn_cls(host, port, timeout=timeout), False
+
+    def _put(self, key, conn):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.size:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, url, method="GET", body=None, headers=None, timeout=REQUEST_TIMEOUT):
+        """요청을 보내고 (status, headers, body bytes)를 반환
+
+        풀에서 꺼낸 연결이 서버 쪽에서 이미 닫혀 있으면 새 연결로 한 번 재시도합니다.
+        """
+        parts = urlsplit(url)
+        key = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        path = parts.path + (f"?{parts.query}" if parts.query else "")
+
+        for attempt in range(2):
+            conn, reused = self._get(key, timeout)
+            try:
+                conn.request(method, path, body=body, headers=headers or {})
+                resp = conn.getresponse()
+                data = resp.read()
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except Exception:
+                conn.close()
+                raise
+            if resp.will_close:
+                conn.close()
+            else:
+                self._put(key, conn)
+            return resp.status, resp.headers, data
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+# 모든 클라이언트가 공유하는 연결 풀
+POOL = ConnectionPool()
+
+class HttpClient:
+    """JSON REST 클라이언트 기반 클래스"""
+
+    def __init__(self, base_url, headers, pool=None, timeout=REQUEST_TIMEOUT):
+        self.base_url = base_url.rstrip("/")
+        self.headers = headers
+        self.pool = pool or POOL
+        self.timeout = timeout
+
+    def request_json(self, method, path, payload=None, params=None):
+        url = self.base_url + path
+        if params:
+            url += "?" + urlencode({k: v for k, v in params.items() if v is not None})
+        body = json.dumps(payload).encode() if payload is not None else None
+        headers = dict(self.headers)
+        if body is not None:
+            headers["Content-Type"] = "application/json; charset=utf-8"
+
+        for attempt in range(2):
+            try:
+                status, resp_headers, data = self.pool.request(url, method, body, headers, self.timeout)
+            except http.client.HTTPException as e:
+                # IncompleteRead, BadStatusLine 등은 OSError가 아니므로 ApiError로 통일
+                raise ApiError(f"{method} {path}: {type(e).__name__}: {e}") from e
+            if status == 429 and attempt == 0:
+                try:
+                    delay = float(resp_headers.get("Retry-After", 1))
+                except ValueError:
+                    delay = 1
+                time.sleep(min(delay, MAX_RETRY_AFTER))
+                continue
+            break
+
+        try:
+            result = json.loads(data) if data else {}
+        except (json.JSONDecodeError, UnicodeDecodeError):
+            raise ApiError(f"{method} {path}: invalid JSON response (HTTP {status})", status)
+        if not isinstance(result, dict):
+            raise ApiError(f"{method} {path}: unexpected JSON {type(result).__name__} (HTTP {status})", status)
+        if status >= 400:
+            code, message = result.get("code"), result.get("message")
+            raise ApiError(f"{method} {path}: HTTP {status} {code or ''} {message or ''}".strip(), status, code)
+        return result
+
+class NotionClient(HttpClient):
+    """Notion REST API (검색, 페이지/블록 조회)"""
+
+    def __init__(self, token, base_url=None, pool=None, timeout=REQUEST_TIMEOUT):
+        super().__init__(
+            base_url or os.environ.get("PB_NOTION_API_URL") or NOTION_API_URL,
+            {"Authorization": f"Bearer {token}", "Notion-Version": NOTION_VERSION},
+            pool, timeout,
+        )
+
+    def search(self, query, page_size=20):
+        """제목 검색 결과 페이지 목록"""
+        result = self.request_json("POST", "/v1/search", {
+            "query": query,
+            "filter": {"property": "object", "value": "page"},
+            "page_size": page_size,
+        })
+        return result.get("results", [])
+
+    def retrieve_page(self, page_id):
+        return self.request_json("GET", f"/v1/pages/{page_id}")
+
+    def iter_blocks(self, block_id, max_blocks=MAX_BLOCKS):
+        """블록(하위 블록 포함)을 순서대로 반환"""
+        stack = [block_id]
+        seen = 0
+        while stack and seen < max_blocks:
+            parent = stack.pop()
+            cursor = None
+            children = []
+            while True:
+                result = self.request_json("GET", f"/v1/blocks/{parent}/children",
+                                           params={"page_size": 100, "start_cursor": cursor})
+                children.extend(result.get("results", []))
+                if not result.get("has_more"):
+                    break
+                cursor = result.get("next_cursor")
+            for block in children:
+                seen += 1
+                yield block
+                if seen >= max_blocks:
+                    return
+            stack.extend(b["id"] for b in reversed(children) if b.get("has_children"))
+
+    def page_contains(self, page_id, needle):
+        """페이지 속성 또는 본문에 needle 문자열이 있는지"""
+        page = self.retrieve_page(page_id)
+        if needle in json.dumps(page.get("properties", {}), ensure_ascii=False):
+            return True
+        for block in self.iter_blocks(page_id):
+            if needle in block_text(block):
+                return True
+        return False
+
+class SlackClient(HttpClient):
+    """Slack Web API (conversations.history)"""
+
+    def __init__(self, token, base_url=None, pool=None, timeout=REQUEST_TIMEOUT):
+        super().__init__(
+            base_url or os.environ.get("PB_SLACK_API_URL") or SLACK_API_URL,
+            {"Authorization": f"Bearer {token}"},
+            pool, timeout,
+        )
+
+    def call(self, method, **params):
+        result = self.request_json("GET", f"/api/{method}", params=params)
+        if not result.get("ok"):
+            raise ApiError(f"{method}: {result.get('error', 'unknown error')}", code=result.get("error"))
+        return result
+
+    def message_text(self, channel, ts):
+        """채널에서 ts에 해당하는 메시지 본문 (없으면 None)"""
+        result = self.call("conversations.history", channel=channel, latest=ts, oldest=ts,
+                           inclusive="true", limit=1)
+        for message in result.get("messages", []):
+            if message.get("ts") == ts:
+                return message.get("text", "")
+        return None
+
+def page_title(page):
+    """Notion 페이지 객체의 제목"""
+    for prop in page.get("properties", {}).values():
+        if prop.get("type") == "title":
+            return "".join(t.get("plain_text", "") for t in prop.get("title", []))
+    return ""
+
+def block_text(block):
+    """블록의 rich_text 내용을 이어 붙인 문자열"""
+    content = block.get(block.get("type", ""), {})
+    if not isinstance(content, dict):
+        return ""
+    return "".join(t.get("plain_text", "") for t in content.get("rich_text", []))
+
+def notion_client():
+    """NOTION_TOKEN이 있으면 NotionClient, 없으면 None"""
+    token = os.environ.get("NOTION_TOKEN")
+    return NotionClient(token) if token else None
+
+def slack_client():
+    """SLACK_BOT_TOKEN이 있으면 SlackClient, 없으면 None"""
+    token = os.environ.get("SLACK_BOT_TOKEN")
+    return SlackClient(token) if token else None
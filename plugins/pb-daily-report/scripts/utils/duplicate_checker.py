@@ -4,16 +4,33 @@ Duplicate Checker - PB Daily Report 중복 생성 방지
 
 Notion에서 해당 날짜의 PB Daily Report가 이미 존재하는지
 확인하여 중복 생성을 방지합니다.
+
+로컬 페이지 인덱스(page_index.py, ~/.pb-reports/page-index.json)를 먼저
+확인하고, 기록이 없거나 TTL이 지났거나 --revalidate인 경우에만 Notion을
+검색합니다. NOTION_TOKEN이 있으면 Notion API를 직접 호출하고(api_client.py),
+없거나 실패하면 claude 검색으로 대체합니다.
 """
 
+import argparse
 import json
-import sys
+import re
 import subprocess
+import sys
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import api_client
+import page_index
 
-def search_existing_pages(date_str, title=None, claude_path="claude"):
-    """Notion에서 해당 날짜의 페이지가 이미 존재하는지 확인"""
+# 검색 1건당 제한 시간 / 전체 검색 제한 시간 (초)
+SEARCH_TIMEOUT = 60
+SEARCH_DEADLINE = 90
 
+def build_search_queries(date_str, title=None):
+    """검색할 쿼리 목록 (우선순위 순)"""
     search_queries = [
         f"PB Daily Report {date_str}",
         f"PB Daily Report - {date_str}",
@@ -23,105 +40,242 @@ def search_existing_pages(date_str, title=None, claude_path="claude"):
     if title:
         search_queries.insert(0, title)
 
+    return search_queries
+
+def is_exact_match(page_title, date_str, title=None):
+    """페이지 제목이 해당 날짜의 PB Daily Report 제목과 정확히 일치하는지 확인"""
+    page_title = page_title.strip()
+    if title and page_title == title.strip():
+        return True
+    return re.fullmatch(rf"PB Daily Report(?: -)? {re.escape(date_str)}(?: \(.+\))?", page_title) is not None
+
+def parse_search_output(stdout, date_str, query):
+    """claude 검색 결과(JSON)에서 해당 날짜의 PB Daily Report 페이지 추출
+
+    결과를 해석할 수 없으면 None (검색 실패로 취급)
+    """
+    try:
+        output = json.loads(stdout)
+        result_str = output.get("result", "")
+
+        # result가 JSON 문자열인 경우 다시 파싱
+        if isinstance(result_str, str) and result_str.strip().startswith('{'):
+            search_results = json.loads(result_str)
+        elif isinstance(result_str, dict):
+            search_results = result_str
+        else:
+            return None
+        items = search_results.get("results", [])
+    except (json.JSONDecodeError, AttributeError):
+        return None
+
+    return matching_pages(items, date_str, query)
+
+def matching_pages(items, date_str, query):
+    """검색 결과 중 해당 날짜의 PB Daily Report 페이지"""
     found_pages = []
 
-    for query in search_queries:
-        try:
-            # Notion 검색 실행
-            cmd = [
-                claude_path,
-                "-p", f'mcp__notionMCP__notion-search로 "{query}" 검색하여 결과를 JSON으로 반환하세요. query_type은 internal로 설정하세요.',
-                "--output-format", "json",
-                "--max-turns", "3",
-                "--permission-mode", "bypassPermissions",
-                "--allowedTools", "mcp__notionMCP"
-            ]
-
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=60)
-
-            if result.returncode != 0:
-                continue
-
-            # 결과 파싱
-            try:
-                output = json.loads(result.stdout)
-                result_str = output.get("result", "")
-
-                # result가 JSON 문자열인 경우 다시 파싱
-                if isinstance(result_str, str) and result_str.strip().startswith('{'):
-                    search_results = json.loads(result_str)
-                elif isinstance(result_str, dict):
-                    search_results = result_str
-                else:
-                    continue
-
-                # 검색 결과 분석
-                if "results" in search_results:
-                    for item in search_results["results"]:
-                        page_title = item.get("title", "")
-                        page_id = item.get("id", "")
-                        page_url = item.get("url", "")
-
-                        # 날짜가 정확히 일치하는지 확인
-                        if date_str in page_title and "PB Daily Report" in page_title:
-                            found_pages.append({
-                                "id": page_id,
-                                "title": page_title,
-                                "url": page_url,
-                                "timestamp": item.get("timestamp"),
-                                "search_query": query
-                            })
-
-            except json.JSONDecodeError:
-                continue
+    # 검색 결과 분석
+    for item in items:
+        page_title = item.get("title", "")
 
-        except subprocess.TimeoutExpired:
-            print(f"WARNING: 검색 타임아웃 - query: {query}")
-            continue
-        except Exception as e:
-            print(f"WARNING: 검색 실패 - query: {query}, error: {e}")
-            continue
+        # 날짜가 정확히 일치하는지 확인
+        if date_str in page_title and "PB Daily Report" in page_title:
+            found_pages.append({
+                "id": item.get("id", ""),
+                "title": page_title,
+                "url": item.get("url", ""),
+                "timestamp": item.get("timestamp"),
+                "search_query": query
+            })
 
-        # 검색 간 잠시 대기
-        time.sleep(1)
+    return found_pages
 
-    # 중복 제거 (같은 ID인 경우)
+def search_pages_api(client, date_str, title=None):
+    """Notion API로 검색 (정확히 일치하는 제목이 나오면 중단)"""
     unique_pages = {}
-    for page in found_pages:
-        page_id = page["id"]
-        if page_id not in unique_pages:
-            unique_pages[page_id] = page
-
+    for query in build_search_queries(date_str, title):
+        items = [{
+            "id": page.get("id", ""),
+            "title": api_client.page_title(page),
+            "url": page.get("url", ""),
+            "timestamp": page.get("last_edited_time")
+        } for page in client.search(query)]
+        for page in matching_pages(items, date_str, query):
+            unique_pages.setdefault(page["id"], page)
+        if any(is_exact_match(page["title"], date_str, title) for page in unique_pages.values()):
+            break
     return list(unique_pages.values())
 
-def check_duplicate_by_date(date_str, title=None):
-    """날짜 기반으로 중복 페이지 확인"""
+def search_existing_pages(date_str, title=None, claude_path="claude", deadline=SEARCH_DEADLINE):
+    """Notion에서 해당 날짜의 페이지가 이미 존재하는지 확인 (페이지 목록 반환)"""
+    return search_notion(date_str, title, claude_path, deadline)[0]
+
+def search_notion(date_str, title=None, claude_path="claude", deadline=SEARCH_DEADLINE):
+    """Notion에서 해당 날짜의 페이지 검색. (페이지 목록, 검색 완료 여부)를 반환
+
+    NOTION_TOKEN이 있으면 Notion API로 검색합니다. 그 외에는 쿼리별 claude
+    검색을 동시에 실행하고, 정확히 일치하는 제목이 나오면 나머지 검색은
+    취소합니다. 전체 검색은 deadline(초) 안에 끝납니다.
+
+    검색 완료 여부는 실패, 타임아웃, 해석할 수 없는 결과 없이 모든 쿼리가
+    끝났는지(또는 정확히 일치하는 페이지를 찾았는지)입니다. 완료되지 않은
+    검색의 빈 결과는 "페이지 없음"이 아닙니다.
+    """
+
+    client = api_client.notion_client()
+    if client:
+        try:
+            return search_pages_api(client, date_str, title), True
+        except (api_client.ApiError, OSError) as e:
+            print(f"WARNING: Notion API 검색 실패, claude 검색으로 대체 - {e}")
+
+    search_queries = build_search_queries(date_str, title)
+    end_time = time.monotonic() + deadline
+    stop = threading.Event()
+    procs = []
+    procs_lock = threading.Lock()
+
+    def run_search(query):
+        if stop.is_set():
+            return None
+
+        # Notion 검색 실행
+        cmd = [
+            claude_path,
+            "-p", f'mcp__notionMCP__notion-search로 "{query}" 검색하여 결과를 JSON으로 반환하세요. query_type은 internal로 설정하세요.',
+            "--output-format", "json",
+            "--max-turns", "3",
+            "--permission-mode", "bypassPermissions",
+            "--allowedTools", "mcp__notionMCP"
+        ]
+
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+        with procs_lock:
+            procs.append(proc)
+        if stop.is_set():
+            proc.kill()
+
+        timeout = max(0, min(SEARCH_TIMEOUT, end_time - time.monotonic()))
+        try:
+            stdout, _ = proc.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.communicate()
+            print(f"WARNING: 검색 타임아웃 - query: {query}")
+            return None
+
+        if proc.returncode != 0:
+            return None
+
+        return parse_search_output(stdout, date_str, query)
+
+    results = {}  # query -> 페이지 목록 (실패한 검색은 None)
+    with ThreadPoolExecutor(max_workers=len(search_queries)) as pool:
+        pending = {pool.submit(run_search, query): query for query in search_queries}
+        while pending:
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                print(f"WARNING: 검색 제한 시간({deadline}초) 초과 - 남은 검색 {len(pending)}건 취소")
+                break
+
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                query = pending.pop(future)
+                try:
+                    results[query] = future.result()
+                except Exception as e:
+                    print(f"WARNING: 검색 실패 - query: {query}, error: {e}")
+
+            # 정확히 일치하는 페이지를 찾으면 나머지 검색 취소
+            if any(is_exact_match(page["title"], date_str, title)
+                   for pages in results.values() for page in pages or []):
+                break
+
+        stop.set()
+        with procs_lock:
+            for proc in procs:
+                if proc.poll() is None:
+                    proc.kill()
+
+    # 쿼리 우선순위 순으로 모으고 중복 제거 (같은 ID인 경우)
+    unique_pages = {}
+    for query in search_queries:
+        for page in results.get(query) or []:
+            page_id = page["id"]
+            if page_id not in unique_pages:
+                unique_pages[page_id] = page
+
+    complete = all(results.get(query) is not None for query in search_queries)
+    return list(unique_pages.values()), complete
+
+def _duplicate_result(date_str, existing_pages, source):
+    # 가장 최근 페이지 선택
+    latest_page = max(existing_pages, key=lambda x: x.get("timestamp") or "")
+
+    return {
+        "has_duplicate": True,
+        "message": f"⚠️ 중복 발견: {date_str} 날짜의 PB Daily Report가 이미 존재합니다.",
+        "date": date_str,
+        "source": source,
+        "search_count": len(existing_pages),
+        "existing_pages": existing_pages,
+        "latest_page": latest_page,
+        "recommendation": "기존 페이지 업데이트 또는 실행 건너뛰기"
+    }
+
+def _indexed_pages(entries):
+    return [{
+        "id": e.get("page_id", ""),
+        "title": e.get("title", ""),
+        "url": e.get("url", ""),
+        "timestamp": e.get("timestamp"),
+        "run_id": e.get("run_id")
+    } for e in entries]
+
+def check_duplicate_by_date(date_str, title=None, revalidate=False,
+                            ttl_hours=page_index.INDEX_TTL_HOURS, index_path=page_index.INDEX_PATH):
+    """날짜 기반으로 중복 페이지 확인
+
+    로컬 인덱스에 TTL 이내로 확인된 페이지가 있으면 Notion 검색 없이
+    바로 중복으로 판단합니다. Notion 검색 결과는 인덱스에 반영됩니다.
+    인덱스 기록은 모든 검색이 끝났는데도 페이지가 없을 때만 지우고,
+    검색이 실패하면 (TTL이 지났더라도) 인덱스 기록을 중복으로 봅니다.
+    """
+
+    indexed = page_index.lookup(date_str, index_path)
+    if indexed and not revalidate and any(page_index.is_fresh(e, ttl_hours) for e in indexed):
+        return _duplicate_result(date_str, _indexed_pages(indexed), "index")
 
     print(f"🔍 중복 페이지 검색 중... (날짜: {date_str})")
 
     try:
-        existing_pages = search_existing_pages(date_str, title)
+        existing_pages, complete = search_notion(date_str, title)
+
+        if not existing_pages and not complete and indexed:
+            print("WARNING: Notion 검색이 완료되지 않아 로컬 인덱스 기록을 중복으로 판단합니다.")
+            result = _duplicate_result(date_str, _indexed_pages(indexed), "index")
+            result["stale"] = True
+            return result
 
         if not existing_pages:
+            # 모든 검색이 끝났는데 없는 페이지는 인덱스에서도 제거 (삭제된 페이지)
+            if indexed:
+                page_index.forget(date_str, path=index_path)
             return {
                 "has_duplicate": False,
                 "message": f"✅ 중복 없음: {date_str} 날짜의 PB Daily Report가 없습니다.",
                 "date": date_str,
-                "search_count": 0
+                "source": "notion",
+                "search_count": 0,
+                "search_complete": complete
             }
 
-        # 가장 최근 페이지 선택
-        latest_page = max(existing_pages, key=lambda x: x.get("timestamp", ""))
+        for page in existing_pages:
+            page_index.record_page(date_str, page["id"], page.get("url", ""),
+                                   title=page.get("title"), path=index_path)
 
-        return {
-            "has_duplicate": True,
-            "message": f"⚠️ 중복 발견: {date_str} 날짜의 PB Daily Report가 이미 존재합니다.",
-            "date": date_str,
-            "search_count": len(existing_pages),
-            "existing_pages": existing_pages,
-            "latest_page": latest_page,
-            "recommendation": "기존 페이지 업데이트 또는 실행 건너뛰기"
-        }
+        return _duplicate_result(date_str, existing_pages, "notion")
 
     except Exception as e:
         return {
@@ -135,12 +289,20 @@ def check_duplicate_by_date(date_str, title=None):
 def main():
     """메인 실행 함수"""
     if len(sys.argv) < 2:
-        print("Usage: python3 duplicate_checker.py <date> [title]")
+        print("Usage: python3 duplicate_checker.py <date> [title] [--revalidate] [--ttl HOURS]")
         print("Example: python3 duplicate_checker.py 2025-09-22 'PB Daily Report - 2025-09-22 (월요일)'")
         sys.exit(1)
 
-    date_str = sys.argv[1]
-    title = sys.argv[2] if len(sys.argv) > 2 else None
+    parser = argparse.ArgumentParser(description="PB Daily Report 중복 생성 방지")
+    parser.add_argument("date", help="리포트 날짜 (YYYY-MM-DD)")
+    parser.add_argument("title", nargs="?", help="페이지 제목")
+    parser.add_argument("--revalidate", action="store_true", help="로컬 인덱스를 무시하고 Notion에서 다시 확인")
+    parser.add_argument("--ttl", type=float, default=page_index.INDEX_TTL_HOURS,
+                        help=f"인덱스 기록을 신뢰하는 시간 (기본: {page_index.INDEX_TTL_HOURS}시간)")
+    args = parser.parse_args()
+
+    date_str = args.date
+    title = args.title
 
     # 날짜 형식 검증
     try:
@@ -151,7 +313,7 @@ def main():
         sys.exit(2)
 
     # 중복 검사 실행
-    result = check_duplicate_by_date(date_str, title)
+    result = check_duplicate_by_date(date_str, title, revalidate=args.revalidate, ttl_hours=args.ttl)
 
     # 결과 출력
     print(json.dumps(result, ensure_ascii=False, indent=2))
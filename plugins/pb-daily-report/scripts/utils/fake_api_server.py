@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Fake API Server - Notion / Slack REST API 오프라인 테스트용 서버
+
+api_client.py가 쓰는 엔드포인트만 흉내 냅니다:
+    POST /v1/search                     제목에 query가 포함된 페이지
+    GET  /v1/pages/{id}                 페이지 (없으면 404 object_not_found)
+    GET  /v1/blocks/{id}/children       본문 블록 (page_size / start_cursor 페이지네이션)
+    GET  /api/conversations.history     channel, latest/oldest/inclusive로 메시지 조회
+
+Usage:
+    python3 fake_api_server.py --port 8765 --fixtures fixtures.json
+    PB_NOTION_API_URL=http://127.0.0.1:8765 PB_SLACK_API_URL=http://127.0.0.1:8765 \\
+        NOTION_TOKEN=fake SLACK_BOT_TOKEN=fake python3 duplicate_checker.py 2025-09-22
+
+fixtures.json:
+    {"pages": [{"id": "...", "title": "...", "blocks": ["본문 문단", ...]}],
+     "messages": {"<channel>": [{"ts": "...", "text": "..."}]}}
+"""
+
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+
+class FakeApiServer:
+    """백그라운드 스레드에서 도는 fake Notion / Slack 서버
+
+    pages: [{"id", "title", "blocks": [str], "url"?, "last_edited_time"?}]
+    messages: {channel: [{"ts", "text"}]}
+    """
+
+    def __init__(self, pages=(), messages=None, token="fake-token", host="127.0.0.1", port=0):
+        self.pages = {p["id"]: p for p in pages}
+        self.messages = messages or {}
+        self.token = token
+        self.requests = []  # (method, path)
+        self.connections = 0
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # --- Notion / Slack 응답 ---
+
+    def page_object(self, page):
+        return {
+            "object": "page",
+            "id": page["id"],
+            "url": page.get("url", f"https://www.notion.so/{page['id'].replace('-', '')}"),
+            "created_time": page.get("created_time", "2025-01-01T00:00:00.000Z"),
+            "last_edited_time": page.get("last_edited_time", "2025-01-01T00:00:00.000Z"),
+            "properties": {
+                "이름": {"id": "title", "type": "title",
+                         "title": [{"type": "text", "plain_text": page["title"]}]},
+            },
+        }
+
+    def block_objects(self, page):
+        return [{
+            "object": "block",
+            "id": f"{page['id']}-b{i}",
+            "type": "paragraph",
+            "has_children": False,
+            "paragraph": {"rich_text": [{"type": "text", "plain_text": text}]},
+        } for i, text in enumerate(page.get("blocks", []))]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive
+
+            def setup(self):
+                super().setup()
+                with server._lock:
+                    server.connections += 1
+
+            def log_message(self, format, *args):
+                pass
+
+            def send_json(self, status, payload):
+                body = json.dumps(payload, ensure_ascii=False).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def authorized(self):
+                return self.headers.get("Authorization") == f"Bearer {server.token}"
+
+            def read_json(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length)) if length else {}
+
+            def do_POST(self):
+                path = urlsplit(self.path).path
+                payload = self.read_json()
+                with server._lock:
+                    server.requests.append(("POST", path))
+                if not self.authorized():
+                    return self.send_json(401, {"object": "error", "status": 401, "code": "unauthorized"})
+                if path == "/v1/search":
+                    query = payload.get("query", "").lower()
+                    results = [server.page_object(p) for p in server.pages.values()
+                               if query in p["title"].lower()]
+                    return self.send_json(200, {"object": "list", "results": results[:payload.get("page_size", 100)],
+                                                "has_more": False, "next_cursor": None})
+                self.send_json(404, {"object": "error", "status": 404, "code": "invalid_request_url"})
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                segments = parts.path.strip("/").split("/")
+                with server._lock:
+                    server.requests.append(("GET", parts.path))
+
+                if parts.path.startswith("/api/"):
+                    if not self.authorized():
+                        return self.send_json(200, {"ok": False, "error": "invalid_auth"})
+                    if segments[1] != "conversations.history":
+                        return self.send_json(200, {"ok": False, "error": "unknown_method"})
+                    if params.get("channel") not in server.messages:
+                        return self.send_json(200, {"ok": False, "error": "channel_not_found"})
+                    messages = server.messages[params["channel"]]
+                    inclusive = params.get("inclusive") == "true"
+                    if "latest" in params:
+                        messages = [m for m in messages if float(m["ts"]) < float(params["latest"])
+                                    or (inclusive and m["ts"] == params["latest"])]
+                    if "oldest" in params:
+                        messages = [m for m in messages if float(m["ts"]) > float(params["oldest"])
+                                    or (inclusive and m["ts"] == params["oldest"])]
+                    messages = sorted(messages, key=lambda m: float(m["ts"]), reverse=True)
+                    return self.send_json(200, {"ok": True, "messages": messages[:int(params.get("limit", 100))]})
+
+                if not self.authorized():
+                    return self.send_json(401, {"object": "error", "status": 401, "code": "unauthorized"})
+                if segments[:2] == ["v1", "pages"] and len(segments) == 3:
+                    page = server.pages.get(segments[2])
+                    if page is None:
+                        return self.send_json(404, {"object": "error", "status": 404, "code": "object_not_found"})
+                    return self.send_json(200, server.page_object(page))
+                if segments[:2] == ["v1", "blocks"] and len(segments) == 4 and segments[3] == "children":
+                    page = server.pages.get(segments[2])
+                    blocks = server.block_objects(page) if page else []
+                    start = int(params.get("start_cursor") or 0)
+                    size = int(params.get("page_size", 100))
+                    end = start + size
+                    return self.send_json(200, {"object": "list", "results": blocks[start:end],
+                                                "has_more": end < len(blocks),
+                                                "next_cursor": str(end) if end < len(blocks) else None})
+                self.send_json(404, {"object": "error", "status": 404, "code": "invalid_request_url"})
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="Notion / Slack REST API fake 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--token", default="fake", help="허용할 Bearer 토큰 (기본: fake)")
+    parser.add_argument("--fixtures", help="pages / messages JSON 파일")
+    args = parser.parse_args()
+
+    fixtures = {}
+    if args.fixtures:
+        with open(args.fixtures, encoding="utf-8") as f:
+            fixtures = json.load(f)
+
+    server = FakeApiServer(fixtures.get("pages", []), fixtures.get("messages", {}),
+                           token=args.token, host=args.host, port=args.port)
+    print(f"Fake Notion/Slack API: {server.url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Page Index - 생성된 PB Daily Report 페이지의 로컬 인덱스
+
+~/.pb-reports/page-index.json 에 날짜별 Notion 페이지(page_id, url, run_id,
+timestamp, slack_ts)를 기록합니다. duplicate_checker.py가 Notion 검색보다 먼저
+이 인덱스를 확인하므로, "오늘 이미 생성됨" 확인이 즉시 끝납니다.
+
+Usage:
+    python3 page_index.py record 2025-09-22 --page-id <id> --url <url> [--run-id RUN_ID] [--title TITLE]
+    python3 page_index.py record 2025-09-22 --page-id <id> --slack-ts <ts>   # Slack 발송 후
+    python3 page_index.py get 2025-09-22
+    python3 page_index.py forget 2025-09-22 [--page-id <id>]
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+INDEX_PATH = Path.home() / ".pb-reports" / "page-index.json"
+INDEX_VERSION = 1
+
+# 이 시간이 지난 항목은 Notion에서 다시 확인 (페이지 삭제 대비)
+INDEX_TTL_HOURS = 24
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+def load_index(path=INDEX_PATH):
+    """인덱스 로드 (없거나 손상된 경우 빈 인덱스)"""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return {"version": INDEX_VERSION, "pages": {}}
+    if not isinstance(data, dict) or not isinstance(data.get("pages"), dict):
+        return {"version": INDEX_VERSION, "pages": {}}
+    return data
+
+def save_index(index, path=INDEX_PATH):
+    """인덱스 저장 (임시 파일에 쓴 뒤 교체 - 중간에 끊겨도 손상되지 않음)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".page-index-", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+def lookup(date_str, path=INDEX_PATH):
+    """해당 날짜에 기록된 페이지 목록"""
+    return list(load_index(path)["pages"].get(date_str, []))
+
+def is_fresh(entry, ttl_hours=INDEX_TTL_HOURS):
+    """마지막 확인 시각이 TTL 이내인지"""
+    try:
+        verified_at = datetime.fromisoformat(entry.get("verified_at") or entry["timestamp"])
+    except (KeyError, TypeError, ValueError):
+        return False
+    return datetime.now(timezone.utc) - verified_at < timedelta(hours=ttl_hours)
+
+def record_page(date_str, page_id, url="", run_id=None, title=None, path=INDEX_PATH, **extra):
+    """페이지 기록 (같은 page_id가 있으면 갱신). 기록된 항목을 반환
+
+    extra 필드(예: slack_ts)도 함께 저장됩니다.
+    """
+    index = load_index(path)
+    entries = index["pages"].setdefault(date_str, [])
+    now = _now()
+    entry = next((e for e in entries if e.get("page_id") == page_id), None)
+    if entry is None:
+        entry = {"page_id": page_id, "timestamp": now}
+        entries.append(entry)
+    if url:
+        entry["url"] = url
+    if title:
+        entry["title"] = title
+    if run_id:
+        entry["run_id"] = run_id
+    entry.update({k: v for k, v in extra.items() if v is not None})
+    entry["verified_at"] = now
+    save_index(index, path)
+    return entry
+
+def forget(date_str, page_id=None, path=INDEX_PATH):
+    """날짜(또는 특정 페이지) 기록 삭제. 삭제된 항목 수를 반환"""
+    index = load_index(path)
+    entries = index["pages"].get(date_str, [])
+    keep = [e for e in entries if page_id is not None and e.get("page_id") != page_id]
+    removed = len(entries) - len(keep)
+    if keep:
+        index["pages"][date_str] = keep
+    else:
+        index["pages"].pop(date_str, None)
+    if removed:
+        save_index(index, path)
+    return removed
+
+def main():
+    parser = argparse.ArgumentParser(description="PB Daily Report 페이지 로컬 인덱스")
+    parser.add_argument("--index", default=str(INDEX_PATH), help=f"인덱스 파일 (기본: {INDEX_PATH})")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_record = sub.add_parser("record", help="생성된 페이지 기록")
+    p_record.add_argument("date", help="리포트 날짜 (YYYY-MM-DD)")
+    p_record.add_argument("--page-id", required=True)
+    p_record.add_argument("--url", default="")
+    p_record.add_argument("--run-id")
+    p_record.add_argument("--title")
+    p_record.add_argument("--slack-ts", help="Slack 메인 메시지 ts (verify_artifacts.py --batch에서 사용)")
+
+    p_get = sub.add_parser("get", help="날짜의 기록 조회")
+    p_get.add_argument("date")
+
+    p_forget = sub.add_parser("forget", help="날짜(또는 페이지) 기록 삭제")
+    p_forget.add_argument("date")
+    p_forget.add_argument("--page-id")
+
+    args = parser.parse_args()
+
+    try:
+        datetime.strptime(args.date, '%Y-%m-%d')
+    except ValueError:
+        print(f"❌ ERROR: 잘못된 날짜 형식: {args.date} (YYYY-MM-DD 형식 필요)")
+        sys.exit(2)
+
+    if args.command == "record":
+        entry = record_page(args.date, args.page_id, args.url, args.run_id, args.title, path=args.index,
+                            slack_ts=args.slack_ts)
+        print(json.dumps(entry, ensure_ascii=False, indent=2))
+    elif args.command == "get":
+        entries = lookup(args.date, args.index)
+        print(json.dumps(entries, ensure_ascii=False, indent=2))
+        sys.exit(0 if entries else 1)
+    else:
+        removed = forget(args.date, args.page_id, args.index)
+        print(f"{removed}건 삭제")
+
+if __name__ == "__main__":
+    main()
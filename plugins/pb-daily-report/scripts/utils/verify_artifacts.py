@@ -1,50 +1,177 @@
 #!/usr/bin/env python3
-import json, sys, subprocess, shlex, re
+"""
+Verify Artifacts - Notion 페이지 / Slack 메시지에 RUN_ID가 들어갔는지 확인
+
+Usage:
+    ... | python3 verify_artifacts.py RUN_ID [--json]    # stdin: 실행 결과 JSON
+    python3 verify_artifacts.py --batch [--since DATE] [--until DATE] [RUN_ID ...]
+
+Notion과 Slack 확인은 동시에 실행합니다. --json은 두 결과를 모두 담은 JSON을
+출력하고, --batch는 ledger(page_index.py의 page-index.json)에 기록된 실행들을
+한 번에 확인합니다.
+
+Exit codes (단일 실행):
+    0 OK / 3 notion fetch failed / 4 notion run_id not found
+    5 slack fetch failed / 6 slack run_id not found
+Exit codes (--batch): 0 모두 OK / 1 하나 이상 실패
+"""
+import argparse, json, sys, subprocess, re, os, time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import api_client
+import page_index
 
 CLAUDE = "claude"
+BATCH_WORKERS = 8
 
-if len(sys.argv) != 2:
-    print("usage: verify_artifacts.py RUN_ID", file=sys.stderr)
-    sys.exit(2)
-RUN_ID = sys.argv[1].strip()
+# 결과: "OK" (RUN_ID 확인), "MISS" (RUN_ID 없음), "FAIL" (조회 실패)
 
-wrapper = json.loads(sys.stdin.read().strip())
-inner = json.loads(re.search(r'\{.*\}', wrapper.get("result","")).group(0))
-page_id = inner["notion_page_id"]
-slack_ts = inner["slack_ts"]
+def claude_check(prompt, tool):
+    r = subprocess.run([CLAUDE, "-p", prompt, "--output-format", "json",
+                        "--max-turns", "2", "--permission-mode", "bypassPermissions",
+                        "--allowedTools", tool, "Read"],
+                       capture_output=True, text=True, timeout=120)
+    if r.returncode != 0:
+        return "FAIL"
+    has_ok = re.search(r'"result"\s*:\s*"(OK|MISS)"', r.stdout)
+    return "OK" if has_ok and has_ok.group(1) == "OK" else "MISS"
 
 # 1) Notion 페이지에 RUN_ID 포함되어 있는지 (fetch)
-prompt_notion = f"""
-mcp__notionMCP__fetch 도구로 page_id={page_id} 내용을 가져와 RUN_ID={RUN_ID} 문자열이 내용/속성 어디든 포함되는지 확인해.
+def check_notion(page_id, run_id):
+    client = api_client.notion_client()
+    if client:
+        try:
+            return "OK" if client.page_contains(page_id, run_id) else "MISS"
+        except (api_client.ApiError, OSError) as e:
+            if isinstance(e, api_client.ApiError) and e.status == 404:
+                return "MISS"
+            print(f"WARNING: Notion API 조회 실패, claude로 대체 - {e}", file=sys.stderr)
+
+    prompt_notion = f"""
+mcp__notionMCP__fetch 도구로 page_id={page_id} 내용을 가져와 RUN_ID={run_id} 문자열이 내용/속성 어디든 포함되는지 확인해.
 오직 'OK' 또는 'MISS' 한 단어만 출력해.
 """
-
-r1 = subprocess.run([CLAUDE, "-p", prompt_notion, "--output-format", "json",
-                     "--max-turns", "2", "--permission-mode", "bypassPermissions",
-                     "--allowedTools", "mcp__notionMCP", "Read"],
-                    capture_output=True, text=True, timeout=120)
-if r1.returncode != 0:
-    print("MISS: notion fetch failed"); sys.exit(3)
-txt1 = r1.stdout
-has_ok = re.search(r'"result"\s*:\s*"(OK|MISS)"', txt1)
-if not has_ok or has_ok.group(1) != "OK":
-    print("MISS: notion run_id not found"); sys.exit(4)
+    return claude_check(prompt_notion, "mcp__notionMCP")
 
 # 2) Slack 메시지 본문에 RUN_ID 포함되는지 (conversations.history)
-prompt_slack = f"""
-mcp__slack__conversations_history로 자동화 운영 채널의 최근 메시지를 조회해서, ts={slack_ts} 인 메시지를 찾아 RUN_ID={RUN_ID} 문자열이 본문에 포함되는지 확인해.
+def check_slack(slack_ts, run_id):
+    client = api_client.slack_client()
+    channel = os.environ.get("SLACK_CHANNEL_ID")
+    if client and channel:
+        try:
+            text = client.message_text(channel, slack_ts)
+            return "OK" if text is not None and run_id in text else "MISS"
+        except (api_client.ApiError, OSError) as e:
+            print(f"WARNING: Slack API 조회 실패, claude로 대체 - {e}", file=sys.stderr)
+
+    prompt_slack = f"""
+mcp__slack__conversations_history로 자동화 운영 채널의 최근 메시지를 조회해서, ts={slack_ts} 인 메시지를 찾아 RUN_ID={run_id} 문자열이 본문에 포함되는지 확인해.
 오직 'OK' 또는 'MISS' 한 단어만 출력해.
 """
+    return claude_check(prompt_slack, "mcp__slack")
+
+def timed_check(check, *args):
+    """check 실행 결과를 {"status", "seconds"}로 반환 (예외는 FAIL)"""
+    start = time.monotonic()
+    try:
+        status, error = check(*args), None
+    except Exception as e:
+        status, error = "FAIL", f"{type(e).__name__}: {e}"
+    result = {"status": status, "seconds": round(time.monotonic() - start, 2)}
+    if error:
+        result["error"] = error
+    return result
+
+def verify_runs(runs, pool):
+    """모든 실행의 Notion / Slack 확인을 pool에 넣어 동시에 실행하고, 실행별 결과를 순서대로 반환
+
+    runs: [{"run_id", "page_id", "slack_ts", "date"?}]
+    page_id / slack_ts가 없으면 확인할 수 없으므로 FAIL (error에 사유)
+    """
+    submitted = []
+    for run in runs:
+        notion = pool.submit(timed_check, check_notion, run["page_id"], run["run_id"]) if run["page_id"] else None
+        slack = pool.submit(timed_check, check_slack, run["slack_ts"], run["run_id"]) if run["slack_ts"] else None
+        submitted.append((run, notion, slack))
+
+    results = []
+    for run, notion, slack in submitted:
+        result = {"date": run["date"]} if run.get("date") else {}
+        result["run_id"] = run["run_id"]
+        result["notion"] = {"page_id": run["page_id"],
+                            **(notion.result() if notion else {"status": "FAIL", "error": "no page_id"})}
+        result["slack"] = {"slack_ts": run["slack_ts"],
+                           **(slack.result() if slack else {"status": "FAIL", "error": "no slack_ts"})}
+        result["ok"] = result["notion"]["status"] == "OK" and result["slack"]["status"] == "OK"
+        results.append(result)
+    return results
+
+def exit_code(result):
+    """단일 실행 종료 코드 (Notion 실패가 우선)"""
+    codes = {("notion", "FAIL"): 3, ("notion", "MISS"): 4, ("slack", "FAIL"): 5, ("slack", "MISS"): 6}
+    for target in ("notion", "slack"):
+        code = codes.get((target, result[target]["status"]))
+        if code:
+            return code
+    return 0
+
+def ledger_runs(ledger_path, since=None, until=None, run_ids=None):
+    """ledger에서 확인할 실행 목록 (날짜 순)"""
+    runs = []
+    for date_str, entries in sorted(page_index.load_index(ledger_path)["pages"].items()):
+        if (since and date_str < since) or (until and date_str > until):
+            continue
+        for entry in entries:
+            run_id = entry.get("run_id")
+            if not run_id or (run_ids and run_id not in run_ids):
+                continue
+            runs.append({"date": date_str, "run_id": run_id,
+                         "page_id": entry.get("page_id"), "slack_ts": entry.get("slack_ts")})
+    return runs
+
+def main():
+    parser = argparse.ArgumentParser(description="Notion / Slack 산출물에 RUN_ID가 포함되었는지 확인")
+    parser.add_argument("run_ids", nargs="*", metavar="RUN_ID")
+    parser.add_argument("--json", action="store_true", help="Notion / Slack 결과를 JSON으로 출력")
+    parser.add_argument("--batch", action="store_true", help="ledger에 기록된 실행을 한 번에 확인 (RUN_ID로 필터)")
+    parser.add_argument("--ledger", default=str(page_index.INDEX_PATH), help=f"ledger 파일 (기본: {page_index.INDEX_PATH})")
+    parser.add_argument("--since", help="--batch: 이 날짜(YYYY-MM-DD)부터")
+    parser.add_argument("--until", help="--batch: 이 날짜(YYYY-MM-DD)까지")
+    parser.add_argument("--jobs", type=int, default=BATCH_WORKERS, help=f"동시 확인 수 (기본: {BATCH_WORKERS})")
+    args = parser.parse_args()
+
+    if args.batch:
+        runs = ledger_runs(args.ledger, args.since, args.until, set(args.run_ids))
+        with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as pool:
+            results = verify_runs(runs, pool)
+        failed = [r["run_id"] for r in results if not r["ok"]]
+        print(json.dumps({"total": len(results), "ok": len(results) - len(failed), "failed": failed,
+                          "results": results}, ensure_ascii=False, indent=2))
+        sys.exit(1 if failed else 0)
+
+    if len(args.run_ids) != 1:
+        print("usage: verify_artifacts.py RUN_ID", file=sys.stderr)
+        sys.exit(2)
+    RUN_ID = args.run_ids[0].strip()
+
+    wrapper = json.loads(sys.stdin.read().strip())
+    inner = json.loads(re.search(r'\{.*\}', wrapper.get("result","")).group(0))
+    page_id = inner["notion_page_id"]
+    slack_ts = inner["slack_ts"]
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        result = verify_runs([{"run_id": RUN_ID, "page_id": page_id, "slack_ts": slack_ts}], pool)[0]
+    code = exit_code(result)
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        messages = {3: "MISS: notion fetch failed", 4: "MISS: notion run_id not found",
+                    5: "MISS: slack fetch failed", 6: "MISS: slack run_id not found"}
+        print(messages.get(code, "OK"))
+    sys.exit(code)
 
-r2 = subprocess.run([CLAUDE, "-p", prompt_slack, "--output-format", "json",
-                     "--max-turns", "2", "--permission-mode", "bypassPermissions",
-                     "--allowedTools", "mcp__slack", "Read"],
-                    capture_output=True, text=True, timeout=120)
-if r2.returncode != 0:
-    print("MISS: slack fetch failed"); sys.exit(5)
-txt2 = r2.stdout
-has_ok2 = re.search(r'"result"\s*:\s*"(OK|MISS)"', txt2)
-if not has_ok2 or has_ok2.group(1) != "OK":
-    print("MISS: slack run_id not found"); sys.exit(6)
-
-print("OK")
\ No newline at end of file
+if __name__ == "__main__":
+    main()
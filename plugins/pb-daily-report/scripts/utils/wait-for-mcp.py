@@ -4,6 +4,10 @@ MCP 로딩 대기 및 상태 확인 스크립트
 Claude Code의 MCP 연결이 준비될 때까지 대기
 """
 
+import argparse
+import os
+import random
+import re
 import time
 import subprocess
 import logging
@@ -12,57 +16,150 @@ from datetime import datetime
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 
-def check_mcp_status(max_attempts=20, wait_seconds=15):
-    """MCP 상태를 확인하고 로딩 완료까지 대기"""
-    
-    logging.info("🔍 Checking MCP connection status...")
-    
-    for attempt in range(1, max_attempts + 1):
+# 필수 MCP 서버 (docs/workflow.md "Tools Used"): `claude mcp list` 이름 또는 그 마지막
+# `:` 구간 (플러그인 서버 plugin:Notion:notion → notion). PB_MCP_SERVERS로 변경 가능
+REQUIRED_SERVERS = ('notion', 'slack')
+
+# 전체 대기 예산: auto-scheduler의 15분 타임아웃 안에서 /pb-report(10분)가 돌 수 있도록
+MCP_DEADLINE = 240
+PROBE_TIMEOUT = 30     # `claude mcp list` (서버 연결 확인만)
+TEST_TIMEOUT = 120     # `claude /pb-test` (실제 BigQuery 호출)
+BACKOFF_BASE = 2
+BACKOFF_MAX = 30
+# 연결 확인(probe)을 못 쓰고 /pb-test만으로 판단한 경우에만 적용하는 안정화 대기
+STABILIZE_SECONDS = 30
+
+# `<이름>: <명령 또는 URL> - <상태>` (이름에 `:`가 들어갈 수 있음)
+MCP_LIST_LINE = re.compile(r'^(?P<head>.+: .*) - (?P<mark>[✓✗⚠!])')
+
+def required_servers(value=None):
+    """필수 서버 목록 (쉼표 구분 문자열, 기본: PB_MCP_SERVERS 환경변수 → REQUIRED_SERVERS)"""
+    if value is None:
+        value = os.environ.get('PB_MCP_SERVERS', '')
+    names = tuple(name.strip() for name in value.split(',') if name.strip())
+    return names or REQUIRED_SERVERS
+
+def backoff_delay(attempt, base=BACKOFF_BASE, cap=BACKOFF_MAX):
+    """attempt번째 재시도 전 대기 시간 (지수 증가 + jitter)"""
+    delay = min(cap, base * 2 ** (attempt - 1))
+    return random.uniform(delay / 2, delay)
+
+def probe_servers(timeout=PROBE_TIMEOUT):
+    """`claude mcp list`로 서버별 연결 상태 확인
+
+    {서버 이름: 연결 여부}를 반환. 명령을 실행할 수 없거나 출력을 해석할 수
+    없으면 None (이 경우 /pb-test 결과만으로 판단). 시간 초과는
+    subprocess.TimeoutExpired로 전달되어 재시도 대상이 됨.
+    """
+    try:
+        result = subprocess.run(['claude', 'mcp', 'list'], capture_output=True, text=True, timeout=timeout)
+    except OSError as e:
+        logging.warning(f"⚠️ MCP probe unavailable: {e}")
+        return None
+
+    servers = {}
+    for line in result.stdout.splitlines():
+        match = MCP_LIST_LINE.match(line.strip())
+        if match:
+            # 이름에는 공백이 없으므로 첫 `: `까지가 이름 (명령/URL에 `: `가 있어도 안전)
+            name = match.group('head').split(': ', 1)[0].strip()
+            servers[name] = match.group('mark') == '✓'
+    return servers if servers or result.returncode == 0 else None
+
+def pending_servers(servers, required=REQUIRED_SERVERS):
+    """필수 서버를 (목록에 없는 서버, 연결되지 않은 서버)로 분류
+
+    플러그인 접두사가 붙은 이름(plugin:Notion:notion)도 마지막 구간으로 인정.
+    """
+    missing, pending = [], []
+    for name in required:
+        states = [ok for listed, ok in servers.items()
+                  if listed == name or listed.endswith(f":{name}")]
+        if not states:
+            missing.append(name)
+        elif not any(states):
+            pending.append(name)
+    return missing, pending
+
+def run_pb_test(timeout):
+    """BigQuery 연결 테스트 (가장 빠른 end-to-end 검증)"""
+    result = subprocess.run(
+        ['claude', '/pb-test'],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        input='bigquery\n'
+    )
+    if result.returncode != 0:
+        logging.debug(f"Error: {result.stderr}")
+    return result.returncode == 0
+
+def check_mcp_status(deadline_seconds=MCP_DEADLINE, required=REQUIRED_SERVERS):
+    """MCP 상태를 확인하고 로딩 완료까지 대기
+
+    매 시도마다 `claude mcp list`로 필수 서버 연결부터 확인하고, 모두 연결된
+    경우에만 /pb-test를 실행합니다. 목록에 아예 없는 서버가 있으면 (이름이
+    다르게 등록된 경우 등) 연결 확인 없이 /pb-test 결과로 판단합니다. 실패하면 지수 backoff(jitter 포함)로
+    재시도하며, 전체 대기 시간은 deadline_seconds를 넘지 않습니다.
+    """
+
+    logging.info(f"🔍 Checking MCP connection status (budget {deadline_seconds}s)...")
+    start = time.monotonic()
+    deadline = start + deadline_seconds
+    attempt = 0
+
+    while True:
+        attempt += 1
+        elapsed = time.monotonic() - start
+        logging.info(f"📡 MCP connection attempt {attempt} ({elapsed:.1f}s elapsed)")
+
         try:
-            logging.info(f"📡 MCP connection attempt {attempt}/{max_attempts}")
-            
-            # BigQuery 연결 테스트 (가장 빠른 검증)
-            result = subprocess.run(
-                ['claude', '/pb-test'],
-                capture_output=True,
-                text=True,
-                timeout=120,
-                input='bigquery\n'
-            )
-            
-            if result.returncode == 0:
-                logging.info("✅ MCP connections are ready!")
-                return True
+            servers = probe_servers(min(PROBE_TIMEOUT, max(1, deadline - time.monotonic())))
+            missing, pending = pending_servers(servers, required) if servers is not None else ([], [])
+            if pending:
+                logging.warning(f"⚠️ MCP not ready yet, attempt {attempt}: waiting on {', '.join(pending)}")
             else:
-                logging.warning(f"⚠️ MCP not ready yet, attempt {attempt}")
-                logging.debug(f"Error: {result.stderr}")
-                
+                if missing:
+                    logging.warning(f"⚠️ Not listed by `claude mcp list`: {', '.join(missing)} - relying on /pb-test")
+                remaining = deadline - time.monotonic()
+                if remaining < 1:
+                    break
+                if run_pb_test(min(TEST_TIMEOUT, remaining)):
+                    elapsed = time.monotonic() - start
+                    logging.info(f"✅ MCP connections are ready! ({elapsed:.1f}s, attempt {attempt})")
+                    if servers is None or missing:
+                        # 서버별 연결 확인을 못 했으므로 기존처럼 잠시 안정화 대기
+                        wait = min(STABILIZE_SECONDS, max(0, deadline - time.monotonic()))
+                        logging.info(f"⏳ MCP servers not verified by probe - {wait:.0f}-second stabilization wait...")
+                        time.sleep(wait)
+                    return True
+                logging.warning(f"⚠️ /pb-test failed, attempt {attempt}")
+
         except subprocess.TimeoutExpired:
             logging.warning(f"⏰ Timeout on attempt {attempt}")
         except Exception as e:
             logging.error(f"💥 Error on attempt {attempt}: {str(e)}")
-        
-        if attempt < max_attempts:
-            logging.info(f"⏳ Waiting {wait_seconds} seconds before retry...")
-            time.sleep(wait_seconds)
-    
-    logging.error("❌ MCP connections failed to load after maximum attempts")
+
+        remaining = deadline - time.monotonic()
+        if remaining < 1:
+            break
+        delay = min(backoff_delay(attempt), remaining)
+        logging.info(f"⏳ Waiting {delay:.1f} seconds before retry...")
+        time.sleep(delay)
+
+    logging.error(f"❌ MCP connections failed to load within {deadline_seconds}s ({attempt} attempts)")
     return False
 
-def execute_with_mcp_ready():
+def execute_with_mcp_ready(deadline_seconds=MCP_DEADLINE, required=REQUIRED_SERVERS):
     """MCP가 준비된 후 PB 리포트 실행"""
-    
+
     logging.info("🚀 Starting PB Report with MCP readiness check")
-    
+
     # MCP 상태 확인
-    if not check_mcp_status():
+    if not check_mcp_status(deadline_seconds, required):
         logging.error("❌ Cannot proceed - MCP connections not ready")
         sys.exit(1)
-    
-    # 추가 안정성을 위한 짧은 대기
-    logging.info("⏳ Additional 30-second stabilization wait...")
-    time.sleep(30)
-    
+
     # PB 리포트 실행
     logging.info("📊 Executing PB Daily Report...")
     try:
@@ -72,14 +169,14 @@ def execute_with_mcp_ready():
             text=True,
             timeout=600  # 10분 타임아웃
         )
-        
+
         if result.returncode == 0:
             logging.info("✅ PB Report completed successfully!")
             logging.info(f"Output: {result.stdout}")
         else:
             logging.error(f"❌ PB Report failed: {result.stderr}")
             sys.exit(1)
-            
+
     except subprocess.TimeoutExpired:
         logging.error("⏰ PB Report execution timed out")
         sys.exit(1)
@@ -88,4 +185,10 @@ def execute_with_mcp_ready():
         sys.exit(1)
 
 if __name__ == "__main__":
-    execute_with_mcp_ready()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="MCP 준비 대기 후 PB Daily Report 실행")
+    parser.add_argument("--deadline", type=int, default=MCP_DEADLINE,
+                        help=f"MCP 대기 최대 시간 (초, 기본: {MCP_DEADLINE})")
+    parser.add_argument("--require", default=None,
+                        help=f"필수 MCP 서버 (쉼표 구분, 기본: PB_MCP_SERVERS 또는 {','.join(REQUIRED_SERVERS)})")
+    args = parser.parse_args()
+    execute_with_mcp_ready(args.deadline, required_servers(args.require))
\ No newline at end of file
@@ -0,0 +1,224 @@
+"""
+api_client.py 유닛 테스트 (fake_api_server.py로 오프라인 실행)
+"""
+
+import socketserver
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts' / 'utils'))
+
+import api_client
+import duplicate_checker
+import page_index
+import verify_artifacts
+from fake_api_server import FakeApiServer
+
+RUN_ID = '20250923-080012'
+CHANNEL = 'C0AUTOMATION'
+
+PAGES = [
+    {'id': 'page-0922', 'title': 'PB Daily Report - 2025-09-22 (월요일)',
+     'last_edited_time': '2025-09-23T00:10:00.000Z',
+     'blocks': [f'문단 {i}' for i in range(150)] + [f'RUN_ID={RUN_ID}']},
+    {'id': 'page-0921', 'title': 'PB Daily Report - 2025-09-21 (일요일)', 'blocks': ['본문']},
+    {'id': 'page-other', 'title': '주간 회의록 2025-09-22', 'blocks': []},
+]
+
+MESSAGES = {CHANNEL: [
+    {'ts': '1758585600.000100', 'text': f'PB Daily Report 발송 완료 (RUN_ID={RUN_ID})'},
+    {'ts': '1758585700.000200', 'text': '다른 메시지'},
+]}
+
+
+@pytest.fixture
+def server():
+    with FakeApiServer(PAGES, MESSAGES, token='test-token') as srv:
+        yield srv
+
+
+@pytest.fixture
+def env(server, monkeypatch):
+    """claude 대신 fake 서버를 쓰도록 환경 변수 설정"""
+    monkeypatch.setenv('NOTION_TOKEN', 'test-token')
+    monkeypatch.setenv('SLACK_BOT_TOKEN', 'test-token')
+    monkeypatch.setenv('SLACK_CHANNEL_ID', CHANNEL)
+    monkeypatch.setenv('PB_NOTION_API_URL', server.url)
+    monkeypatch.setenv('PB_SLACK_API_URL', server.url)
+    return server
+
+
+@pytest.fixture
+def no_claude(monkeypatch):
+    """claude 경로로 대체되면 실패"""
+    def fail(*args, **kwargs):
+        raise AssertionError('claude fallback should not run')
+    monkeypatch.setattr(duplicate_checker.subprocess, 'Popen', fail)
+    monkeypatch.setattr(verify_artifacts.subprocess, 'run', fail)
+
+
+class TestNotionClient:
+    def test_search(self, server):
+        client = api_client.NotionClient('test-token', server.url, pool=api_client.ConnectionPool())
+        results = client.search('2025-09-22')
+        titles = sorted(api_client.page_title(p) for p in results)
+        assert titles == ['PB Daily Report - 2025-09-22 (월요일)', '주간 회의록 2025-09-22']
+
+    def test_page_contains_paginates_blocks(self, server):
+        client = api_client.NotionClient('test-token', server.url, pool=api_client.ConnectionPool())
+        assert client.page_contains('page-0922', RUN_ID) is True
+        assert client.page_contains('page-0921', RUN_ID) is False
+
+    def test_missing_page(self, server):
+        client = api_client.NotionClient('test-token', server.url, pool=api_client.ConnectionPool())
+        with pytest.raises(api_client.ApiError) as exc:
+            client.retrieve_page('nope')
+        assert exc.value.status == 404
+        assert exc.value.code == 'object_not_found'
+
+    def test_bad_token(self, server):
+        client = api_client.NotionClient('wrong', server.url, pool=api_client.ConnectionPool())
+        with pytest.raises(api_client.ApiError) as exc:
+            client.search('PB')
+        assert exc.value.status == 401
+
+    def test_connection_reused(self, server):
+        client = api_client.NotionClient('test-token', server.url, pool=api_client.ConnectionPool())
+        for _ in range(5):
+            client.search('PB Daily Report')
+        assert server.connections == 1
+
+
+class RawResponseServer(socketserver.ThreadingTCPServer):
+    """요청마다 정해진 바이트를 그대로 보내고 연결을 닫는 서버 (잘못된 응답 테스트용)"""
+
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self, response):
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                while self.rfile.readline() not in (b'\r\n', b''):
+                    pass
+                self.wfile.write(response)
+
+        super().__init__(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.server_address[1]}'
+
+
+@pytest.fixture
+def raw_server():
+    servers = []
+
+    def start(response):
+        srv = RawResponseServer(response)
+        threading.Thread(target=srv.serve_forever, daemon=True).start()
+        servers.append(srv)
+        return srv
+    yield start
+    for srv in servers:
+        srv.shutdown()
+        srv.server_close()
+
+
+class TestMalformedResponses:
+    @pytest.mark.parametrize('response', [
+        b'HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\n{"results": [',  # IncompleteRead
+        b'SPAM\r\n\r\n',  # BadStatusLine
+        b'',  # RemoteDisconnected
+    ], ids=['incomplete-read', 'bad-status-line', 'remote-disconnected'])
+    def test_protocol_errors_are_api_errors(self, raw_server, response):
+        srv = raw_server(response)
+        client = api_client.NotionClient('test-token', srv.url, pool=api_client.ConnectionPool())
+        with pytest.raises(api_client.ApiError):
+            client.search('PB')
+
+    @pytest.mark.parametrize('body', [b'[1, 2]', b'"ok"', b'null'])
+    def test_non_object_json(self, raw_server, body):
+        srv = raw_server(b'HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n%s' % (len(body), body))
+        client = api_client.SlackClient('test-token', srv.url, pool=api_client.ConnectionPool())
+        with pytest.raises(api_client.ApiError):
+            client.message_text(CHANNEL, '1.0')
+
+    def test_verify_falls_back_to_claude(self, raw_server, monkeypatch):
+        srv = raw_server(b'HTTP/1.1 200 OK\r\nContent-Length: 100\r\n\r\n{')
+        monkeypatch.setenv('NOTION_TOKEN', 'test-token')
+        monkeypatch.setenv('PB_NOTION_API_URL', srv.url)
+        monkeypatch.setattr(verify_artifacts, 'claude_check', lambda prompt, tool: 'OK')
+        assert verify_artifacts.check_notion('page-0922', RUN_ID) == 'OK'
+
+
+class TestSlackClient:
+    def test_message_text(self, server):
+        client = api_client.SlackClient('test-token', server.url, pool=api_client.ConnectionPool())
+        assert RUN_ID in client.message_text(CHANNEL, '1758585600.000100')
+        assert client.message_text(CHANNEL, '1758585600.999999') is None
+
+    def test_not_ok(self, server):
+        client = api_client.SlackClient('test-token', server.url, pool=api_client.ConnectionPool())
+        with pytest.raises(api_client.ApiError) as exc:
+            client.message_text('C_UNKNOWN', '1.0')
+        assert exc.value.code == 'channel_not_found'
+
+
+class TestDuplicateCheckerApi:
+    def test_search_existing_pages(self, env, no_claude):
+        pages = duplicate_checker.search_existing_pages('2025-09-22')
+        assert [p['id'] for p in pages] == ['page-0922']
+        assert pages[0]['timestamp'] == '2025-09-23T00:10:00.000Z'
+
+    def test_stops_after_exact_match(self, env, no_claude):
+        # 'PB Daily Report - 2025-09-22' 쿼리에서 일치 → 날짜만으로 검색하는 마지막 쿼리는 생략
+        duplicate_checker.search_existing_pages('2025-09-22')
+        assert env.requests.count(('POST', '/v1/search')) == 2
+
+    def test_no_pages(self, env, no_claude):
+        assert duplicate_checker.search_existing_pages('2025-09-30') == []
+
+
+class TestVerifyArtifactsApi:
+    def test_notion(self, env, no_claude):
+        assert verify_artifacts.check_notion('page-0922', RUN_ID) == 'OK'
+        assert verify_artifacts.check_notion('page-0921', RUN_ID) == 'MISS'
+        assert verify_artifacts.check_notion('nope', RUN_ID) == 'MISS'
+
+    def test_slack(self, env, no_claude):
+        assert verify_artifacts.check_slack('1758585600.000100', RUN_ID) == 'OK'
+        assert verify_artifacts.check_slack('1758585700.000200', RUN_ID) == 'MISS'
+
+
+class TestVerifyArtifactsBatch:
+    def test_runs_from_ledger(self, env, no_claude, tmp_path):
+        ledger = tmp_path / 'page-index.json'
+        page_index.record_page('2025-09-22', 'page-0922', run_id=RUN_ID, path=ledger, slack_ts='1758585600.000100')
+        page_index.record_page('2025-09-21', 'page-0921', run_id='20250922-080000', path=ledger)
+        page_index.record_page('2025-09-20', 'page-0920', path=ledger)  # run_id 없음 → 제외
+
+        runs = verify_artifacts.ledger_runs(ledger)
+        assert [r['run_id'] for r in runs] == ['20250922-080000', RUN_ID]
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            results = verify_artifacts.verify_runs(runs, pool)
+        assert [r['ok'] for r in results] == [False, True]
+        assert results[0]['notion']['status'] == 'MISS'
+        assert results[0]['slack'] == {'slack_ts': None, 'status': 'FAIL', 'error': 'no slack_ts'}
+        assert verify_artifacts.exit_code(results[0]) == 4
+
+    def test_missing_ids_fail(self, env, no_claude):
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            result = verify_artifacts.verify_runs([{'run_id': RUN_ID, 'page_id': None, 'slack_ts': None}], pool)[0]
+        assert result['notion'] == {'page_id': None, 'status': 'FAIL', 'error': 'no page_id'}
+        assert result['ok'] is False
+        assert verify_artifacts.exit_code(result) == 3
+
+    def test_ledger_filters(self, tmp_path):
+        ledger = tmp_path / 'page-index.json'
+        for day in ('20', '21', '22'):
+            page_index.record_page(f'2025-09-{day}', f'page-{day}', run_id=f'run-{day}', path=ledger)
+        assert [r['run_id'] for r in verify_artifacts.ledger_runs(ledger, since='2025-09-21')] == ['run-21', 'run-22']
+        assert [r['run_id'] for r in verify_artifacts.ledger_runs(ledger, until='2025-09-20')] == ['run-20']
+        assert [r['run_id'] for r in verify_artifacts.ledger_runs(ledger, run_ids={'run-22'})] == ['run-22']
@@ -0,0 +1,159 @@
+"""
+page_index.py / duplicate_checker.py 로컬 인덱스 유닛 테스트
+"""
+
+import json
+import sys
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts' / 'utils'))
+
+import duplicate_checker
+import page_index
+
+DATE = '2025-09-22'
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return tmp_path / 'page-index.json'
+
+
+def age_entries(index_path, hours):
+    """인덱스 항목의 마지막 확인 시각을 hours시간 전으로 변경"""
+    index = page_index.load_index(index_path)
+    old = (datetime.now(timezone.utc) - timedelta(hours=hours)).isoformat(timespec='seconds')
+    for entries in index['pages'].values():
+        for entry in entries:
+            entry['timestamp'] = entry['verified_at'] = old
+    page_index.save_index(index, index_path)
+
+
+class TestPageIndex:
+    def test_missing_or_corrupt_index(self, index_path):
+        assert page_index.load_index(index_path)['pages'] == {}
+        index_path.write_text('{not json')
+        assert page_index.load_index(index_path)['pages'] == {}
+
+    def test_record_and_lookup(self, index_path):
+        page_index.record_page(DATE, 'page-1', 'https://notion.so/page1', run_id='run-1', path=index_path)
+        entries = page_index.lookup(DATE, index_path)
+        assert len(entries) == 1
+        assert entries[0]['page_id'] == 'page-1'
+        assert entries[0]['run_id'] == 'run-1'
+        assert page_index.lookup('2025-09-23', index_path) == []
+
+    def test_record_updates_same_page(self, index_path):
+        page_index.record_page(DATE, 'page-1', run_id='run-1', path=index_path)
+        page_index.record_page(DATE, 'page-1', path=index_path, slack_ts='1758585600.000100')
+        entries = page_index.lookup(DATE, index_path)
+        assert len(entries) == 1
+        assert entries[0]['run_id'] == 'run-1'
+        assert entries[0]['slack_ts'] == '1758585600.000100'
+
+    def test_is_fresh(self, index_path):
+        entry = page_index.record_page(DATE, 'page-1', path=index_path)
+        assert page_index.is_fresh(entry)
+        age_entries(index_path, 25)
+        assert not page_index.is_fresh(page_index.lookup(DATE, index_path)[0])
+        assert not page_index.is_fresh({})
+
+    def test_forget(self, index_path):
+        page_index.record_page(DATE, 'page-1', path=index_path)
+        page_index.record_page(DATE, 'page-2', path=index_path)
+        assert page_index.forget(DATE, 'page-1', index_path) == 1
+        assert [e['page_id'] for e in page_index.lookup(DATE, index_path)] == ['page-2']
+        assert page_index.forget(DATE, path=index_path) == 1
+        assert DATE not in json.loads(index_path.read_text())['pages']
+
+
+class TestDuplicateCheckerIndex:
+    @pytest.fixture
+    def searches(self, monkeypatch):
+        """Notion 검색 대체: 반환값을 설정하고 호출 횟수를 기록"""
+        calls = []
+        state = {'result': ([], True)}
+
+        def fake_search(date_str, title=None, *args, **kwargs):
+            calls.append(date_str)
+            return state['result']
+        monkeypatch.setattr(duplicate_checker, 'search_notion', fake_search)
+        return calls, state
+
+    def test_index_hit_skips_search(self, index_path, searches):
+        calls, _ = searches
+        page_index.record_page(DATE, 'page-1', 'https://notion.so/page1', run_id='run-1', path=index_path)
+        result = duplicate_checker.check_duplicate_by_date(DATE, index_path=index_path)
+        assert result['has_duplicate'] is True
+        assert result['source'] == 'index'
+        assert result['latest_page']['id'] == 'page-1'
+        assert calls == []
+
+    def test_revalidate_searches(self, index_path, searches):
+        calls, state = searches
+        page_index.record_page(DATE, 'page-1', path=index_path)
+        state['result'] = ([{'id': 'page-1', 'title': f'PB Daily Report - {DATE}', 'url': '', 'timestamp': None}], True)
+        result = duplicate_checker.check_duplicate_by_date(DATE, revalidate=True, index_path=index_path)
+        assert result['source'] == 'notion'
+        assert calls == [DATE]
+
+    def test_expired_entry_is_revalidated(self, index_path, searches):
+        calls, state = searches
+        page_index.record_page(DATE, 'page-1', path=index_path)
+        age_entries(index_path, 25)
+        state['result'] = ([{'id': 'page-1', 'title': f'PB Daily Report - {DATE}', 'url': 'u', 'timestamp': None}], True)
+        result = duplicate_checker.check_duplicate_by_date(DATE, index_path=index_path)
+        assert result['has_duplicate'] is True
+        assert result['source'] == 'notion'
+        assert calls == [DATE]
+        assert page_index.is_fresh(page_index.lookup(DATE, index_path)[0])
+
+    def test_expired_entry_forgotten_after_complete_search(self, index_path, searches):
+        _, state = searches
+        page_index.record_page(DATE, 'page-1', path=index_path)
+        age_entries(index_path, 25)
+        state['result'] = ([], True)
+        result = duplicate_checker.check_duplicate_by_date(DATE, index_path=index_path)
+        assert result['has_duplicate'] is False
+        assert page_index.lookup(DATE, index_path) == []
+
+    def test_incomplete_search_keeps_stale_entry(self, index_path, searches):
+        _, state = searches
+        page_index.record_page(DATE, 'page-1', path=index_path)
+        age_entries(index_path, 25)
+        state['result'] = ([], False)
+        result = duplicate_checker.check_duplicate_by_date(DATE, index_path=index_path)
+        assert result['has_duplicate'] is True
+        assert result['source'] == 'index'
+        assert result['stale'] is True
+        assert [e['page_id'] for e in page_index.lookup(DATE, index_path)] == ['page-1']
+
+    def test_no_index_no_pages(self, index_path, searches):
+        _, state = searches
+        state['result'] = ([], False)
+        result = duplicate_checker.check_duplicate_by_date(DATE, index_path=index_path)
+        assert result['has_duplicate'] is False
+        assert result['search_complete'] is False
+
+
+class TestClaudeSearchCompleteness:
+    def test_failed_query_is_incomplete(self, monkeypatch, tmp_path):
+        # claude 검색 하나가 실패하면 빈 결과여도 "완료"가 아님
+        monkeypatch.delenv('NOTION_TOKEN', raising=False)
+        fake = tmp_path / 'claude'
+        fake.write_text('#!/bin/sh\ncase "$2" in *"{0}"*) exit 1;; esac\n'
+                        'echo \'{{"result": "{{\\"results\\": []}}"}}\'\n'.format(f'Report - {DATE}'))
+        fake.chmod(0o755)
+        pages, complete = duplicate_checker.search_notion(DATE, claude_path=str(fake))
+        assert pages == []
+        assert complete is False
+
+    def test_all_queries_empty_is_complete(self, monkeypatch, tmp_path):
+        monkeypatch.delenv('NOTION_TOKEN', raising=False)
+        fake = tmp_path / 'claude'
+        fake.write_text('#!/bin/sh\necho \'{"result": "{\\"results\\": []}"}\'\n')
+        fake.chmod(0o755)
+        assert duplicate_checker.search_notion(DATE, claude_path=str(fake)) == ([], True)
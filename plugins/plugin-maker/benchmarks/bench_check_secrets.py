@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+check_secrets.py Benchmark
+
+Builds a deterministic synthetic plugin tree and compares the single-pass
+compiled scanner against the legacy two-read, per-pattern `re.search` scanner.
+
+Usage:
+    python3 bench_check_secrets.py                 # 10,000 files
+    python3 bench_check_secrets.py --files 1000
+    python3 bench_check_secrets.py --keep /tmp/tree  # reuse/keep the tree
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import check_secrets  # noqa: E402
+
+# Planted values are assembled at runtime so this file never trips the scanner itself
+_SLACK = "xox" + "b-" + "1234567890-1234567890-" + "a1B2c3D4e5F6g7H8i9J0"
+_AWS = "AK" + "IA" + "ABCDEFGHIJKLMNOP"
+_USER_PATH = "/Us" + "ers/alice/.claude/settings.json"
+
+_FILLER = [
+    "def handler(event, context):",
+    "    return {'statusCode': 200, 'body': json.dumps(event)}",
+    "## Usage",
+    "Run the skill with `/my-plugin:main` from your project directory.",
+    "const config = require('./config');",
+    "    for item in items: total += item.price * item.quantity",
+    "| Column | Description |",
+    "export function render(props) { return `<div>${props.name}</div>`; }",
+]
+_PLANTED = [
+    f'SLACK = "{_SLACK}"',
+    f"aws_id = '{_AWS}'",
+    f"cat {_USER_PATH}",
+]
+_EXTS = [".py", ".md", ".json", ".js", ".ts", ".yml", ".txt", ".sh"]
+
+
+def build_tree(root: Path, n_files: int, lines_per_file: int = 60, seed: int = 42) -> int:
+    """Create a synthetic plugin tree. Returns the number of planted findings."""
+    rng = random.Random(seed)
+    planted = 0
+    for i in range(n_files):
+        sub = root / f"pkg{i % 50:02d}" / f"mod{i % 7}"
+        sub.mkdir(parents=True, exist_ok=True)
+        lines = [rng.choice(_FILLER) for _ in range(lines_per_file)]
+        if i % 97 == 0:
+            lines[rng.randrange(lines_per_file)] = _PLANTED[i % len(_PLANTED)]
+            planted += 1
+        (sub / f"file{i}{_EXTS[i % len(_EXTS)]}").write_text("\n".join(lines) + "\n")
+    return planted
+
+
+def legacy_scan(plugin_path: Path) -> tuple[list, list]:
+    """Reference implementation: two reads per file, uncompiled per-line search."""
+    secrets, paths = [], []
+    for file_path in plugin_path.rglob("*"):
+        if not file_path.is_file() or file_path.suffix not in check_secrets.CODE_EXTENSIONS:
+            continue
+        if any(part in check_secrets.EXCLUDE_DIRS for part in file_path.parts):
+            continue
+        rel = str(file_path.relative_to(plugin_path))
+
+        lines = file_path.read_text(encoding="utf-8", errors="ignore").split("\n")
+        in_block = False
+        for line_num, line in enumerate(lines, 1):
+            is_comment, in_block = check_secrets._is_comment_line(line, in_block)
+            if is_comment:
+                continue
+            for pattern, secret_type in check_secrets.SECRET_PATTERNS:
+                if re.search(pattern, line, re.IGNORECASE):
+                    if not any(p in line.lower() for p in check_secrets.PLACEHOLDER_MARKERS):
+                        secrets.append((rel, line_num, secret_type))
+                    break
+
+        lines = file_path.read_text(encoding="utf-8", errors="ignore").split("\n")
+        in_block = False
+        for line_num, line in enumerate(lines, 1):
+            is_comment, in_block = check_secrets._is_comment_line(line, in_block)
+            if is_comment:
+                continue
+            for pattern, desc in check_secrets.USER_PATH_PATTERNS:
+                if re.search(pattern, line):
+                    if "${" not in line and "$HOME" not in line and "~/" not in line:
+                        paths.append((rel, line_num, desc))
+                    break
+    return sorted(secrets), sorted(paths)
+
+
+def engine_scan(plugin_path: Path) -> tuple[list, list]:
+    """Current implementation via scan_plugin."""
+    results = check_secrets.scan_plugin(plugin_path)
+    secrets = sorted((s["file"], s["line"], s["type"]) for s in results["hardcoded_secrets"])
+    paths = sorted((p["file"], p["line"], p["type"]) for p in results["hardcoded_paths"])
+    return secrets, paths
+
+
+def timed(fn, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - start, out
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark check_secrets.py on a synthetic tree")
+    parser.add_argument("--files", type=int, default=10_000, help="Number of files (default: 10000)")
+    parser.add_argument("--keep", help="Build (or reuse) the tree at this path and keep it")
+    args = parser.parse_args()
+
+    if args.keep:
+        root = Path(args.keep)
+        cleanup = False
+    else:
+        root = Path(tempfile.mkdtemp(prefix="bench-secrets-"))
+        cleanup = True
+
+    try:
+        root.mkdir(parents=True, exist_ok=True)
+        if not any(root.iterdir()):
+            planted = build_tree(root, args.files)
+            print(f"Built {args.files} files ({planted} planted findings) in {root}")
+
+        legacy_t, legacy_out = timed(legacy_scan, root)
+        engine_t, engine_out = timed(engine_scan, root)
+
+        if legacy_out != engine_out:
+            print("MISMATCH: engine findings differ from legacy scanner", file=sys.stderr)
+            sys.exit(1)
+
+        found = len(engine_out[0]) + len(engine_out[1])
+        print(f"Findings:  {found} (identical)")
+        print(f"Legacy:    {legacy_t:7.2f}s")
+        print(f"Engine:    {engine_t:7.2f}s")
+        print(f"Speedup:   {legacy_t / engine_t:7.1f}x")
+    finally:
+        if cleanup:
+            shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+init_plugin.py Benchmark
+
+Creates N plugin scaffolds in a marketplace, first one create_plugin call at a
+time (a marketplace.json rewrite per plugin), then with a single bulk
+create_plugins call, and checks both produce identical trees. Each pass runs
+with its own temporary directory as the working directory, since that is where
+init_plugin registers plugins in marketplace.json.
+
+Usage:
+    python3 bench_init_plugin.py                # 1,000 scaffolds
+    python3 bench_init_plugin.py --count 100
+    python3 bench_init_plugin.py --no-setup
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import filecmp
+import io
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scripts"))
+
+import init_plugin  # noqa: E402
+
+MARKETPLACE = "bench-marketplace"
+
+
+def one_by_one(target: Path, names: list[str], with_setup: bool) -> None:
+    for name in names:
+        init_plugin.create_plugin(name, MARKETPLACE, with_setup, target)
+
+
+def bulk(target: Path, names: list[str], with_setup: bool) -> None:
+    init_plugin.create_plugins(names, MARKETPLACE, with_setup, target)
+
+
+def timed(fn, target: Path, names: list[str], with_setup: bool) -> float:
+    target.mkdir()
+    cwd = os.getcwd()
+    os.chdir(target)
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            fn(target, names, with_setup)
+        return time.perf_counter() - start
+    finally:
+        os.chdir(cwd)
+
+
+def same_tree(a: Path, b: Path) -> bool:
+    cmp = filecmp.dircmp(a, b)
+    if cmp.left_only or cmp.right_only or cmp.funny_files:
+        return False
+    _, mismatch, errors = filecmp.cmpfiles(a, b, cmp.common_files, shallow=False)
+    if mismatch or errors:
+        return False
+    return all(same_tree(a / d, b / d) for d in cmp.common_dirs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark init_plugin.py scaffolding")
+    parser.add_argument("--count", type=int, default=1_000, help="Number of scaffolds (default: 1000)")
+    parser.add_argument("--no-setup", action="store_true", help="Skip the setup skill")
+    args = parser.parse_args()
+
+    names = [f"bench-plugin-{i}" for i in range(args.count)]
+    with_setup = not args.no_setup
+    root = Path(tempfile.mkdtemp(prefix="bench-init-"))
+    try:
+        single_t = timed(one_by_one, root / "single", names, with_setup)
+        bulk_t = timed(bulk, root / "bulk", names, with_setup)
+
+        if not same_tree(root / "single", root / "bulk"):
+            print("MISMATCH: bulk scaffolds differ from one-by-one scaffolds", file=sys.stderr)
+            sys.exit(1)
+
+        print(f"Scaffolds:   {args.count} (identical)")
+        print(f"One-by-one:  {single_t:7.2f}s  ({args.count / single_t:,.0f}/s)")
+        print(f"Bulk:        {bulk_t:7.2f}s  ({args.count / bulk_t:,.0f}/s)")
+        print(f"Speedup:     {single_t / bulk_t:7.1f}x")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+plugin-maker Benchmark Suite
+
+Times the hot paths of the plugin-maker scripts on deterministic synthetic
+plugin trees (with planted secrets) and compares against stored baselines.
+The comparison is informational unless --check is given.
+
+Cases:
+    check_secrets   check_secrets.scan_plugin on the tree
+    sanitize        publish_to_pb.sanitize_secrets_in_staging on a fresh copy of the tree
+    init_plugin     init_plugin.create_plugin, one scaffold per 10 tree files
+
+Each case runs in its own subprocess so peak RSS is per case. Reported:
+files/sec, MB/sec and peak RSS; the fastest of --repeat runs is kept.
+
+Usage:
+    python3 run_benchmarks.py                          # 10, 1k, 50k files; compare to baselines
+    python3 run_benchmarks.py --check                  # Fail on regressions (same-host baselines only)
+    python3 run_benchmarks.py --sizes 10,1000          # Quicker run
+    python3 run_benchmarks.py --cases check_secrets
+    python3 run_benchmarks.py --save-baseline          # Record baselines.json
+    python3 run_benchmarks.py --workdir /tmp/pm-bench  # Keep trees between runs
+    python3 run_benchmarks.py --json                   # Machine-readable output
+
+Baselines:
+    Baselines are absolute timings and only mean something on the host that
+    recorded them. The committed benchmarks/baselines.json is a reference from
+    a single-core Linux machine (Python 3.11) and must be regenerated on each
+    host before gating with it: record one with --save-baseline (use
+    --baselines PATH to leave the committed file alone), make the change, then
+    rerun with --check against the same file.
+
+Exit codes:
+    0 - Without --check, always (slower cases are only flagged). With --check,
+        no case is more than --tolerance (default 20%) slower than its baseline
+        (cases whose baseline is under 50 ms are reported but not gated)
+    1 - --check and at least one regression
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+SCRIPTS_DIR = BENCH_DIR.parent / "scripts"
+sys.path.insert(0, str(SCRIPTS_DIR))
+sys.path.insert(0, str(BENCH_DIR))
+
+from bench_check_secrets import build_tree  # noqa: E402
+
+CASES = ("check_secrets", "sanitize", "init_plugin")
+DEFAULT_SIZES = (10, 1_000, 50_000)
+DEFAULT_BASELINES = BENCH_DIR / "baselines.json"
+DEFAULT_TOLERANCE = 0.20
+# Cases faster than this are reported but never fail: timer noise dominates
+MIN_COMPARE_SECONDS = 0.05
+
+
+def tree_stats(root: Path) -> tuple[int, int]:
+    """(file count, total bytes) of a tree."""
+    files = total = 0
+    for path in root.rglob("*"):
+        if path.is_file():
+            files += 1
+            total += path.stat().st_size
+    return files, total
+
+
+def peak_rss_kb() -> int:
+    """Peak RSS of this process in KiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+# --- Cases (run in the child process) ---
+
+def run_check_secrets(tree: Path, scratch: Path) -> tuple[float, int, int]:
+    import check_secrets
+
+    files, total = tree_stats(tree)
+    start = time.perf_counter()
+    check_secrets.scan_plugin(tree)
+    return time.perf_counter() - start, files, total
+
+
+def run_sanitize(tree: Path, scratch: Path) -> tuple[float, int, int]:
+    import publish_to_pb
+
+    staging = scratch / "staging"
+    shutil.copytree(tree, staging)
+    files, total = tree_stats(staging)
+    start = time.perf_counter()
+    publish_to_pb.sanitize_secrets_in_staging(staging)
+    return time.perf_counter() - start, files, total
+
+
+def run_init_plugin(tree: Path, scratch: Path) -> tuple[float, int, int]:
+    import init_plugin
+
+    count = max(1, tree_stats(tree)[0] // 10)
+    target = scratch / "scaffolds"
+    target.mkdir()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        for i in range(count):
+            init_plugin.create_plugin(f"bench-plugin-{i}", target_path=target)
+    elapsed = time.perf_counter() - start
+    files, total = tree_stats(target)
+    return elapsed, files, total
+
+
+CASE_RUNNERS = {
+    "check_secrets": run_check_secrets,
+    "sanitize": run_sanitize,
+    "init_plugin": run_init_plugin,
+}
+
+
+def run_child(case: str, tree: Path) -> None:
+    """Run one case in this process and print its measurements as JSON."""
+    with tempfile.TemporaryDirectory(prefix="pm-bench-") as scratch:
+        seconds, files, total = CASE_RUNNERS[case](tree, Path(scratch))
+    print(json.dumps({"seconds": seconds, "files": files, "bytes": total, "peak_rss_kb": peak_rss_kb()}))
+
+
+# --- Driver ---
+
+def measure(case: str, tree: Path, repeat: int) -> dict:
+    """Run a case `repeat` times in fresh subprocesses; keep the fastest run."""
+    runs = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, __file__, "--child", case, str(tree)],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"{case} failed:\n{proc.stderr}")
+        runs.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    best = min(runs, key=lambda r: r["seconds"])
+    seconds = max(best["seconds"], 1e-9)
+    return {
+        "seconds": round(seconds, 4),
+        "files": best["files"],
+        "bytes": best["bytes"],
+        "files_per_sec": round(best["files"] / seconds, 1),
+        "mb_per_sec": round(best["bytes"] / seconds / 1_000_000, 2),
+        "peak_rss_kb": max(r["peak_rss_kb"] for r in runs),
+    }
+
+
+def ensure_tree(workdir: Path, size: int) -> Path:
+    """Build (or reuse) the synthetic tree for a size."""
+    tree = workdir / f"tree-{size}"
+    marker = workdir / f"tree-{size}.built"
+    if not marker.exists():
+        shutil.rmtree(tree, ignore_errors=True)
+        tree.mkdir(parents=True)
+        planted = build_tree(tree, size)
+        marker.write_text(f"{planted}\n")
+        print(f"Built {size} files ({planted} planted findings) in {tree}", file=sys.stderr)
+    return tree
+
+
+def compare(results: dict, baselines: dict, tolerance: float) -> list[str]:
+    """Names of cases more than `tolerance` slower than their baseline."""
+    regressions = []
+    for name, result in results.items():
+        base = baselines.get(name)
+        if not base:
+            continue
+        result["baseline_files_per_sec"] = base["files_per_sec"]
+        result["change"] = round(result["files_per_sec"] / base["files_per_sec"] - 1, 3)
+        if base["seconds"] < MIN_COMPARE_SECONDS:
+            continue
+        if result["files_per_sec"] < base["files_per_sec"] * (1 - tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def print_results(results: dict, regressions: list[str]) -> None:
+    print(f"{'case':<24} {'files':>7} {'sec':>9} {'files/s':>10} {'MB/s':>8} {'RSS MB':>8} {'vs base':>8}")
+    print("-" * 80)
+    for name, r in results.items():
+        change = f"{r['change']:+.0%}" if "change" in r else "-"
+        flag = "  REGRESSION" if name in regressions else ""
+        print(f"{name:<24} {r['files']:>7} {r['seconds']:>9.3f} {r['files_per_sec']:>10.0f} "
+              f"{r['mb_per_sec']:>8.2f} {r['peak_rss_kb'] / 1024:>8.1f} {change:>8}{flag}")
+
+
+def main():
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        run_child(sys.argv[2], Path(sys.argv[3]))
+        return
+
+    parser = argparse.ArgumentParser(description="Benchmark the plugin-maker scripts")
+    parser.add_argument("--sizes", default=",".join(map(str, DEFAULT_SIZES)),
+                        help="Comma-separated tree sizes in files (default: 10,1000,50000)")
+    parser.add_argument("--cases", default=",".join(CASES),
+                        help=f"Comma-separated cases (default: {','.join(CASES)})")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; fastest is kept (default: 3)")
+    parser.add_argument("--workdir", help="Build (or reuse) trees here and keep them")
+    parser.add_argument("--baselines", default=str(DEFAULT_BASELINES),
+                        help="Baseline JSON file (default: benchmarks/baselines.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baselines")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit 1 on regressions; baselines must come from this host")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown before flagging (default: 0.20)")
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+    args = parser.parse_args()
+
+    cases = [c.strip() for c in args.cases.split(",") if c.strip()]
+    unknown = [c for c in cases if c not in CASES]
+    if unknown:
+        print(f"Error: unknown case(s): {', '.join(unknown)}", file=sys.stderr)
+        sys.exit(2)
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+
+    if args.workdir:
+        workdir = Path(args.workdir)
+        cleanup = False
+    else:
+        workdir = Path(tempfile.mkdtemp(prefix="pm-bench-trees-"))
+        cleanup = True
+
+    try:
+        results = {}
+        for size in sizes:
+            tree = ensure_tree(workdir, size)
+            for case in cases:
+                results[f"{case}/{size}"] = measure(case, tree, args.repeat)
+    finally:
+        if cleanup:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    baselines_path = Path(args.baselines)
+    baselines = json.loads(baselines_path.read_text()) if baselines_path.exists() else {}
+    regressions = [] if args.save_baseline else compare(results, baselines, args.tolerance)
+    missing = [name for name in results if name not in baselines]
+    if missing and not args.save_baseline:
+        print(f"Note: no baseline for {', '.join(missing)} in {baselines_path} (not gated)", file=sys.stderr)
+
+    if args.save_baseline:
+        baselines.update(results)
+        baselines_path.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+        print(f"Saved {len(results)} baseline(s) to {baselines_path}", file=sys.stderr)
+
+    if args.json:
+        print(json.dumps({"results": results, "regressions": regressions, "checked": args.check}, indent=2))
+    else:
+        print_results(results, regressions)
+        if regressions and args.check:
+            print(f"\n[FAIL] {len(regressions)} case(s) more than {args.tolerance:.0%} slower than baseline")
+        elif regressions:
+            print(f"\n[NOTE] {len(regressions)} case(s) more than {args.tolerance:.0%} slower than baseline "
+                  "(not gated: pass --check with baselines recorded on this host)")
+
+    sys.exit(1 if regressions and args.check else 0)
+
+
+if __name__ == "__main__":
+    main()
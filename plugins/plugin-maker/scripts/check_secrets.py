@@ -8,11 +8,19 @@ Usage:
     python3 check_secrets.py [plugin-path]
     python3 check_secrets.py .                      # Scan current directory
     python3 check_secrets.py --json .               # Machine-readable output
+    python3 check_secrets.py --format jsonl .       # One finding per line, as found
+    python3 check_secrets.py --format sarif . > scan.sarif
     python3 check_secrets.py --strict .             # Exit 1 on warnings too
+    python3 check_secrets.py --jobs 0 .             # Scan files on all cores
+    python3 check_secrets.py --cache .              # Reuse findings for unchanged files
+    python3 check_secrets.py --staged .             # Pre-commit: only staged hunks
+    python3 check_secrets.py --since origin/main .  # Only lines changed since a ref
+    python3 check_secrets.py --max-file-size 10M --large-files head .
+    python3 check_secrets.py --entropy .            # Also flag high-entropy strings
 
 Checks:
     1. Sensitive file patterns (.env, credentials/, *.key, etc.)
-    2. Hardcoded secrets in code (API keys, tokens, etc.)
+    2. Hardcoded secrets in code (API keys, tokens, etc.; optionally high-entropy strings)
     3. Hardcoded user paths (/Users/xxx/.claude/, /home/xxx/.claude/)
     4. .gitignore configuration validation
 """
@@ -20,9 +28,16 @@ Checks:
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json as json_mod
+import math
+import os
 import re
+import string
+import subprocess
 import sys
+from collections import Counter
+from collections.abc import Callable, Iterator
 from pathlib import Path
 
 # --- Sensitive file patterns ---
@@ -107,6 +122,65 @@ USER_PATH_PATTERNS = [
     (r'~/\.claude/', "Hardcoded home-relative .claude path (use ${CLAUDE_PLUGIN_ROOT})"),
 ]
 
+# --- Entropy detection (opt-in: --entropy) ---
+
+ENTROPY_SECRET_TYPE = "High Entropy String"
+# Shannon entropy thresholds in bits per character
+ENTROPY_THRESHOLD = 4.5
+ENTROPY_HEX_THRESHOLD = 3.0
+ENTROPY_MIN_LENGTH = 20
+# A string of n characters has at most log2(n) bits/char, so short strings are
+# held to this fraction of log2(n) instead (random base64 of 20-40 characters
+# scores above it ~95% of the time); the thresholds above cap it.
+ENTROPY_LENGTH_RATIO = 0.87
+# Hex digests (md5, sha1/git, sha256) are everywhere in docs and lockfiles
+ENTROPY_HEX_DIGEST_LENGTHS = frozenset({32, 40, 64})
+
+_HEX_CHARS = frozenset(string.hexdigits)
+_HAS_DIGIT = re.compile(r'\d')
+_HAS_ALPHA = re.compile(r'[A-Za-z]')
+
+
+def entropy_settings(threshold: float = ENTROPY_THRESHOLD, hex_threshold: float = ENTROPY_HEX_THRESHOLD,
+                     min_length: int = ENTROPY_MIN_LENGTH) -> dict:
+    """Entropy detector settings, passed as `entropy=` through the scan functions."""
+    return {
+        "threshold": threshold,
+        "hex_threshold": hex_threshold,
+        "min_length": min_length,
+        # Runs of the base64/base64url alphabet, which also covers hex
+        "candidates": re.compile(rf"[A-Za-z0-9+/=_-]{{{min_length},}}"),
+    }
+
+
+def shannon_entropy(token: str) -> float:
+    """Shannon entropy of a string in bits per character."""
+    length = len(token)
+    # Counter tallies characters in C; the Python loop is over distinct characters only
+    return -sum(n / length * math.log2(n / length) for n in Counter(token).values())
+
+
+def _entropy_hits(content: str, entropy: dict) -> list[tuple[int, float]]:
+    """Offsets (and scores) of candidate strings in content above the entropy thresholds."""
+    hits = []
+    for m in entropy["candidates"].finditer(content):
+        token = m.group()
+        # Require letters and digits: long words and identifiers are not secrets
+        if not _HAS_DIGIT.search(token) or not _HAS_ALPHA.search(token):
+            continue
+        if _HEX_CHARS.issuperset(token):
+            if len(token) in ENTROPY_HEX_DIGEST_LENGTHS:
+                continue
+            limit = entropy["hex_threshold"]
+        else:
+            limit = entropy["threshold"]
+        limit = min(limit, ENTROPY_LENGTH_RATIO * math.log2(len(token)))
+        score = shannon_entropy(token)
+        if score > limit:
+            hits.append((m.start(), score))
+    return hits
+
+
 # --- Exclusions ---
 
 EXCLUDE_EXTENSIONS = {'.pyc', '.pyo', '.so', '.dll', '.exe', '.bin', '.jpg', '.png', '.gif', '.ico', '.woff', '.woff2', '.ttf'}
@@ -116,6 +190,68 @@ PLACEHOLDER_MARKERS = ['your_', 'xxx', 'example', 'placeholder', 'changeme', 'to
 
 CODE_EXTENSIONS = {'.py', '.js', '.ts', '.json', '.yml', '.yaml', '.sh', '.md', '.txt', '.cfg', '.ini', '.toml', '.env'}
 
+# --- Result kinds ---
+
+# on_finding kinds -> scan_plugin result keys; the first three fail the scan
+RESULT_KEYS = {
+    kind: f"{kind}s" for kind in ("sensitive_file", "hardcoded_secret", "hardcoded_path", "gitignore_warning")
+}
+RESULT_KEYS["skipped"] = "skipped"
+FAILING_KINDS = ("sensitive_file", "hardcoded_secret", "hardcoded_path")
+
+OUTPUT_FORMATS = ("text", "json", "jsonl", "sarif")
+
+# --- Parallelism ---
+
+# Below this many files, process-pool startup costs more than it saves
+PARALLEL_MIN_FILES = 200
+
+# --- Large files ---
+
+# Files above MAX_FILE_SIZE bytes are handled per LARGE_FILE_POLICY:
+#   skip  - not scanned
+#   head  - only the first MAX_FILE_SIZE bytes are scanned
+#   chunk - whole file scanned in CHUNK_SIZE mmap windows (flat memory)
+MAX_FILE_SIZE = 2 * 1024 * 1024
+LARGE_FILE_POLICIES = ("skip", "head", "chunk")
+LARGE_FILE_POLICY = "chunk"
+CHUNK_SIZE = 1024 * 1024
+# Re-read across hard cuts in very long lines; longer than any single rule match
+CHUNK_OVERLAP = 4096
+
+# --- Binary sniffing ---
+
+# Bytes read from the start of each file to decide whether it is text
+SNIFF_SIZE = 8192
+BINARY_MAGIC = [
+    (b'\x89PNG\r\n\x1a\n', "PNG"),
+    (b'GIF87a', "GIF"),
+    (b'GIF89a', "GIF"),
+    (b'\xff\xd8\xff', "JPEG"),
+    (b'%PDF-', "PDF"),
+    (b'PK\x03\x04', "ZIP"),
+    (b'\x1f\x8b', "gzip"),
+    (b'\x28\xb5\x2f\xfd', "zstd"),
+    (b'\xfd7zXZ\x00', "xz"),
+    (b"7z\xbc\xaf'\x1c", "7z"),
+    (b'\x7fELF', "ELF"),
+    (b'\xcf\xfa\xed\xfe', "Mach-O"),
+    (b'\xfe\xed\xfa\xcf', "Mach-O"),
+    (b'\xca\xfe\xba\xbe', "Mach-O/Java class"),
+    (b'SQLite format 3\x00', "SQLite"),
+    (b'wOFF', "WOFF"),
+    (b'wOF2', "WOFF2"),
+]
+# Control bytes that still occur in text (\b \t \n \f \r ESC)
+TEXT_CONTROL_BYTES = frozenset(b'\b\t\n\f\r\x1b')
+# More than this share of other control bytes means binary
+BINARY_CONTROL_RATIO = 0.3
+
+# --- Scan cache ---
+
+# Default cache location, relative to the scanned plugin (excluded from scans and staging)
+DEFAULT_CACHE_PATH = ".plugin-state/secrets-cache.json"
+
 
 def match_pattern(filename: str, pattern: str) -> bool:
     """Check if filename matches a glob pattern."""
@@ -123,26 +259,94 @@ def match_pattern(filename: str, pattern: str) -> bool:
     return fnmatch.fnmatch(filename.lower(), pattern.lower())
 
 
+def _compile_globs(patterns: list[str]) -> list[tuple[re.Pattern, str]]:
+    """Precompile glob patterns for case-insensitive name matching (see match_pattern)."""
+    import fnmatch
+    return [(re.compile(fnmatch.translate(p.lower())), p) for p in patterns]
+
+
+SENSITIVE_DIR_GLOBS = _compile_globs([p for p in SENSITIVE_FILE_PATTERNS if p.endswith("/")])
+SENSITIVE_NAME_GLOBS = _compile_globs([p for p in SENSITIVE_FILE_PATTERNS if not p.endswith("/")])
+
+
+def _sensitive_reason(item: Path, is_dir: bool) -> str | None:
+    """Return why a file or directory name is sensitive, or None."""
+    if is_dir:
+        name = item.name.lower() + "/"
+        for regex, pattern in SENSITIVE_DIR_GLOBS:
+            if regex.match(name):
+                return f"Sensitive directory: {pattern}"
+    elif item.suffix not in EXCLUDE_EXTENSIONS:
+        name = item.name.lower()
+        for regex, pattern in SENSITIVE_NAME_GLOBS:
+            if regex.match(name):
+                return f"Sensitive file: {pattern}"
+    return None
+
+
+def walk_plugin(plugin_path: Path) -> Iterator[tuple[Path, bool, bool]]:
+    """Yield (path, is_dir, is_file) for every entry under plugin_path.
+
+    A single os.scandir walk that prunes EXCLUDE_DIRS before descending, so
+    node_modules, .venv and friends are never entered. Symlinked directories
+    are reported but not followed.
+    """
+    stack = [plugin_path]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.name in EXCLUDE_DIRS:
+                continue
+            try:
+                is_dir, is_file = entry.is_dir(), entry.is_file()
+                descend = is_dir and not entry.is_symlink()
+            except OSError:
+                continue
+            path = Path(entry.path)
+            yield path, is_dir, is_file
+            if descend:
+                stack.append(path)
+
+
 def find_sensitive_files(plugin_path: Path) -> list[tuple[Path, str]]:
     """Scan for sensitive files and directories."""
     findings = []
 
-    for item in plugin_path.rglob("*"):
-        if any(part in EXCLUDE_DIRS for part in item.parts):
+    for item, is_dir, _ in walk_plugin(plugin_path):
+        reason = _sensitive_reason(item, is_dir)
+        if reason:
+            findings.append((item, reason))
+
+    return sorted(findings)
+
+
+def find_sensitive_changed_files(plugin_path: Path, changed: list[str]) -> list[tuple[Path, str]]:
+    """Check only changed files, and the directories containing them, for sensitive names."""
+    findings = []
+    seen_dirs: set[Path] = set()
+
+    for rel_path in changed:
+        item = plugin_path / rel_path
+        if any(part in EXCLUDE_DIRS for part in Path(rel_path).parts):
             continue
 
-        if item.is_dir():
-            for pattern in SENSITIVE_FILE_PATTERNS:
-                if pattern.endswith("/") and match_pattern(item.name + "/", pattern):
-                    findings.append((item, f"Sensitive directory: {pattern}"))
-                    break
-        else:
-            if item.suffix in EXCLUDE_EXTENSIONS:
+        for parent in reversed(item.relative_to(plugin_path).parents[:-1]):
+            directory = plugin_path / parent
+            if directory in seen_dirs:
                 continue
-            for pattern in SENSITIVE_FILE_PATTERNS:
-                if not pattern.endswith("/") and match_pattern(item.name, pattern):
-                    findings.append((item, f"Sensitive file: {pattern}"))
-                    break
+            seen_dirs.add(directory)
+            reason = _sensitive_reason(directory, True)
+            if reason:
+                findings.append((directory, reason))
+
+        reason = _sensitive_reason(item, False)
+        if reason:
+            findings.append((item, reason))
 
     return findings
 
@@ -171,56 +375,476 @@ def _is_comment_line(line: str, in_block_comment: bool) -> tuple[bool, bool]:
     return False, False
 
 
-def scan_file_content(file_path: Path) -> list[tuple[int, str, str]]:
-    """Scan file contents for hardcoded secrets."""
-    findings = []
+# Literal prefilter: a rule can only match text that contains one of its keywords.
+# Secret keywords are lowercase (rules are case-insensitive); rules without an
+# entry here have no literal anchor and always run.
+PATTERN_KEYWORDS = {
+    "API Key": ("api",),
+    "Token": ("token",),
+    "Access Token": ("token",),
+    "Refresh Token": ("token",),
+    "Auth Token": ("token",),
+    "Slack Bot Token": ("xoxb-",),
+    "Slack User Token": ("xoxp-",),
+    "Slack App Token": ("xoxa-",),
+    "Slack Session Token": ("xoxs-",),
+    "Slack Webhook": ("hooks.slack.com",),
+    "Discord Webhook": ("discord",),
+    "AWS Access Key ID": ("akia",),
+    "AWS Secret Key": ("aws",),
+    "GCP Private Key": ("private",),
+    "GCP Service Account JSON": ("service_account",),
+    "GCP Service Account": ("client_email",),
+    "Azure Storage Account Key": ("accountkey=",),
+    "Password": ("password",),
+    "Secret": ("secret",),
+    "Private Key": ("private",),
+    "Database URL with credentials": ("://",),
+    "Microsoft Webhook": ("webhook.office.com",),
+    "Hardcoded macOS user path": ("/Users/",),
+    "Hardcoded Linux user path": ("/home/",),
+    "Hardcoded Windows user path": ("C:\\Users\\",),
+    "Hardcoded macOS Library path": ("/Users/",),
+    "Hardcoded Linux config path": ("/home/",),
+    "Hardcoded home-relative .claude path (use ${CLAUDE_PLUGIN_ROOT})": ("~/.claude/",),
+}
+
+# Precompiled once at import as (regex, label, keywords), in first-match-wins order
+COMPILED_SECRET_PATTERNS = [
+    (re.compile(p, re.IGNORECASE), t, PATTERN_KEYWORDS.get(t)) for p, t in SECRET_PATTERNS
+]
+COMPILED_USER_PATH_PATTERNS = [
+    (re.compile(p), t, PATTERN_KEYWORDS.get(t)) for p, t in USER_PATH_PATTERNS
+]
 
-    try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-        lines = content.split('\n')
-        in_block = False
 
-        for line_num, line in enumerate(lines, 1):
+def _active_rules(rules: list, content: str, haystack: str | None) -> list[tuple[re.Pattern, str]]:
+    """Return the rules that match somewhere in content, cheapest check first.
+
+    A `haystack` of None skips the keyword prefilter.
+    """
+    active = []
+    for regex, label, keywords in rules:
+        if keywords is not None and haystack is not None and not any(k in haystack for k in keywords):
+            continue
+        if regex.search(content):
+            active.append((regex, label))
+    return active
+
+
+def _scan_chunk(content: str, first_line: int = 1, in_block: bool = False,
+                continued_comment: bool | None = None,
+                entropy: dict | None = None) -> tuple[list, list, bool, bool]:
+    """Scan a run of lines starting at line number `first_line`.
+
+    `in_block` carries block-comment state in from the previous chunk. If the
+    chunk starts mid-line (a hard cut through a very long line),
+    `continued_comment` is that line's comment status, reused for the first line.
+    With `entropy` settings (see entropy_settings), lines without a pattern match
+    are also checked for high-entropy strings.
+
+    Returns (secret_findings, path_findings, in_block, last_line_is_comment).
+    """
+    secrets: list[tuple[int, str, str]] = []
+    paths: list[tuple[int, str, str]] = []
+
+    # A rule that never matches the whole chunk cannot match any of its lines,
+    # so most files are settled here without a per-line pass.
+    # The lowercase keyword prefilter is only exact for ASCII: IGNORECASE also
+    # folds a few non-ASCII letters (e.g. U+017F long s) onto ASCII ones
+    secret_rules = _active_rules(COMPILED_SECRET_PATTERNS, content,
+                                 content.lower() if content.isascii() else None)
+    path_rules = _active_rules(COMPILED_USER_PATH_PATTERNS, content, content)
+    entropy_hits = _entropy_hits(content, entropy) if entropy else []
+    if (not secret_rules and not path_rules and not entropy_hits
+            and not any(m in content for m in _BLOCK_MARKERS)):
+        # Nothing to report and block-comment state cannot change
+        if continued_comment is not None and '\n' not in content:
+            return secrets, paths, in_block, continued_comment
+        last_line = content.rsplit('\n', 1)[-1]
+        return secrets, paths, in_block, _is_comment_line(last_line, in_block)[0]
+
+    is_comment = False
+    line_end, hit = -1, 0
+    for line_num, line in enumerate(content.split('\n'), first_line):
+        line_end += 1 + len(line)
+        if line_num == first_line and continued_comment is not None:
+            is_comment = continued_comment
+        else:
             is_comment, in_block = _is_comment_line(line, in_block)
-            if is_comment:
-                continue
 
-            for pattern, secret_type in SECRET_PATTERNS:
-                if re.search(pattern, line, re.IGNORECASE):
-                    if not any(p in line.lower() for p in PLACEHOLDER_MARKERS):
-                        snippet = line.strip()[:100]
-                        findings.append((line_num, secret_type, snippet))
-                    break
+        # Entropy hits are sorted by offset; collect the ones on this line
+        high_entropy = False
+        while hit < len(entropy_hits) and entropy_hits[hit][0] < line_end:
+            high_entropy = True
+            hit += 1
+
+        if is_comment:
+            continue
+
+        for pattern, secret_type in secret_rules:
+            if pattern.search(line):
+                if not any(p in line.lower() for p in PLACEHOLDER_MARKERS):
+                    secrets.append((line_num, secret_type, line.strip()[:100]))
+                break
+        else:
+            if high_entropy and not any(p in line.lower() for p in PLACEHOLDER_MARKERS):
+                secrets.append((line_num, ENTROPY_SECRET_TYPE, line.strip()[:100]))
+
+        for pattern, desc in path_rules:
+            if pattern.search(line):
+                if '${' not in line and '$HOME' not in line and '~/' not in line:
+                    paths.append((line_num, desc, line.strip()[:100]))
+                break
+
+    return secrets, paths, in_block, is_comment
+
+
+# Substrings that can open or close a block comment (see _is_comment_line)
+_BLOCK_MARKERS = ('/*', '*/', '-->', '"""', "'''")
+
+
+def scan_text(content: str, entropy: dict | None = None) -> tuple[list[tuple[int, str, str]], list[tuple[int, str, str]]]:
+    """Scan text for hardcoded secrets and user paths in a single pass.
+
+    Returns (secret_findings, path_findings), each a list of (line_num, type, snippet).
+    """
+    secrets, paths, _, _ = _scan_chunk(content, entropy=entropy)
+    return secrets, paths
+
+
+def scan_file_chunked(file_path: Path, chunk_size: int = CHUNK_SIZE,
+                      overlap: int = CHUNK_OVERLAP, entropy: dict | None = None) -> tuple[list, list]:
+    """Scan a file through mmap in bounded windows; memory use is independent of file size.
+
+    Windows end on a newline when one exists, so line-level results match
+    scan_text. A line longer than `chunk_size` (minified bundles) is cut hard and
+    the next window re-reads `overlap` bytes so matches across the cut are found.
+    """
+    import mmap
+
+    secrets: list[tuple[int, str, str]] = []
+    paths: list[tuple[int, str, str]] = []
+    seen: set[tuple[int, str]] = set()
+
+    with open(file_path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return secrets, paths
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            release, released = hasattr(mmap, 'MADV_DONTNEED'), 0
+            pos, line_num, in_block = 0, 1, False
+            continued: bool | None = None
+            while pos < size:
+                end = min(pos + chunk_size, size)
+                read_end = end
+                if end < size:
+                    newline = mm.rfind(b'\n', pos, end)
+                    if newline >= 0:
+                        end = read_end = newline + 1
+                    else:
+                        read_end = min(end + overlap, size)
+
+                window = mm[pos:read_end]
+                text = window.decode('utf-8', errors='ignore')
+                if read_end > end:
+                    # Overlap bytes belong to the current line; don't let a newline in
+                    # them leak the next line's comment state into this window.
+                    text = text.split('\n', 1)[0]
+                found_secrets, found_paths, in_block, last_comment = _scan_chunk(
+                    text, line_num, in_block, continued, entropy,
+                )
+                for found, out in ((found_secrets, secrets), (found_paths, paths)):
+                    for finding in found:
+                        if (finding[0], finding[1]) not in seen:
+                            seen.add((finding[0], finding[1]))
+                            out.append(finding)
+
+                line_num += window[:end - pos].count(b'\n')
+                continued = None if end == size or mm[end - 1:end] == b'\n' else last_comment
+                if release:
+                    # Drop scanned pages so resident memory stays at about one window
+                    done = end // mmap.PAGESIZE * mmap.PAGESIZE
+                    if done > released:
+                        mm.madvise(mmap.MADV_DONTNEED, released, done - released)
+                        released = done
+                pos = end
+
+    return secrets, paths
+
+
+def sniff_binary(head: bytes) -> str | None:
+    """Classify the first bytes of a file. Returns a skip reason if it looks binary."""
+    for magic, kind in BINARY_MAGIC:
+        if head.startswith(magic):
+            return f"binary ({kind})"
+    if b'\0' in head:
+        return "binary (NUL bytes)"
+    if head:
+        control = sum(1 for b in head if b < 0x20 and b not in TEXT_CONTROL_BYTES)
+        if control / len(head) > BINARY_CONTROL_RATIO:
+            return "binary (control bytes)"
+    return None
+
+
+def scan_file(file_path: Path, max_size: int = MAX_FILE_SIZE,
+              large_files: str = LARGE_FILE_POLICY,
+              entropy: dict | None = None) -> tuple[list[tuple[int, str, str]], list[tuple[int, str, str]], str | None]:
+    """Read a file once and scan it for secrets and user paths.
+
+    Files whose first SNIFF_SIZE bytes look binary are not scanned. Files larger
+    than `max_size` bytes follow the `large_files` policy: "skip" (not scanned),
+    "head" (first `max_size` bytes only), or "chunk" (whole file via bounded
+    mmap windows).
+
+    Returns (secret_findings, path_findings, skip_reason); skip_reason is None
+    when the file was scanned.
+    """
+    try:
+        size = file_path.stat().st_size
+        with open(file_path, 'rb') as f:
+            if size <= max_size:
+                data = f.read()
+                reason = sniff_binary(data[:SNIFF_SIZE])
+            else:
+                reason = sniff_binary(f.read(SNIFF_SIZE))
+                if reason is None and large_files == "skip":
+                    reason = f"larger than {max_size} bytes"
+                if reason is None and large_files == "head":
+                    f.seek(0)
+                    data = f.read(max_size)
+        if reason:
+            return [], [], reason
+        if size > max_size and large_files == "chunk":
+            return (*scan_file_chunked(file_path, entropy=entropy), None)
+        content = data.decode('utf-8', errors='ignore')
     except Exception:
-        pass
+        return [], [], None
+    return (*scan_text(content, entropy), None)
 
-    return findings
+
+def scan_blob(data: bytes, max_size: int = MAX_FILE_SIZE, large_files: str = LARGE_FILE_POLICY,
+              entropy: dict | None = None) -> tuple[list[tuple[int, str, str]], list[tuple[int, str, str]], str | None]:
+    """scan_file for content already in memory (e.g. a staged git blob).
+
+    The "chunk" policy scans the whole blob, since it is already loaded.
+    """
+    reason = sniff_binary(data[:SNIFF_SIZE])
+    if reason is None and len(data) > max_size:
+        if large_files == "skip":
+            reason = f"larger than {max_size} bytes"
+        elif large_files == "head":
+            data = data[:max_size]
+    if reason:
+        return [], [], reason
+    return (*scan_text(data.decode('utf-8', errors='ignore'), entropy), None)
+
+
+def scan_file_content(file_path: Path) -> list[tuple[int, str, str]]:
+    """Scan file contents for hardcoded secrets."""
+    return scan_file(file_path)[0]
 
 
 def scan_user_paths(file_path: Path) -> list[tuple[int, str, str]]:
     """Scan file contents for hardcoded user paths."""
-    findings = []
+    return scan_file(file_path)[1]
+
+
+def scan_files(files: list[Path], jobs: int = 1, max_size: int = MAX_FILE_SIZE,
+               large_files: str = LARGE_FILE_POLICY, entropy: dict | None = None) -> Iterator[tuple[list, list, str | None]]:
+    """Scan files for secrets and user paths, in parallel when worthwhile.
+
+    Yields one scan_file result per input file, in input order, as soon as
+    each is available. `jobs` <= 0 uses every available core.
+    """
+    from functools import partial
+
+    scan = partial(scan_file, max_size=max_size, large_files=large_files, entropy=entropy)
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    if jobs == 1 or len(files) < PARALLEL_MIN_FILES:
+        yield from map(scan, files)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    # Large chunks keep IPC overhead low; map() preserves input order
+    chunksize = max(1, len(files) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(scan, files, chunksize=chunksize)
+
+
+def ruleset_hash(settings: str = "") -> str:
+    """Fingerprint of the scanner (plus scan settings); any change invalidates cached findings."""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(settings.encode())
+    return digest.hexdigest()[:16]
 
+
+def _file_sha256(file_path: Path) -> str:
+    """Hash a file in fixed-size blocks so large files are never fully loaded."""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_scan_cache(cache_path: Path, settings: str = "") -> dict:
+    """Load cached per-file findings. Returns {} if missing, unreadable, or stale."""
     try:
-        content = file_path.read_text(encoding='utf-8', errors='ignore')
-        lines = content.split('\n')
-        in_block = False
+        data = json_mod.loads(cache_path.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("ruleset") != ruleset_hash(settings):
+        return {}
+    return data.get("files", {})
+
+
+def save_scan_cache(cache_path: Path, entries: dict, settings: str = "") -> None:
+    """Atomically write per-file findings to the cache."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    tmp_path.write_text(
+        json_mod.dumps({"ruleset": ruleset_hash(settings), "files": entries}, ensure_ascii=False),
+        encoding='utf-8',
+    )
+    os.replace(tmp_path, cache_path)
+
+
+def scan_files_cached(files: list[Path], plugin_path: Path, cache_path: Path, jobs: int = 1,
+                      max_size: int = MAX_FILE_SIZE, large_files: str = LARGE_FILE_POLICY,
+                      entropy: dict | None = None) -> Iterator[tuple[list, list, str | None]]:
+    """Like scan_files, but reuses cached findings for unchanged files.
+
+    A file is unchanged if its size and mtime match the cache entry, or failing
+    that, if its content hash does. Entries for files no longer present are evicted.
+    """
+    settings = f"{max_size}:{large_files}"
+    if entropy:
+        settings += f":{entropy['threshold']}:{entropy['hex_threshold']}:{entropy['min_length']}"
+    cached = load_scan_cache(cache_path, settings)
+    entries: dict[str, dict] = {}
+    hits: dict[int, tuple[list, list, str | None]] = {}
+    misses: list[int] = []
+
+    for i, file_path in enumerate(files):
+        rel_path = str(file_path.relative_to(plugin_path))
+        try:
+            st = file_path.stat()
+        except OSError:
+            misses.append(i)
+            continue
 
-        for line_num, line in enumerate(lines, 1):
-            is_comment, in_block = _is_comment_line(line, in_block)
-            if is_comment:
+        entry = cached.get(rel_path)
+        if not entry or entry.get("size") != st.st_size or entry.get("mtime_ns") != st.st_mtime_ns:
+            try:
+                digest = _file_sha256(file_path)
+            except OSError:
+                misses.append(i)
                 continue
+            if not entry or entry.get("sha256") != digest:
+                entries[rel_path] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": digest}
+                misses.append(i)
+                continue
+            entry = dict(entry, size=st.st_size, mtime_ns=st.st_mtime_ns)
 
-            for pattern, desc in USER_PATH_PATTERNS:
-                if re.search(pattern, line):
-                    if '${' not in line and '$HOME' not in line and '~/' not in line:
-                        snippet = line.strip()[:100]
-                        findings.append((line_num, desc, snippet))
-                    break
-    except Exception:
-        pass
+        entries[rel_path] = entry
+        hits[i] = (
+            [tuple(f) for f in entry["secrets"]],
+            [tuple(f) for f in entry["paths"]],
+            entry.get("skipped"),
+        )
 
-    return findings
+    # Interleave cache hits with fresh results so output stays in file order
+    rescanned = scan_files([files[i] for i in misses], jobs, max_size, large_files, entropy)
+    try:
+        for i, file_path in enumerate(files):
+            if i in hits:
+                yield hits[i]
+                continue
+            secrets, paths, skipped = next(rescanned)
+            entry = entries.get(str(file_path.relative_to(plugin_path)))
+            if entry is not None:
+                entry["secrets"] = secrets
+                entry["paths"] = paths
+                entry["skipped"] = skipped
+            yield secrets, paths, skipped
+    finally:
+        # Runs even if the consumer stops early or closes the generator; files
+        # that were never scanned have no findings yet and are left out.
+        rescanned.close()
+        try:
+            save_scan_cache(cache_path, {k: v for k, v in entries.items() if "secrets" in v}, settings)
+        except OSError as e:
+            print(f"Warning: Could not write scan cache {cache_path}: {e}", file=sys.stderr)
+
+
+def _git(plugin_path: Path, *args: str) -> subprocess.CompletedProcess:
+    """Run git inside the plugin directory."""
+    return subprocess.run(
+        ["git", "-c", "core.quotePath=false", "-C", str(plugin_path), *args],
+        capture_output=True, text=True, check=False,
+    )
+
+
+_HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+def git_changes(plugin_path: Path, since: str | None = None, staged: bool = False) -> dict[str, set[int] | None] | None:
+    """Map changed files (relative to plugin_path) to their added/modified line numbers.
+
+    Compares the working tree against `since`, or the index against HEAD when
+    `staged`. A value of None means "every line" (untracked files in `since` mode).
+    Returns None when plugin_path is not inside a git work tree, so callers can
+    fall back to a full scan. Raises ValueError if git rejects the ref.
+    """
+    probe = _git(plugin_path, "rev-parse", "--is-inside-work-tree")
+    if probe.returncode != 0 or probe.stdout.strip() != "true":
+        return None
+
+    base = ["--cached"] if staged else [since or "HEAD"]
+    # Explicit prefixes: the hunk parser below expects "+++ b/<path>" even when
+    # the user has diff.noprefix or diff.mnemonicPrefix set
+    diff_args = ["diff", *base, "--relative", "--no-color", "--no-ext-diff", "--diff-filter=ACMR",
+                 "--src-prefix=a/", "--dst-prefix=b/"]
+
+    names = _git(plugin_path, *diff_args, "--name-only", "-z")
+    if names.returncode != 0:
+        raise ValueError(names.stderr.strip() or f"git diff failed for {base[0]}")
+    changes: dict[str, set[int] | None] = {name: set() for name in names.stdout.split("\0") if name}
+
+    hunks = _git(plugin_path, *diff_args, "-U0")
+    current: set[int] | None = None
+    for line in hunks.stdout.splitlines():
+        if line.startswith("+++ "):
+            target = line[4:]
+            if target.startswith('"') and target.endswith('"'):
+                target = target[1:-1]
+            current = changes.get(target[2:]) if target.startswith("b/") else None
+        elif line.startswith("@@") and current is not None:
+            m = _HUNK_HEADER.match(line)
+            if m:
+                start, count = int(m.group(1)), int(m.group(2) or 1)
+                current.update(range(start, start + count))
+
+    # New files that git doesn't track yet are entirely "changed"
+    if not staged:
+        untracked = _git(plugin_path, "ls-files", "--others", "--exclude-standard", "-z")
+        for name in untracked.stdout.split("\0"):
+            if name:
+                changes[name] = None
+
+    return changes
+
+
+def staged_blob(plugin_path: Path, rel_path: str) -> bytes | None:
+    """Content of rel_path as staged in the index, or None if git can't read it."""
+    result = subprocess.run(
+        ["git", "-C", str(plugin_path), "show", f":./{rel_path}"],
+        capture_output=True, check=False,
+    )
+    return result.stdout if result.returncode == 0 else None
 
 
 def check_gitignore(plugin_path: Path) -> list[str]:
@@ -248,56 +872,192 @@ def check_gitignore(plugin_path: Path) -> list[str]:
     return warnings
 
 
-def scan_plugin(plugin_path: Path) -> dict:
-    """Run full plugin scan."""
+def scan_plugin(plugin_path: Path, jobs: int = 1, cache_path: Path | None = None,
+                changes: dict[str, set[int] | None] | None = None,
+                max_size: int = MAX_FILE_SIZE, large_files: str = LARGE_FILE_POLICY,
+                on_finding: Callable[[str, dict], None] | None = None,
+                entropy: dict | None = None, staged: bool = False) -> dict:
+    """Run full plugin scan.
+
+    Args:
+        jobs: Worker processes for content scanning (1 = serial, 0 = all cores).
+            Findings are ordered by file and line regardless of `jobs`.
+        cache_path: If set, reuse and update per-file findings cached at this path.
+            Ignored when `changes` is given.
+        changes: If set (see git_changes), only these files are checked and only
+            findings on their changed lines are reported.
+        max_size, large_files: Size cutoff in bytes and the policy for files above
+            it ("skip", "head", or "chunk"); see scan_file.
+        on_finding: If set, called as on_finding(kind, item) for each finding as
+            soon as it is found, instead of collecting it in the result lists.
+            Kinds: sensitive_file, hardcoded_secret, hardcoded_path, skipped,
+            gitignore_warning. The verdict in "passed" is still computed.
+        entropy: Entropy detector settings (see entropy_settings); None disables it.
+            High-entropy strings are reported in hardcoded_secrets with type
+            ENTROPY_SECRET_TYPE.
+        staged: With `changes` from git_changes(staged=True), scan the content
+            staged in the index rather than the working tree, so line numbers
+            match the staged hunks after a partial `git add -p`.
+    """
     results = {
         "path": str(plugin_path),
         "sensitive_files": [],
         "hardcoded_secrets": [],
         "hardcoded_paths": [],
         "gitignore_warnings": [],
+        "skipped": [],
         "passed": True,
     }
+    failures = 0
+
+    def report(kind: str, item: dict) -> None:
+        nonlocal failures
+        if kind in FAILING_KINDS:
+            failures += 1
+        if on_finding is not None:
+            on_finding(kind, item)
+        elif kind == "sensitive_file":
+            results["sensitive_files"].append((item["file"], item["type"]))
+        elif kind == "gitignore_warning":
+            results["gitignore_warnings"].append(item["message"])
+        else:
+            results[RESULT_KEYS[kind]].append(item)
+
+    # Layers 1 + 2 share one walk: names are checked as entries are seen, and
+    # content-scan candidates are collected for the pass below.
+    files: list[Path] = []
+    if changes is not None:
+        sensitive_files = find_sensitive_changed_files(plugin_path, sorted(changes))
+        for rel_path in changes:
+            file_path = plugin_path / rel_path
+            if (file_path.suffix in CODE_EXTENSIONS and (staged or file_path.is_file())
+                    and not any(part in EXCLUDE_DIRS for part in Path(rel_path).parts)):
+                files.append(file_path)
+    else:
+        sensitive_files = []
+        for item, is_dir, is_file in walk_plugin(plugin_path):
+            reason = _sensitive_reason(item, is_dir)
+            if reason:
+                sensitive_files.append((item, reason))
+            if is_file and item.suffix in CODE_EXTENSIONS:
+                files.append(item)
+    files.sort()
+    sensitive_files.sort()
 
     # Layer 1: Sensitive file detection
-    sensitive_files = find_sensitive_files(plugin_path)
-    results["sensitive_files"] = [(str(f), desc) for f, desc in sensitive_files]
+    for f, desc in sensitive_files:
+        report("sensitive_file", {"file": str(f), "type": desc})
 
     # Layer 2: Content scanning (secrets + user paths)
-    for file_path in plugin_path.rglob("*"):
-        if not file_path.is_file() or file_path.suffix not in CODE_EXTENSIONS:
-            continue
-        if any(part in EXCLUDE_DIRS for part in file_path.parts):
-            continue
-
-        # Hardcoded secrets
-        for line_num, secret_type, snippet in scan_file_content(file_path):
-            results["hardcoded_secrets"].append({
-                "file": str(file_path.relative_to(plugin_path)),
+    if changes is not None and staged:
+        blobs = (staged_blob(plugin_path, str(f.relative_to(plugin_path))) for f in files)
+        scanned = ((([], [], None) if blob is None else scan_blob(blob, max_size, large_files, entropy))
+                   for blob in blobs)
+    elif changes is not None:
+        # Whole files are scanned so block-comment state stays correct; findings
+        # outside the changed hunks are dropped below.
+        scanned = scan_files(files, jobs, max_size, large_files, entropy)
+    elif cache_path is not None:
+        scanned = scan_files_cached(files, plugin_path, cache_path, jobs, max_size, large_files, entropy)
+    else:
+        scanned = scan_files(files, jobs, max_size, large_files, entropy)
+
+    # zip() stops at the end of `files` without finishing `scanned`; it is closed
+    # explicitly below so scan_files_cached writes its cache deterministically.
+    for file_path, (secrets, paths, skipped) in zip(files, scanned):
+        rel_path = str(file_path.relative_to(plugin_path))
+        if skipped:
+            report("skipped", {"file": rel_path, "reason": skipped})
+        changed_lines = changes.get(rel_path) if changes is not None else None
+        if changed_lines is not None:
+            secrets = [f for f in secrets if f[0] in changed_lines]
+            paths = [f for f in paths if f[0] in changed_lines]
+        for line_num, secret_type, snippet in secrets:
+            report("hardcoded_secret", {
+                "file": rel_path,
                 "line": line_num,
                 "type": secret_type,
                 "snippet": snippet,
             })
 
-        # Hardcoded user paths
-        for line_num, path_type, snippet in scan_user_paths(file_path):
-            results["hardcoded_paths"].append({
-                "file": str(file_path.relative_to(plugin_path)),
+        for line_num, path_type, snippet in paths:
+            report("hardcoded_path", {
+                "file": rel_path,
                 "line": line_num,
                 "type": path_type,
                 "snippet": snippet,
             })
+    scanned.close()
 
     # Layer 3: .gitignore validation
-    results["gitignore_warnings"] = check_gitignore(plugin_path)
+    for warning in check_gitignore(plugin_path):
+        report("gitignore_warning", {"message": warning})
 
     # Final verdict
-    if results["sensitive_files"] or results["hardcoded_secrets"] or results["hardcoded_paths"]:
+    if failures:
         results["passed"] = False
 
     return results
 
 
+def _slug(label: str) -> str:
+    """Lowercase kebab-case slug for SARIF rule ids, e.g. 'Slack Bot Token' -> 'slack-bot-token'."""
+    return re.sub(r'[^a-z0-9]+', '-', label.lower().split(" (")[0]).strip('-')
+
+
+def to_sarif(results: dict) -> dict:
+    """Convert scan results to a SARIF 2.1.0 log (GitHub code scanning compatible).
+
+    Snippets are deliberately left out so uploaded reports never contain the secret.
+    """
+    plugin_path = Path(results["path"])
+    rules: dict[str, dict] = {}
+    sarif_results = []
+
+    def add(rule_id: str, label: str, level: str, message: str, file: str | None = None, line: int | None = None):
+        rules.setdefault(rule_id, {
+            "id": rule_id,
+            "name": label,
+            "shortDescription": {"text": label},
+            "defaultConfiguration": {"level": level},
+        })
+        result = {"ruleId": rule_id, "level": level, "message": {"text": message}}
+        if file is not None:
+            location = {"artifactLocation": {"uri": file, "uriBaseId": "PLUGINROOT"}}
+            if line is not None:
+                location["region"] = {"startLine": line}
+            result["locations"] = [{"physicalLocation": location}]
+        sarif_results.append(result)
+
+    for file_path, desc in results["sensitive_files"]:
+        path = Path(file_path)
+        rel = path.relative_to(plugin_path).as_posix() if path.is_relative_to(plugin_path) else file_path
+        label = desc.split(": ", 1)[0]
+        add(_slug(label), label, "error", desc, rel)
+    for item in results["hardcoded_secrets"]:
+        add(f"hardcoded-secret/{_slug(item['type'])}", item["type"], "error",
+            f"Hardcoded secret: {item['type']}", item["file"], item["line"])
+    for item in results["hardcoded_paths"]:
+        add(f"hardcoded-path/{_slug(item['type'])}", item["type"], "error",
+            item["type"], item["file"], item["line"])
+    for warning in results["gitignore_warnings"]:
+        add("gitignore", ".gitignore configuration", "warning", warning, ".gitignore")
+
+    return {
+        "$schema": "https://json.schemastore.org/sarif-2.1.0.json",
+        "version": "2.1.0",
+        "runs": [{
+            "tool": {"driver": {
+                "name": "check_secrets",
+                "informationUri": "https://github.com/rapportlabs-pb-group/pb-plugins",
+                "rules": list(rules.values()),
+            }},
+            "originalUriBaseIds": {"PLUGINROOT": {"uri": plugin_path.as_uri() + "/"}},
+            "results": sarif_results,
+        }],
+    }
+
+
 def print_results(results: dict) -> bool:
     """Print human-readable scan results."""
     print("\n" + "=" * 60)
@@ -341,6 +1101,16 @@ def print_results(results: dict) -> bool:
     else:
         print("[PASS] No hardcoded user paths\n")
 
+    # Files not content-scanned (informational)
+    if results.get("skipped"):
+        print(f"[INFO] {len(results['skipped'])} file(s) not scanned")
+        print("-" * 40)
+        for item in results["skipped"][:10]:
+            print(f"  - {item['file']} ({item['reason']})")
+        if len(results["skipped"]) > 10:
+            print(f"  ... and {len(results['skipped']) - 10} more")
+        print()
+
     # .gitignore warnings
     if results["gitignore_warnings"]:
         print("[WARN] .gitignore issues")
@@ -369,6 +1139,18 @@ def print_results(results: dict) -> bool:
     return results["passed"]
 
 
+def _parse_size(value: str) -> int:
+    """Parse a byte count with an optional K/M/G suffix."""
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    value = value.strip().upper().removesuffix("B")
+    try:
+        if value and value[-1] in units:
+            return int(float(value[:-1]) * units[value[-1]])
+        return int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid size: {value!r}") from None
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Scan plugin for secrets and sensitive information before distribution"
@@ -383,13 +1165,90 @@ def main():
         "--json",
         action="store_true",
         dest="json_output",
-        help="Output results as JSON",
+        help="Output results as JSON (same as --format json)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=OUTPUT_FORMATS,
+        default="text",
+        help="Output format: text, json, jsonl (one finding per line, streamed as found), "
+             "or sarif (SARIF 2.1.0 for CI annotations)",
     )
     parser.add_argument(
         "--strict",
         action="store_true",
         help="Exit 1 on warnings too (not just failures)",
     )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help=f"Scan files with N worker processes (0 = all cores; "
+             f"trees under {PARALLEL_MIN_FILES} files are always scanned serially)",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help=f"Reuse findings for unchanged files (cached in <plugin>/{DEFAULT_CACHE_PATH})",
+    )
+    parser.add_argument(
+        "--cache-file",
+        metavar="PATH",
+        help="Cache location (implies --cache)",
+    )
+    parser.add_argument(
+        "--max-file-size",
+        type=_parse_size,
+        default=MAX_FILE_SIZE,
+        metavar="SIZE",
+        help=f"Size cutoff for --large-files, e.g. 512K or 10M (default: {MAX_FILE_SIZE // (1024 * 1024)}M)",
+    )
+    parser.add_argument(
+        "--large-files",
+        choices=LARGE_FILE_POLICIES,
+        default=LARGE_FILE_POLICY,
+        help="Files above --max-file-size: skip them, scan only the head, "
+             f"or scan in bounded chunks (default: {LARGE_FILE_POLICY})",
+    )
+    parser.add_argument(
+        "--entropy",
+        action="store_true",
+        help="Also flag high-entropy base64/hex strings",
+    )
+    parser.add_argument(
+        "--entropy-threshold",
+        type=float,
+        default=ENTROPY_THRESHOLD,
+        metavar="BITS",
+        help=f"Entropy threshold in bits/char for --entropy (default: {ENTROPY_THRESHOLD}; "
+             "short strings use a lower, length-scaled limit)",
+    )
+    parser.add_argument(
+        "--entropy-hex-threshold",
+        type=float,
+        default=ENTROPY_HEX_THRESHOLD,
+        metavar="BITS",
+        help=f"Entropy threshold for hex-only strings (default: {ENTROPY_HEX_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--entropy-min-length",
+        type=int,
+        default=ENTROPY_MIN_LENGTH,
+        metavar="N",
+        help=f"Shortest string checked by --entropy (default: {ENTROPY_MIN_LENGTH})",
+    )
+    diff_group = parser.add_mutually_exclusive_group()
+    diff_group.add_argument(
+        "--since",
+        metavar="REF",
+        help="Only check files and lines changed since git REF (plus untracked files)",
+    )
+    diff_group.add_argument(
+        "--staged",
+        action="store_true",
+        help="Only check files and lines staged for commit (for pre-commit hooks)",
+    )
 
     args = parser.parse_args()
     plugin_path = Path(args.plugin_path).resolve()
@@ -402,17 +1261,55 @@ def main():
         print(f"Error: Not a directory: {plugin_path}", file=sys.stderr)
         sys.exit(1)
 
-    results = scan_plugin(plugin_path)
+    cache_path = None
+    if args.cache_file:
+        cache_path = Path(args.cache_file).resolve()
+    elif args.cache:
+        cache_path = plugin_path / DEFAULT_CACHE_PATH
+
+    changes = None
+    if args.since or args.staged:
+        try:
+            changes = git_changes(plugin_path, since=args.since, staged=args.staged)
+        except ValueError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        if changes is None:
+            print("Note: Not a git repository, falling back to a full scan", file=sys.stderr)
+
+    output_format = "json" if args.json_output else args.format
+    counts = dict.fromkeys(RESULT_KEYS, 0)
+
+    def emit_jsonl(kind: str, item: dict) -> None:
+        counts[kind] += 1
+        print(json_mod.dumps({"kind": kind, **item}, ensure_ascii=False), flush=True)
+
+    results = scan_plugin(
+        plugin_path, jobs=args.jobs, cache_path=cache_path, changes=changes,
+        max_size=args.max_file_size, large_files=args.large_files,
+        on_finding=emit_jsonl if output_format == "jsonl" else None,
+        entropy=entropy_settings(args.entropy_threshold, args.entropy_hex_threshold,
+                                 args.entropy_min_length) if args.entropy else None,
+        staged=args.staged,
+    )
 
-    if args.json_output:
-        print(json_mod.dumps(results, indent=2, ensure_ascii=False))
+    if output_format == "jsonl":
+        print(json_mod.dumps({"kind": "summary", "path": results["path"], "passed": results["passed"],
+                              "counts": counts}, ensure_ascii=False), flush=True)
+        has_warnings = counts["gitignore_warning"] > 0
     else:
-        print_results(results)
+        if output_format == "json":
+            print(json_mod.dumps(results, indent=2, ensure_ascii=False))
+        elif output_format == "sarif":
+            print(json_mod.dumps(to_sarif(results), indent=2, ensure_ascii=False))
+        else:
+            print_results(results)
+        has_warnings = bool(results["gitignore_warnings"])
 
     # Exit code
     if not results["passed"]:
         sys.exit(1)
-    elif args.strict and results["gitignore_warnings"]:
+    elif args.strict and has_warnings:
         sys.exit(1)
     else:
         sys.exit(0)
@@ -6,6 +6,8 @@ Creates a new Claude Code plugin with the recommended directory structure.
 
 Usage:
     python3 init_plugin.py <plugin-name> [--marketplace <name>] [--no-setup]
+    python3 init_plugin.py <plugin-name> --count 50    # <plugin-name>-1 ... <plugin-name>-50
+    python3 init_plugin.py --manifest plugins.txt      # One plugin name per line
 
 Examples:
     # Create standalone plugin (includes setup skill)
@@ -23,6 +25,7 @@ from __future__ import annotations
 import argparse
 import json
 import re
+import string
 import sys
 from pathlib import Path
 
@@ -38,12 +41,11 @@ def validate_plugin_name(name: str) -> tuple[bool, str]:
     return False, suggested
 
 
-def create_setup_skill(plugin_dir: Path, plugin_name: str) -> None:
-    """Generate a setup skill inside the plugin."""
-    setup_dir = plugin_dir / "skills" / "setup"
-    setup_dir.mkdir(parents=True, exist_ok=True)
+# --- Templates ---
+# Scaffold files as str.format templates over {plugin_name}. They are compiled
+# once at import (see compile_template) and rendered by joining the pieces.
 
-    setup_md = f"""---
+SETUP_SKILL_TEMPLATE = """---
 name: setup
 description: "Initial setup for {plugin_name}. Run after installing the plugin."
 ---
@@ -116,52 +118,8 @@ rm -f ".plugin-state/setup-state.json"
 echo "Setup complete!"
 ```
 """
-    (setup_dir / "SKILL.md").write_text(setup_md)
-
-
-def create_plugin(plugin_name: str, marketplace: str | None = None, with_setup: bool = True, target_path: Path | None = None) -> Path:
-    """Create a new plugin with recommended structure."""
-
-    # Validate name
-    valid, suggested = validate_plugin_name(plugin_name)
-    if not valid:
-        print(f"Error: '{plugin_name}' is not valid kebab-case.", file=sys.stderr)
-        print(f"Suggestion: '{suggested}'", file=sys.stderr)
-        sys.exit(1)
-
-    # Determine base path
-    base_dir = target_path or Path.cwd()
-    if marketplace:
-        base = base_dir / marketplace
-        plugin_dir = base / plugin_name
-    else:
-        plugin_dir = base_dir / plugin_name
-
-    # Create directories
-    plugin_dir.mkdir(parents=True, exist_ok=True)
-    (plugin_dir / ".claude-plugin").mkdir(exist_ok=True)
-    (plugin_dir / "skills").mkdir(exist_ok=True)
-    (plugin_dir / "agents").mkdir(exist_ok=True)
-    (plugin_dir / "hooks").mkdir(exist_ok=True)
-    (plugin_dir / "scripts").mkdir(exist_ok=True)
 
-    # Create .claude-plugin/plugin.json
-    plugin_json = {
-        "name": plugin_name,
-        "version": "1.0.0",
-        "description": f"{plugin_name} plugin for Claude Code",
-        "author": {
-            "name": "Your Name"
-        }
-    }
-    (plugin_dir / ".claude-plugin" / "plugin.json").write_text(
-        json.dumps(plugin_json, indent=2, ensure_ascii=False) + "\n"
-    )
-
-    # Create example skill
-    skill_dir = plugin_dir / "skills" / "main"
-    skill_dir.mkdir(parents=True, exist_ok=True)
-    skill_md = f"""---
+MAIN_SKILL_TEMPLATE = """---
 name: main
 description: "{plugin_name} main skill. Describe when Claude should use this."
 # disable-model-invocation: true  # Uncomment to prevent auto-invocation
@@ -182,10 +140,8 @@ python3 "${{CLAUDE_PLUGIN_ROOT}}/scripts/main.py"
 ### 3. Verify results
 - Output: `./output/` (user's CWD)
 """
-    (skill_dir / "SKILL.md").write_text(skill_md)
 
-    # Create example agent
-    agent_md = f"""---
+HELPER_AGENT_TEMPLATE = """---
 name: helper
 description: {plugin_name} helper agent for specialized tasks
 ---
@@ -202,56 +158,8 @@ Assist with tasks specific to this plugin's domain.
 - Use available tools appropriately
 - Report findings clearly
 """
-    (plugin_dir / "agents" / "helper.md").write_text(agent_md)
 
-    # Create hooks/hooks.json (empty)
-    hooks_json = {
-        "hooks": {}
-    }
-    (plugin_dir / "hooks" / "hooks.json").write_text(
-        json.dumps(hooks_json, indent=2) + "\n"
-    )
-
-    # Create example script
-    script_py = '''#!/usr/bin/env python3
-"""
-Main script for the plugin.
-
-Path rules:
-- PLUGIN_ROOT: Where plugin scripts live (for imports/templates)
-- CWD: Where user runs command (for credentials/output)
-"""
-
-from pathlib import Path
-
-# Path resolution
-PLUGIN_ROOT = Path(__file__).parent.parent  # Plugin installation directory
-CWD = Path.cwd()                            # User's current working directory
-
-
-def main():
-    """Main entry point."""
-    print(f"Plugin root: {PLUGIN_ROOT}")
-    print(f"Working directory: {CWD}")
-
-    # Example: Read credentials from user's project
-    creds_path = CWD / "credentials" / "config.json"
-    if creds_path.exists():
-        print(f"Found credentials: {creds_path}")
-
-    # Example: Write output to user's project
-    output_dir = CWD / "output"
-    output_dir.mkdir(parents=True, exist_ok=True)
-    print(f"Output directory: {output_dir}")
-
-
-if __name__ == "__main__":
-    main()
-'''
-    (plugin_dir / "scripts" / "main.py").write_text(script_py)
-
-    # Create README.md
-    readme = f"""# {plugin_name}
+README_TEMPLATE = """# {plugin_name}
 
 ## Description
 
@@ -304,14 +212,44 @@ No additional configuration required.
 
 MIT
 """
-    (plugin_dir / "README.md").write_text(readme)
 
-    # Create setup skill (unless --no-setup)
-    if with_setup:
-        create_setup_skill(plugin_dir, plugin_name)
+MAIN_SCRIPT = '''#!/usr/bin/env python3
+"""
+Main script for the plugin.
+
+Path rules:
+- PLUGIN_ROOT: Where plugin scripts live (for imports/templates)
+- CWD: Where user runs command (for credentials/output)
+"""
+
+from pathlib import Path
+
+# Path resolution
+PLUGIN_ROOT = Path(__file__).parent.parent  # Plugin installation directory
+CWD = Path.cwd()                            # User's current working directory
 
-    # Create .gitignore
-    gitignore = """# Secrets and credentials
+
+def main():
+    """Main entry point."""
+    print(f"Plugin root: {PLUGIN_ROOT}")
+    print(f"Working directory: {CWD}")
+
+    # Example: Read credentials from user's project
+    creds_path = CWD / "credentials" / "config.json"
+    if creds_path.exists():
+        print(f"Found credentials: {creds_path}")
+
+    # Example: Write output to user's project
+    output_dir = CWD / "output"
+    output_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Output directory: {output_dir}")
+
+
+if __name__ == "__main__":
+    main()
+'''
+
+GITIGNORE = """# Secrets and credentials
 .env*
 credentials/
 secrets/
@@ -338,46 +276,153 @@ node_modules/
 .DS_Store
 Thumbs.db
 """
-    (plugin_dir / ".gitignore").write_text(gitignore)
 
-    # Create marketplace structure if needed
+
+def compile_template(template: str) -> tuple[tuple[str, str | None], ...]:
+    """Split a str.format template into (literal, field name) pieces."""
+    return tuple((literal, field) for literal, field, _, _ in string.Formatter().parse(template))
+
+
+def static_template(text: str) -> tuple[tuple[str, str | None], ...]:
+    """A template that renders to text as-is (braces are not placeholders)."""
+    return ((text, None),)
+
+
+def render(template: tuple[tuple[str, str | None], ...], **values: str) -> str:
+    """Render a compiled template."""
+    return "".join(literal + values[field] if field else literal for literal, field in template)
+
+
+# Relative path -> compiled template for every scaffold file except plugin.json
+SCAFFOLD_TEMPLATES = {
+    "skills/main/SKILL.md": compile_template(MAIN_SKILL_TEMPLATE),
+    "agents/helper.md": compile_template(HELPER_AGENT_TEMPLATE),
+    "hooks/hooks.json": static_template(json.dumps({"hooks": {}}, indent=2) + "\n"),
+    "scripts/main.py": static_template(MAIN_SCRIPT),
+    "README.md": compile_template(README_TEMPLATE),
+    ".gitignore": static_template(GITIGNORE),
+}
+SETUP_SKILL_PATH = "skills/setup/SKILL.md"
+SETUP_SKILL = compile_template(SETUP_SKILL_TEMPLATE)
+
+
+def scaffold_files(plugin_name: str, with_setup: bool = True) -> dict[str, str]:
+    """Relative path -> content of every file in a new plugin."""
+    plugin_json = {
+        "name": plugin_name,
+        "version": "1.0.0",
+        "description": f"{plugin_name} plugin for Claude Code",
+        "author": {
+            "name": "Your Name"
+        }
+    }
+    files = {".claude-plugin/plugin.json": json.dumps(plugin_json, indent=2, ensure_ascii=False) + "\n"}
+    for rel, template in SCAFFOLD_TEMPLATES.items():
+        files[rel] = render(template, plugin_name=plugin_name)
+    if with_setup:
+        files[SETUP_SKILL_PATH] = render(SETUP_SKILL, plugin_name=plugin_name)
+    return files
+
+
+def write_files(files: dict[Path, str]) -> None:
+    """Create every parent directory once, then write all files."""
+    for directory in sorted({path.parent for path in files}):
+        directory.mkdir(parents=True, exist_ok=True)
+    for path, content in files.items():
+        path.write_text(content)
+
+
+def create_setup_skill(plugin_dir: Path, plugin_name: str) -> None:
+    """Generate a setup skill inside the plugin."""
+    write_files({plugin_dir / SETUP_SKILL_PATH: render(SETUP_SKILL, plugin_name=plugin_name)})
+
+
+def marketplace_root(marketplace: str) -> Path:
+    """Directory whose .claude-plugin/marketplace.json lists the marketplace's plugins."""
+    return Path.cwd() / marketplace
+
+
+def register_in_marketplace(marketplace_dir: Path, marketplace: str, plugin_names: list[str]) -> None:
+    """Add plugins to <marketplace_dir>/.claude-plugin/marketplace.json (one rewrite)."""
+    mp_claude_dir = marketplace_dir / ".claude-plugin"
+    mp_claude_dir.mkdir(parents=True, exist_ok=True)
+    mp_json_path = mp_claude_dir / "marketplace.json"
+
+    if mp_json_path.exists():
+        data = json.loads(mp_json_path.read_text())
+    else:
+        data = {
+            "name": marketplace,
+            "owner": {
+                "name": "Your Name"
+            },
+            "plugins": []
+        }
+    plugins = data.setdefault("plugins", [])
+    existing_names = {p["name"] for p in plugins if isinstance(p, dict)}
+    for plugin_name in plugin_names:
+        if plugin_name not in existing_names:
+            existing_names.add(plugin_name)
+            plugins.append({
+                "name": plugin_name,
+                "source": f"./{plugin_name}",
+                "description": f"{plugin_name} plugin"
+            })
+    mp_json_path.write_text(
+        json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+    )
+
+
+def create_plugins(plugin_names: list[str], marketplace: str | None = None, with_setup: bool = True, target_path: Path | None = None) -> list[Path]:
+    """Create several plugins at once: names are validated up front, files
+    written in one batch and the marketplace (if any) updated once."""
+    invalid = []
+    for name in plugin_names:
+        valid, suggested = validate_plugin_name(name)
+        if not valid:
+            invalid.append((name, suggested))
+    for name, suggested in invalid:
+        print(f"Error: '{name}' is not valid kebab-case.", file=sys.stderr)
+        print(f"Suggestion: '{suggested}'", file=sys.stderr)
+    duplicates = sorted({n for n in plugin_names if plugin_names.count(n) > 1}) if len(plugin_names) > 1 else []
+    for name in duplicates:
+        print(f"Error: '{name}' is listed more than once.", file=sys.stderr)
+    if invalid or duplicates:
+        sys.exit(1)
+
+    # Determine base path
+    base_dir = target_path or Path.cwd()
+    parent = base_dir / marketplace if marketplace else base_dir
+
+    plugin_dirs = []
+    files = {}
+    for plugin_name in plugin_names:
+        plugin_dir = parent / plugin_name
+        plugin_dirs.append(plugin_dir)
+        for rel, content in scaffold_files(plugin_name, with_setup).items():
+            files[plugin_dir / rel] = content
+    write_files(files)
+
     if marketplace:
-        marketplace_dir = Path.cwd() / marketplace
-        mp_claude_dir = marketplace_dir / ".claude-plugin"
-        mp_claude_dir.mkdir(parents=True, exist_ok=True)
-        mp_json_path = mp_claude_dir / "marketplace.json"
-
-        if mp_json_path.exists():
-            data = json.loads(mp_json_path.read_text())
-            existing_names = [p["name"] for p in data.get("plugins", []) if isinstance(p, dict)]
-            if plugin_name not in existing_names:
-                data.setdefault("plugins", []).append({
-                    "name": plugin_name,
-                    "source": f"./{plugin_name}",
-                    "description": f"{plugin_name} plugin"
-                })
-                mp_json_path.write_text(
-                    json.dumps(data, indent=2, ensure_ascii=False) + "\n"
-                )
-        else:
-            data = {
-                "name": marketplace,
-                "owner": {
-                    "name": "Your Name"
-                },
-                "plugins": [
-                    {
-                        "name": plugin_name,
-                        "source": f"./{plugin_name}",
-                        "description": f"{plugin_name} plugin"
-                    }
-                ]
-            }
-            mp_json_path.write_text(
-                json.dumps(data, indent=2, ensure_ascii=False) + "\n"
-            )
-
-    return plugin_dir
+        # marketplace.json is looked up relative to the working directory, as before
+        register_in_marketplace(marketplace_root(marketplace), marketplace, plugin_names)
+
+    return plugin_dirs
+
+
+def create_plugin(plugin_name: str, marketplace: str | None = None, with_setup: bool = True, target_path: Path | None = None) -> Path:
+    """Create a new plugin with recommended structure."""
+    return create_plugins([plugin_name], marketplace, with_setup, target_path)[0]
+
+
+def read_manifest(manifest_path: Path) -> list[str]:
+    """Plugin names from a manifest: one per line, blank lines and # comments ignored."""
+    names = []
+    for line in manifest_path.read_text().splitlines():
+        line = line.split("#", 1)[0].strip()
+        if line:
+            names.append(line)
+    return names
 
 
 def main():
@@ -386,7 +431,18 @@ def main():
     )
     parser.add_argument(
         "plugin_name",
-        help="Name of the plugin to create"
+        nargs="?",
+        help="Name of the plugin to create (prefix with --count)"
+    )
+    parser.add_argument(
+        "--count",
+        type=int,
+        metavar="N",
+        help="Create N plugins named <plugin-name>-1 ... <plugin-name>-N"
+    )
+    parser.add_argument(
+        "--manifest",
+        help="File listing plugin names to create, one per line"
     )
     parser.add_argument(
         "--marketplace",
@@ -404,11 +460,36 @@ def main():
 
     args = parser.parse_args()
 
+    if args.manifest and (args.plugin_name or args.count):
+        parser.error("--manifest cannot be combined with a plugin name or --count")
+    if not args.manifest and not args.plugin_name:
+        parser.error("give a plugin name or --manifest FILE")
+    if args.count is not None and args.count < 1:
+        parser.error("--count must be at least 1")
+
     target_path = Path(args.path) if args.path else None
     if target_path and not target_path.is_dir():
         print(f"Error: Target path not found: {target_path}", file=sys.stderr)
         sys.exit(1)
 
+    if args.manifest or args.count:
+        if args.manifest:
+            manifest_path = Path(args.manifest)
+            if not manifest_path.is_file():
+                print(f"Error: Manifest not found: {manifest_path}", file=sys.stderr)
+                sys.exit(1)
+            names = read_manifest(manifest_path)
+        else:
+            names = [f"{args.plugin_name}-{i}" for i in range(1, args.count + 1)]
+        if not names:
+            print("Error: No plugin names given", file=sys.stderr)
+            sys.exit(1)
+        plugin_dirs = create_plugins(names, args.marketplace, with_setup=not args.no_setup, target_path=target_path)
+        print(f"\nCreated {len(plugin_dirs)} plugins in {plugin_dirs[0].parent}")
+        if args.marketplace:
+            print(f"Registered in {marketplace_root(args.marketplace) / '.claude-plugin' / 'marketplace.json'}")
+        return
+
     plugin_dir = create_plugin(args.plugin_name, args.marketplace, with_setup=not args.no_setup, target_path=target_path)
 
     if args.marketplace:
@@ -447,7 +528,7 @@ Next steps:
     else:
         setup_note = ""
         if not args.no_setup:
-            setup_note = f"""│   └── setup/
+            setup_note = """│   └── setup/
 │       └── SKILL.md    (setup skill for downloaders)
 """
         print(f"""
@@ -0,0 +1,429 @@
+#!/usr/bin/env python3
+"""
+Reproducible Plugin Archives
+
+Packs a plugin directory into a single deterministic archive that installers
+and CI can verify, cache by hash and extract without walking the tree.
+
+Usage:
+    python3 plugin_archive.py pack ./my-plugin my-plugin-1.0.0.zip
+    python3 plugin_archive.py pack ./my-plugin out.tar.gz --format tar.gz --exclude .git
+    python3 plugin_archive.py verify my-plugin-1.0.0.zip [--sha256 HEX]
+    python3 plugin_archive.py extract my-plugin-1.0.0.zip ./plugins/my-plugin
+
+Archive layout:
+    .plugin-manifest.json   First entry: name, version and per-file sha256/size/mode
+    <files>                 Paths relative to the plugin root, sorted
+
+The same tree always produces byte-identical archives: entries are sorted,
+mtimes fixed (1980-01-01 for zip, 0 for tar), owners dropped and modes
+normalized to 0644/0755. Symlinks are kept (and must stay inside the plugin).
+
+Exit codes:
+    0 - Archive written / verified / extracted
+    1 - Verification failed or bad input
+"""
+
+from __future__ import annotations
+
+import argparse
+import fnmatch
+import gzip
+import hashlib
+import io
+import json
+import os
+import stat
+import sys
+import tarfile
+import zipfile
+from pathlib import Path, PurePosixPath
+
+MANIFEST_NAME = ".plugin-manifest.json"
+MANIFEST_VERSION = 1
+FORMATS = ("zip", "tar.gz")
+
+# Fixed timestamps: zip cannot represent dates before 1980
+ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+TAR_MTIME = 0
+COMPRESS_LEVEL = 9
+
+
+def file_mode(mode: int) -> int:
+    """Normalized permission bits: 0755 if any execute bit is set, else 0644."""
+    return 0o755 if mode & 0o111 else 0o644
+
+
+def collect_entries(root: Path, excludes: list[str] = ()) -> list[dict]:
+    """Files and symlinks under root, sorted by relative path.
+
+    Each entry has path (posix, relative), type ("file" or "symlink") and
+    either sha256/size/mode or target. Names matching an exclude pattern are
+    skipped, like rsync --exclude.
+    """
+    entries = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not _excluded(d, excludes)]
+        base = Path(dirpath)
+        for name in filenames + [d for d in dirnames if (base / d).is_symlink()]:
+            if _excluded(name, excludes):
+                continue
+            path = base / name
+            rel = path.relative_to(root).as_posix()
+            if path.is_symlink():
+                entries.append({"path": rel, "type": "symlink", "target": os.readlink(path)})
+            elif path.is_file():
+                digest = hashlib.sha256()
+                with open(path, "rb") as f:
+                    for block in iter(lambda: f.read(1 << 20), b""):
+                        digest.update(block)
+                st = path.stat()
+                entries.append({
+                    "path": rel,
+                    "type": "file",
+                    "sha256": digest.hexdigest(),
+                    "size": st.st_size,
+                    "mode": file_mode(st.st_mode),
+                })
+    entries.sort(key=lambda e: e["path"])
+    if any(e["path"] == MANIFEST_NAME for e in entries):
+        raise ValueError(f"{MANIFEST_NAME} is reserved for the archive manifest")
+    return entries
+
+
+def _excluded(name: str, excludes: list[str]) -> bool:
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in excludes)
+
+
+def build_manifest(root: Path, entries: list[dict]) -> dict:
+    """Manifest for an archive of root: plugin name/version plus the entries."""
+    manifest = {"manifest_version": MANIFEST_VERSION, "name": root.name, "version": None}
+    plugin_json = root / ".claude-plugin" / "plugin.json"
+    if plugin_json.is_file():
+        try:
+            data = json.loads(plugin_json.read_text())
+            manifest["name"] = data.get("name", root.name)
+            manifest["version"] = data.get("version")
+        except (json.JSONDecodeError, OSError):
+            pass
+    manifest["files"] = entries
+    return manifest
+
+
+def _manifest_bytes(manifest: dict) -> bytes:
+    return (json.dumps(manifest, indent=2, sort_keys=True, ensure_ascii=False) + "\n").encode()
+
+
+def pack(root: Path, output: Path, fmt: str = "zip", excludes: list[str] = ()) -> dict:
+    """Write a deterministic archive of root to output. Returns the manifest."""
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown archive format: {fmt}")
+    root = root.resolve()
+    entries = collect_entries(root, excludes)
+    manifest = build_manifest(root, entries)
+    manifest_data = _manifest_bytes(manifest)
+
+    tmp = output.with_name(output.name + ".tmp")
+    if fmt == "zip":
+        _write_zip(tmp, root, entries, manifest_data)
+    else:
+        _write_tar_gz(tmp, root, entries, manifest_data)
+    os.replace(tmp, output)
+    return manifest
+
+
+def _write_zip(output: Path, root: Path, entries: list[dict], manifest_data: bytes) -> None:
+    def info(name: str, mode: int) -> zipfile.ZipInfo:
+        zinfo = zipfile.ZipInfo(name, date_time=ZIP_DATE_TIME)
+        zinfo.create_system = 3  # unix, so external_attr carries the mode
+        zinfo.external_attr = mode << 16
+        zinfo.compress_type = zipfile.ZIP_DEFLATED
+        return zinfo
+
+    with zipfile.ZipFile(output, "w", compresslevel=COMPRESS_LEVEL) as zf:
+        zf.writestr(info(MANIFEST_NAME, stat.S_IFREG | 0o644), manifest_data)
+        for e in entries:
+            if e["type"] == "symlink":
+                zinfo = info(e["path"], stat.S_IFLNK | 0o777)
+                zinfo.compress_type = zipfile.ZIP_STORED
+                zf.writestr(zinfo, e["target"])
+            else:
+                with open(root / e["path"], "rb") as src, zf.open(info(e["path"], stat.S_IFREG | e["mode"]), "w") as dst:
+                    for block in iter(lambda: src.read(1 << 20), b""):
+                        dst.write(block)
+
+
+def _write_tar_gz(output: Path, root: Path, entries: list[dict], manifest_data: bytes) -> None:
+    def info(name: str, mode: int, size: int = 0) -> tarfile.TarInfo:
+        tinfo = tarfile.TarInfo(name)
+        tinfo.mode, tinfo.size, tinfo.mtime = mode, size, TAR_MTIME
+        tinfo.uid = tinfo.gid = 0
+        tinfo.uname = tinfo.gname = ""
+        return tinfo
+
+    with open(output, "wb") as raw, \
+            gzip.GzipFile(filename="", mode="wb", fileobj=raw, mtime=TAR_MTIME, compresslevel=COMPRESS_LEVEL) as gz, \
+            tarfile.open(fileobj=gz, mode="w", format=tarfile.PAX_FORMAT) as tf:
+        tf.addfile(info(MANIFEST_NAME, 0o644, len(manifest_data)), io.BytesIO(manifest_data))
+        for e in entries:
+            if e["type"] == "symlink":
+                tinfo = info(e["path"], 0o777)
+                tinfo.type, tinfo.linkname = tarfile.SYMTYPE, e["target"]
+                tf.addfile(tinfo)
+            else:
+                with open(root / e["path"], "rb") as src:
+                    tf.addfile(info(e["path"], e["mode"], e["size"]), src)
+
+
+# --- Reading ---
+
+def _safe_path(name: str) -> PurePosixPath:
+    """Archive member name as a relative path, rejecting absolute and '..' paths."""
+    path = PurePosixPath(name)
+    if path.is_absolute() or ".." in path.parts or not path.parts:
+        raise ValueError(f"unsafe path in archive: {name}")
+    return path
+
+
+MAX_SYMLINK_HOPS = 40
+
+
+def _symlink_escapes(link: PurePosixPath, target: str, links: dict[str, str]) -> bool:
+    """Whether a symlink at link (relative) pointing to target leaves the archive root.
+
+    The target is resolved like realpath against the archive's other symlinks
+    (`links`: path -> target), so chains such as `l3 -> l1/..` with
+    `l1 -> sub/l2` and `sub/l2 -> ..` are followed. Loops count as escapes.
+    """
+    resolved: list[str] = []
+    pending = [*link.parent.parts, *PurePosixPath(target).parts]
+    hops = 0
+    while pending:
+        part = pending.pop(0)
+        if part in ("", "."):
+            continue
+        if part == "..":
+            if not resolved:
+                return True
+            resolved.pop()
+            continue
+        candidate = "/".join([*resolved, part])
+        if candidate in links:
+            hops += 1
+            next_target = links[candidate]
+            if hops > MAX_SYMLINK_HOPS or next_target.startswith("/"):
+                return True
+            pending[:0] = PurePosixPath(next_target).parts
+        else:
+            resolved.append(part)
+    return False
+
+
+def _through_symlink(path: PurePosixPath, links: dict[str, str]) -> str | None:
+    """The first parent directory of path that is a symlink in the archive, if any."""
+    for i in range(1, len(path.parts)):
+        prefix = "/".join(path.parts[:i])
+        if prefix in links:
+            return prefix
+    return None
+
+
+def _output_path(dest_root: Path, path: PurePosixPath) -> Path:
+    """Where to write path under dest_root, refusing to follow links out of it."""
+    out = dest_root.joinpath(*path.parts)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    if not out.parent.resolve().is_relative_to(dest_root):
+        raise ValueError(f"{path}: would be written outside {dest_root}")
+    return out
+
+
+def iter_members(archive: Path):
+    """Yield (name, kind, mode, reader) for each archive member in stored order.
+
+    kind is "file" or "symlink"; reader() returns a binary file object (the
+    link target for symlinks).
+    """
+    if zipfile.is_zipfile(archive):
+        with zipfile.ZipFile(archive) as zf:
+            for zinfo in zf.infolist():
+                if zinfo.is_dir():
+                    continue
+                mode = zinfo.external_attr >> 16
+                kind = "symlink" if stat.S_ISLNK(mode) else "file"
+                yield zinfo.filename, kind, stat.S_IMODE(mode), lambda z=zinfo: zf.open(z)
+    else:
+        with tarfile.open(archive, "r:*") as tf:
+            for tinfo in tf:
+                if tinfo.isdir():
+                    continue
+                if tinfo.issym():
+                    target = tinfo.linkname.encode()
+                    yield tinfo.name, "symlink", tinfo.mode, lambda t=target: io.BytesIO(t)
+                elif tinfo.isfile():
+                    yield tinfo.name, "file", tinfo.mode, lambda t=tinfo: tf.extractfile(t)
+                else:
+                    raise ValueError(f"unsupported archive member: {tinfo.name}")
+
+
+def verify(archive: Path, dest: Path | None = None, expected_sha256: str | None = None) -> tuple[dict | None, list[str]]:
+    """Check an archive against its manifest, optionally extracting it to dest.
+
+    Returns (manifest, errors). Files are hashed while they are read, so
+    extraction and verification take a single pass; on errors, dest may hold
+    a partial extraction. Symlinks are created only after every file has been
+    written, and nothing is written through a symlink or outside dest.
+    """
+    errors = []
+    if expected_sha256:
+        actual = archive_sha256(archive)
+        if actual != expected_sha256.lower():
+            return None, [f"archive sha256 is {actual}, expected {expected_sha256}"]
+
+    manifest = None
+    expected = {}
+    links: dict[str, str] = {}
+    seen = set()
+    deferred_links: list[tuple[PurePosixPath, str]] = []
+    dest_root = dest.resolve() if dest is not None else None
+    try:
+        for i, (name, kind, mode, reader) in enumerate(iter_members(archive)):
+            if i == 0:
+                if name != MANIFEST_NAME:
+                    return None, [f"first entry is {name}, expected {MANIFEST_NAME}"]
+                with reader() as f:
+                    manifest = json.loads(f.read())
+                expected = {e["path"]: e for e in manifest.get("files", [])}
+                links = {e["path"]: e["target"] for e in expected.values() if e.get("type") == "symlink"}
+                continue
+
+            path = _safe_path(name)
+            entry = expected.get(name)
+            if entry is None:
+                errors.append(f"{name}: not in manifest")
+                continue
+            if name in seen:
+                errors.append(f"{name}: duplicate entry")
+                continue
+            seen.add(name)
+            if entry["type"] != kind:
+                errors.append(f"{name}: is a {kind}, manifest says {entry['type']}")
+                continue
+            via = _through_symlink(path, links)
+            if via is not None:
+                errors.append(f"{name}: path goes through symlink {via}")
+                continue
+
+            if kind == "symlink":
+                with reader() as f:
+                    target = f.read().decode()
+                if target != entry["target"]:
+                    errors.append(f"{name}: symlink target {target!r}, manifest says {entry['target']!r}")
+                elif _symlink_escapes(path, target, links):
+                    errors.append(f"{name}: symlink points outside the plugin ({target})")
+                elif dest is not None:
+                    deferred_links.append((path, target))
+                continue
+
+            out = None
+            if dest_root is not None:
+                out = _output_path(dest_root, path)
+                out.unlink(missing_ok=True)
+            digest = hashlib.sha256()
+            size = 0
+            with reader() as src, (open(out, "wb") if out else io.BytesIO()) as dst:
+                for block in iter(lambda: src.read(1 << 20), b""):
+                    digest.update(block)
+                    size += len(block)
+                    if out:
+                        dst.write(block)
+            if out:
+                os.chmod(out, file_mode(mode))
+            if digest.hexdigest() != entry["sha256"] or size != entry["size"]:
+                errors.append(f"{name}: content does not match manifest")
+
+        for path, target in deferred_links:
+            out = _output_path(dest_root, path)
+            out.unlink(missing_ok=True)
+            os.symlink(target, out)
+    except (OSError, ValueError, KeyError, tarfile.TarError, zipfile.BadZipFile) as e:
+        return manifest, errors + [f"{type(e).__name__}: {e}"]
+
+    if manifest is None:
+        return None, ["archive is empty"]
+    for name in sorted(set(expected) - seen):
+        errors.append(f"{name}: missing from archive")
+    return manifest, errors
+
+
+def archive_sha256(archive: Path) -> str:
+    digest = hashlib.sha256()
+    with open(archive, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack, verify and extract reproducible plugin archives")
+    sub = parser.add_subparsers(dest="command", required=True)
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    p_pack = sub.add_parser("pack", parents=[common], help="Write a deterministic archive of a plugin directory")
+    p_pack.add_argument("plugin_path", help="Plugin directory")
+    p_pack.add_argument("output", help="Archive to write")
+    p_pack.add_argument("--format", choices=FORMATS, help="Archive format (default: from the output name, else zip)")
+    p_pack.add_argument("--exclude", action="append", default=[], metavar="PATTERN",
+                        help="Skip files/directories whose name matches (repeatable)")
+
+    p_verify = sub.add_parser("verify", parents=[common], help="Check an archive against its manifest")
+    p_verify.add_argument("archive")
+    p_verify.add_argument("--sha256", help="Expected sha256 of the archive file")
+
+    p_extract = sub.add_parser("extract", parents=[common], help="Verify and extract an archive")
+    p_extract.add_argument("archive")
+    p_extract.add_argument("dest", help="Directory to extract into")
+    p_extract.add_argument("--sha256", help="Expected sha256 of the archive file")
+
+    args = parser.parse_args()
+
+    if args.command == "pack":
+        root, output = Path(args.plugin_path), Path(args.output)
+        if not root.is_dir():
+            print(f"Error: Not a directory: {root}", file=sys.stderr)
+            sys.exit(1)
+        fmt = args.format or ("tar.gz" if output.name.endswith((".tar.gz", ".tgz")) else "zip")
+        try:
+            manifest = pack(root, output, fmt, args.exclude)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        result = {"archive": str(output), "sha256": archive_sha256(output),
+                  "name": manifest["name"], "version": manifest["version"], "files": len(manifest["files"])}
+        if args.json:
+            print(json.dumps(result, indent=2))
+        else:
+            print(f"Packed {result['files']} files into {output}")
+            print(f"  sha256: {result['sha256']}")
+        return
+
+    archive = Path(args.archive)
+    dest = Path(args.dest) if args.command == "extract" else None
+    if dest is not None:
+        dest.mkdir(parents=True, exist_ok=True)
+    manifest, errors = verify(archive, dest, args.sha256)
+    if args.json:
+        print(json.dumps({"archive": str(archive), "passed": not errors, "errors": errors,
+                          "files": len(manifest["files"]) if manifest else 0}, indent=2))
+    elif errors:
+        print(f"[FAIL] {archive}")
+        for e in errors:
+            print(f"  {e}")
+    else:
+        action = f"extracted to {dest}" if dest is not None else "verified"
+        print(f"[OK] {archive}: {len(manifest['files'])} files {action}")
+    sys.exit(1 if errors else 0)
+
+
+if __name__ == "__main__":
+    main()
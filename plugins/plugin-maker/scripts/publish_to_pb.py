@@ -9,6 +9,10 @@ Usage:
     python3 publish_to_pb.py ./my-plugin --dry-run
     python3 publish_to_pb.py ./my-plugin --version-bump patch
     python3 publish_to_pb.py ./my-plugin --no-stage  # skip staging (old behavior)
+    python3 publish_to_pb.py ./my-plugin --force     # publish even if nothing changed
+    python3 publish_to_pb.py ./my-plugin --archive dist  # also write dist/<name>-<version>.zip
+    python3 publish_to_pb.py --batch ./plugin-a ./plugin-b  # several plugins, one PR
+    python3 publish_to_pb.py --batch @plugins.txt          # paths listed one per line
 
 Flow (v2.6.0 staging mode - default):
     prerequisites -> staging copy -> secrets scan on staging -> auto-sanitize staging ->
@@ -22,12 +26,20 @@ Flow (--no-stage, legacy):
 from __future__ import annotations
 
 import argparse
+import fnmatch
+import hashlib
+import io
 import json
 import os
+import re
 import shutil
 import subprocess
 import sys
 import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import cache, partial
 from pathlib import Path
 
 DEFAULT_MARKETPLACE_REPO = "rapportlabs-pb-group/pb-plugins"
@@ -42,7 +54,23 @@ RSYNC_EXCLUDES = [
     ".venv", "venv",
 ]
 
+PB_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "pb-plugins"
+
+# Copy-on-write staging copies (outside the source tree; usually the same filesystem as ~)
+STAGING_CACHE_DIR = PB_CACHE_DIR / "staging"
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+
+# Files the sanitizer may rewrite: never hardlinked into staging
+SANITIZE_EXTENSIONS = {'.py', '.js', '.ts', '.json', '.yml', '.yaml', '.sh', '.md',
+                       '.txt', '.cfg', '.ini', '.toml', '.env', '.gs', '.jsx', '.tsx'}
+
+# Cached bare clones of the marketplace (one per repo/fork), reused across publishes
+MIRROR_CACHE_DIR = PB_CACHE_DIR / "mirrors"
+
 SECRETS_SCRIPT = Path(__file__).parent / "check_secrets.py"
+ARCHIVE_SCRIPT = Path(__file__).parent / "plugin_archive.py"
+# Scan cache kept in the SOURCE plugin's state dir so it survives throwaway staging copies
+SECRETS_CACHE = Path(".plugin-state") / "secrets-cache.json"
 
 # Sanitization replacements: regex pattern -> environment variable placeholder
 SANITIZE_REPLACEMENTS = [
@@ -73,9 +101,34 @@ SANITIZE_REPLACEMENTS = [
 USER_PATH_SANITIZE = [
     (r'/Users/[a-zA-Z0-9_.-]+/', '${HOME}/'),
     (r'/home/[a-zA-Z0-9_.-]+/', '${HOME}/'),
-    (r'C:\\Users\\[a-zA-Z0-9_.-]+\\', '${HOME}\\'),
+    (r'C:\\Users\\[a-zA-Z0-9_.-]+\\', '${HOME}\\\\'),
 ]
 
+# Below this many files, sanitizing in a process pool costs more than it saves
+SANITIZE_PARALLEL_MIN_FILES = 200
+
+# Plugins prepared (validated, staged, scanned) at once in --batch mode
+BATCH_MAX_WORKERS = 8
+
+# Literal keywords (lowercase) per SANITIZE_REPLACEMENTS replacement: a rule only runs
+# on ASCII text containing one of them. Rules without an entry always run.
+SANITIZE_KEYWORDS = {
+    '${SLACK_BOT_TOKEN}': ('xoxb-',),
+    '${SLACK_USER_TOKEN}': ('xoxp-',),
+    '${SLACK_APP_TOKEN}': ('xoxa-',),
+    '${SLACK_SESSION_TOKEN}': ('xoxs-',),
+    '${SLACK_WEBHOOK_URL}': ('hooks.slack.com',),
+    '${DISCORD_WEBHOOK_URL}': ('discord',),
+    '${AWS_ACCESS_KEY_ID}': ('akia',),
+    r'\1${API_KEY}\2': ('api',),
+    r'\1${TOKEN}\2': ('token',),
+    r'\1${ACCESS_TOKEN}\2': ('access',),
+    r'\1${SECRET}\2': ('secret',),
+    r'\1${PASSWORD}\2': ('password',),
+    r'\1${DB_PASSWORD}\2': ('://',),
+    '${MS_WEBHOOK_URL}': ('webhook.office.com',),
+}
+
 
 def run(cmd: list[str], capture: bool = True, check: bool = True, cwd: Path | str | None = None) -> subprocess.CompletedProcess:
     """Run a shell command."""
@@ -90,107 +143,349 @@ def check_prerequisites() -> list[str]:
         if not shutil.which(tool):
             errors.append(f"'{tool}' not found. Install with: brew install {tool}")
 
-    if not errors:
-        result = run(["gh", "auth", "status"], check=False)
-        if result.returncode != 0:
-            errors.append("GitHub CLI not authenticated. Run: gh auth login")
+    if not errors and not gh_authenticated():
+        errors.append("GitHub CLI not authenticated. Run: gh auth login")
 
     return errors
 
 
+# GitHub probes below are memoized: each hits the network at most once per process.
+
+@cache
+def gh_authenticated() -> bool:
+    """Whether the GitHub CLI has a valid login."""
+    try:
+        return run(["gh", "auth", "status"], check=False).returncode == 0
+    except OSError:
+        return False
+
+
+@cache
 def get_github_username() -> str:
     """Get the authenticated GitHub username."""
-    result = run(["gh", "api", "/user", "--jq", ".login"], check=False)
+    try:
+        result = run(["gh", "api", "/user", "--jq", ".login"], check=False)
+    except OSError:
+        return ""
     return result.stdout.strip() if result.returncode == 0 else ""
 
 
-def create_staging_copy(plugin_path: Path) -> Path:
+@cache
+def get_published_marketplace(marketplace_repo: str) -> dict | None:
+    """marketplace.json on the marketplace's default branch, or None if unavailable."""
+    try:
+        result = run(
+            ["gh", "api", f"/repos/{marketplace_repo}/contents/{MARKETPLACE_JSON_PATH}",
+             "-H", "Accept: application/vnd.github.raw"],
+            check=False,
+        )
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    try:
+        data = json.loads(result.stdout)
+    except (json.JSONDecodeError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def get_published_hash(marketplace_repo: str, plugin_name: str) -> str | None:
+    """content_hash recorded for a plugin in the published marketplace.json."""
+    data = get_published_marketplace(marketplace_repo) or {}
+    for entry in data.get("plugins", []):
+        if isinstance(entry, dict) and entry.get("name") == plugin_name:
+            return entry.get("content_hash")
+    return None
+
+
+def run_preflight(marketplace_repo: str | None = None) -> tuple[list[str], str]:
+    """Run the prerequisite and GitHub probes concurrently.
+
+    Returns (prerequisite errors, GitHub username). With `marketplace_repo`,
+    the access level and published marketplace.json are fetched too, so later
+    calls are answered from cache.
+    """
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        errors = pool.submit(check_prerequisites)
+        username = pool.submit(get_github_username)
+        if marketplace_repo:
+            pool.submit(detect_access_level, marketplace_repo)
+            pool.submit(get_published_marketplace, marketplace_repo)
+        return errors.result(), username.result()
+
+
+def _excluded(name: str) -> bool:
+    """Whether a file or directory name matches RSYNC_EXCLUDES (rsync basename semantics)."""
+    return any(fnmatch.fnmatchcase(name, pattern) for pattern in RSYNC_EXCLUDES)
+
+
+def tree_hash(root: Path) -> str:
+    """Merkle hash of a plugin tree as it would be published.
+
+    Files hash their bytes (and executable bit), symlinks their target and
+    directories their sorted entries; RSYNC_EXCLUDES entries are skipped.
+    """
+    def file_digest(path: str) -> str:
+        digest = hashlib.sha256(b"blob\0")
+        with open(path, "rb") as f:
+            for block in iter(partial(f.read, 1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    def dir_digest(directory: str) -> str:
+        lines = []
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if _excluded(entry.name):
+                    continue
+                if entry.is_symlink():
+                    kind = "link"
+                    digest = hashlib.sha256(os.readlink(entry.path).encode()).hexdigest()
+                elif entry.is_dir():
+                    kind, digest = "tree", dir_digest(entry.path)
+                elif entry.is_file():
+                    kind = "exec" if os.access(entry.path, os.X_OK) else "blob"
+                    digest = file_digest(entry.path)
+                else:
+                    continue
+                lines.append(f"{kind} {entry.name} {digest}\n")
+        lines.sort(key=lambda line: line.split(" ", 2)[1])
+        return hashlib.sha256(("tree\0" + "".join(lines)).encode()).hexdigest()
+
+    return f"sha256:{dir_digest(str(root))}"
+
+
+def _reflink(src: Path, dst: Path) -> None:
+    """Clone src to dst sharing extents (btrfs/xfs and other FICLONE filesystems)."""
+    import fcntl
+
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            dst.unlink()
+            raise
+    shutil.copystat(src, dst)
+
+
+def _stage_tree(plugin_path: Path, staging_plugin: Path) -> dict[str, int]:
+    """Populate staging_plugin from plugin_path with reflinks, else hardlinks, else copies.
+
+    Files the sanitizer may rewrite (SANITIZE_EXTENSIONS) are never hardlinked,
+    so no write to staging or source can show up in the other.
+    Returns how many files were staged each way.
+    """
+    counts = {"reflink": 0, "hardlink": 0, "copy": 0, "symlink": 0}
+    can_reflink = sys.platform.startswith("linux")
+    can_link = True
+
+    for root, dirs, files in os.walk(plugin_path):
+        dirs[:] = [d for d in dirs if not _excluded(d)]
+        rel = Path(root).relative_to(plugin_path)
+        (staging_plugin / rel).mkdir(parents=True, exist_ok=True)
+        # os.walk does not descend into symlinked directories; keep them as links, like rsync -a
+        dir_links = [d for d in dirs if os.path.islink(os.path.join(root, d))]
+        for name in files + dir_links:
+            if _excluded(name):
+                continue
+            src, dst = Path(root) / name, staging_plugin / rel / name
+            if src.is_symlink():
+                os.symlink(os.readlink(src), dst)
+                counts["symlink"] += 1
+                continue
+            if can_reflink:
+                try:
+                    _reflink(src, dst)
+                    counts["reflink"] += 1
+                    continue
+                except OSError:
+                    can_reflink = False
+            if can_link and src.suffix not in SANITIZE_EXTENSIONS:
+                try:
+                    os.link(src, dst)
+                    counts["hardlink"] += 1
+                    continue
+                except OSError:
+                    can_link = False
+            shutil.copy2(src, dst)
+            counts["copy"] += 1
+    return counts
+
+
+def create_staging_copy(plugin_path: Path, link: bool = True) -> Path:
     """Create a staging copy of the plugin in a temp directory.
 
+    With `link` (default) the copy is copy-on-write: files are reflinked where
+    the filesystem supports it, otherwise hardlinked to the source if the
+    sanitizer never rewrites them, and copied otherwise (or across
+    filesystems). The staging directory lives under STAGING_CACHE_DIR, never
+    inside the source tree.
+
+    With `link=False` the plugin is copied with rsync.
+
     Returns the path to the staging copy. Source files remain untouched.
     """
-    staging_dir = Path(tempfile.mkdtemp(prefix="plugin-stage-"))
-    staging_plugin = staging_dir / plugin_path.name
+    if not link:
+        staging_dir = Path(tempfile.mkdtemp(prefix="plugin-stage-"))
+        staging_plugin = staging_dir / plugin_path.name
 
-    rsync_cmd = ["rsync", "-a"]
-    for pattern in RSYNC_EXCLUDES:
-        rsync_cmd.extend(["--exclude", pattern])
-    rsync_cmd.extend([str(plugin_path) + "/", str(staging_plugin) + "/"])
+        rsync_cmd = ["rsync", "-a"]
+        for pattern in RSYNC_EXCLUDES:
+            rsync_cmd.extend(["--exclude", pattern])
+        rsync_cmd.extend([str(plugin_path) + "/", str(staging_plugin) + "/"])
 
-    run(rsync_cmd)
+        run(rsync_cmd)
+        return staging_plugin
+
+    try:
+        STAGING_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        staging_dir = Path(tempfile.mkdtemp(prefix="plugin-stage-", dir=STAGING_CACHE_DIR))
+    except OSError:
+        staging_dir = Path(tempfile.mkdtemp(prefix="plugin-stage-"))
+    staging_plugin = staging_dir / plugin_path.name
+
+    counts = _stage_tree(plugin_path, staging_plugin)
+    print(f"  Staged {sum(counts.values())} files "
+          f"({counts['reflink']} reflinked, {counts['hardlink']} hardlinked, "
+          f"{counts['copy']} copied, {counts['symlink']} symlinks)")
     return staging_plugin
 
 
-def sanitize_secrets_in_staging(staging_path: Path) -> list[dict]:
-    """Auto-replace detected secrets with env var placeholders in staging copy.
+def _compile_sanitize_rules(rules: list[tuple[str, str]], flags: int = 0,
+                            keywords: dict | None = None) -> list[tuple[re.Pattern, str, bool, tuple]]:
+    """Precompile (pattern, replacement) pairs.
 
-    Returns list of sanitization actions taken.
+    Each rule becomes (regex, replacement, templated, keywords); `templated` marks
+    replacements with group references that need expanding per match.
     """
-    import re as _re
+    keywords = keywords or {}
+    return [
+        (re.compile(pattern, flags), replacement, '\\' in replacement, keywords.get(replacement, ()))
+        for pattern, replacement in rules
+    ]
 
-    code_exts = {'.py', '.js', '.ts', '.json', '.yml', '.yaml', '.sh', '.md',
-                 '.txt', '.cfg', '.ini', '.toml', '.env', '.gs', '.jsx', '.tsx'}
-    exclude_dirs = {'__pycache__', '.git', 'node_modules', '.venv', 'venv', '.plugin-state'}
-    actions = []
 
-    for file_path in staging_path.rglob("*"):
-        if not file_path.is_file():
-            continue
-        if file_path.suffix not in code_exts:
-            continue
-        if any(part in exclude_dirs for part in file_path.parts):
-            continue
+COMPILED_SANITIZE_REPLACEMENTS = _compile_sanitize_rules(SANITIZE_REPLACEMENTS, re.IGNORECASE, SANITIZE_KEYWORDS)
+COMPILED_USER_PATH_SANITIZE = _compile_sanitize_rules(USER_PATH_SANITIZE)
 
-        try:
-            content = file_path.read_text(encoding='utf-8', errors='ignore')
-            original = content
-
-            # Apply secret replacements
-            for pattern, replacement in SANITIZE_REPLACEMENTS:
-                matches = list(_re.finditer(pattern, content, _re.IGNORECASE))
-                if matches:
-                    content = _re.sub(pattern, replacement, content, flags=_re.IGNORECASE)
-                    for m in matches:
-                        actions.append({
-                            "file": str(file_path.relative_to(staging_path)),
-                            "type": "secret",
-                            "original": m.group()[:40] + ("..." if len(m.group()) > 40 else ""),
-                            "replacement": replacement if len(replacement) < 50 else replacement[:47] + "...",
-                        })
-
-            # Apply user path sanitization
-            for pattern, replacement in USER_PATH_SANITIZE:
-                matches = list(_re.finditer(pattern, content))
-                if matches:
-                    content = _re.sub(pattern, replacement, content)
-                    for m in matches:
-                        actions.append({
-                            "file": str(file_path.relative_to(staging_path)),
-                            "type": "path",
-                            "original": m.group()[:40] + ("..." if len(m.group()) > 40 else ""),
-                            "replacement": replacement,
-                        })
-
-            # Remove sensitive files that shouldn't be distributed
-            if file_path.name.startswith('.env') or file_path.name == 'CLAUDE.md':
-                file_path.unlink()
+
+def sanitize_text(content: str, rel: str, actions: list[dict]) -> str:
+    """Apply secret and user path replacements to text, appending an action per match.
+
+    Rules run in table order, each on the output of the previous one, with a
+    single `sub` per rule: the callback records the match as it rewrites it.
+    """
+    # Keyword prefilter is only exact for ASCII: IGNORECASE also folds a few
+    # non-ASCII letters (e.g. U+017F long s) onto ASCII ones
+    haystack = content.lower() if content.isascii() else None
+    for rules, action_type in ((COMPILED_SANITIZE_REPLACEMENTS, "secret"), (COMPILED_USER_PATH_SANITIZE, "path")):
+        for pattern, replacement, templated, keywords in rules:
+            if keywords and haystack is not None and not any(k in haystack for k in keywords):
+                continue
+            if action_type == "secret":
+                shown = replacement if len(replacement) < 50 else replacement[:47] + "..."
+            else:
+                shown = None
+
+            def replace(m: re.Match, replacement=replacement, templated=templated, shown=shown) -> str:
+                out = m.expand(replacement) if templated else replacement
+                original = m.group()
                 actions.append({
-                    "file": str(file_path.relative_to(staging_path)),
-                    "type": "removed",
-                    "original": file_path.name,
-                    "replacement": "(deleted)",
+                    "file": rel,
+                    "type": action_type,
+                    "original": original[:40] + ("..." if len(original) > 40 else ""),
+                    # Path replacements are shown as written (no escaped backslashes)
+                    "replacement": out if shown is None else shown,
                 })
-                continue
+                return out
+
+            content = pattern.sub(replace, content)
+    return content
+
+
+def _write_atomic(file_path: Path, content: str) -> None:
+    """Replace a file's text via a temp file and rename, keeping its mode."""
+    fd, tmp = tempfile.mkstemp(dir=file_path.parent, prefix=f".{file_path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        shutil.copymode(file_path, tmp)
+        os.replace(tmp, file_path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
 
-            if content != original:
-                file_path.write_text(content, encoding='utf-8')
 
-        except Exception:
-            pass
+def sanitize_file(file_path: Path, staging_path: Path) -> list[dict]:
+    """Sanitize one staging file. Returns its actions.
 
+    A failure leaves the file untouched and is reported as a single
+    "error" action instead of the file's sanitization actions.
+    """
+    rel = str(file_path.relative_to(staging_path))
+    actions = []
+    try:
+        content = file_path.read_text(encoding='utf-8', errors='ignore')
+        original = content
+
+        # Apply secret replacements, then user path sanitization
+        content = sanitize_text(content, rel, actions)
+
+        # Remove sensitive files that shouldn't be distributed
+        if file_path.name.startswith('.env') or file_path.name == 'CLAUDE.md':
+            file_path.unlink()
+            actions.append({
+                "file": rel,
+                "type": "removed",
+                "original": file_path.name,
+                "replacement": "(deleted)",
+            })
+            return actions
+
+        if content != original:
+            _write_atomic(file_path, content)
+    except Exception as e:
+        return [{
+            "file": rel,
+            "type": "error",
+            "original": f"{type(e).__name__}: {e}",
+            "replacement": "(unchanged)",
+        }]
     return actions
 
 
+def sanitize_secrets_in_staging(staging_path: Path, jobs: int = 1) -> list[dict]:
+    """Auto-replace detected secrets with env var placeholders in staging copy.
+
+    Args:
+        jobs: Worker processes for sanitizing files; 0 or less means one per CPU.
+            Small trees (under SANITIZE_PARALLEL_MIN_FILES) are always done serially.
+
+    Returns list of sanitization actions taken, in file order. Files that could
+    not be sanitized appear as actions of type "error".
+    """
+    exclude_dirs = {'__pycache__', '.git', 'node_modules', '.venv', 'venv', '.plugin-state'}
+
+    files = [
+        file_path for file_path in staging_path.rglob("*")
+        if file_path.is_file()
+        and file_path.suffix in SANITIZE_EXTENSIONS
+        and not any(part in exclude_dirs for part in file_path.relative_to(staging_path).parts)
+    ]
+
+    if jobs <= 0:
+        jobs = os.cpu_count() or 1
+    sanitize = partial(sanitize_file, staging_path=staging_path)
+    if jobs == 1 or len(files) < SANITIZE_PARALLEL_MIN_FILES:
+        per_file = map(sanitize, files)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            per_file = list(pool.map(sanitize, files, chunksize=max(1, len(files) // (jobs * 4))))
+    return [action for file_actions in per_file for action in file_actions]
+
+
 def run_secrets_check(plugin_path: Path) -> bool:
     """Run secrets scanner. Returns True if passed."""
     print("\n--- Secrets Scan (HARD GATE) ---")
@@ -301,6 +596,7 @@ def bump_version(plugin_path: Path, bump_type: str) -> str:
     return new_version
 
 
+@cache
 def detect_access_level(marketplace_repo: str) -> str:
     """Detect if user has direct push access or needs to fork."""
     try:
@@ -313,21 +609,26 @@ def detect_access_level(marketplace_repo: str) -> str:
     return "fork"
 
 
+def _fork_username(marketplace_repo: str) -> str:
+    """Make sure the user's fork exists and return their GitHub username."""
+    print("Forking repository (external contributor)...")
+    # Fork without cloning (avoid polluting CWD)
+    run(["gh", "repo", "fork", marketplace_repo, "--clone=false"], check=False)
+    # Get username to construct fork URL
+    username = get_github_username()
+    if not username:
+        print("Error: Could not determine GitHub username")
+        sys.exit(1)
+    return username
+
+
 def clone_repo(temp_dir: Path, access: str, marketplace_repo: str) -> Path:
     """Clone the marketplace repo (or fork). Returns repo path."""
     repo_name = marketplace_repo.split("/")[-1]
     repo_path = temp_dir / repo_name
 
     if access == "fork":
-        print("Forking repository (external contributor)...")
-        # Fork without cloning (avoid polluting CWD)
-        run(["gh", "repo", "fork", marketplace_repo, "--clone=false"], check=False)
-        # Get username to construct fork URL
-        result = run(["gh", "api", "/user", "--jq", ".login"], check=False)
-        username = result.stdout.strip()
-        if not username:
-            print("Error: Could not determine GitHub username")
-            sys.exit(1)
+        username = _fork_username(marketplace_repo)
         # Clone fork into temp directory
         run(["git", "clone", f"https://github.com/{username}/{repo_name}.git", str(repo_path)])
         run(["git", "-C", str(repo_path), "remote", "add", "upstream",
@@ -339,6 +640,99 @@ def clone_repo(temp_dir: Path, access: str, marketplace_repo: str) -> Path:
     return repo_path
 
 
+@contextmanager
+def _mirror_lock(mirror: Path):
+    """Serialize mirror updates between concurrent publishes."""
+    import fcntl
+
+    mirror.parent.mkdir(parents=True, exist_ok=True)
+    with open(mirror.parent / f"{mirror.name}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def ensure_mirror(access: str, marketplace_repo: str, cache_dir: Path = MIRROR_CACHE_DIR,
+                  partial: bool = False) -> Path:
+    """Create or refresh the cached bare clone of the marketplace repo (or fork).
+
+    The mirror is created once (with `--filter=blob:none` if `partial`) and
+    only fetched afterwards, so later publishes download just the new objects.
+    Returns the mirror path.
+    """
+    if access == "fork":
+        username = _fork_username(marketplace_repo)
+        source = f"{username}/{marketplace_repo.split('/')[-1]}"
+    else:
+        source = marketplace_repo
+    mirror = cache_dir / (source.replace("/", "__") + ".git")
+
+    with _mirror_lock(mirror):
+        if not (mirror / "HEAD").exists():
+            print(f"Creating marketplace mirror in {mirror} (first run only)...")
+            shutil.rmtree(mirror, ignore_errors=True)
+            clone_args = ["--bare"] + (["--filter=blob:none"] if partial else [])
+            if access == "fork":
+                run(["git", "clone", *clone_args, f"https://github.com/{source}.git", str(mirror)])
+            else:
+                run(["gh", "repo", "clone", marketplace_repo, str(mirror), "--", *clone_args])
+            # Bare clones have no fetch refspec; track branches so fetch --prune keeps them current
+            run(["git", "-C", str(mirror), "config", "remote.origin.fetch", "+refs/heads/*:refs/heads/*"])
+            if access == "fork":
+                run(["git", "-C", str(mirror), "remote", "add", "upstream",
+                     f"https://github.com/{marketplace_repo}.git"], check=False)
+        else:
+            print("Updating marketplace mirror...")
+            run(["git", "-C", str(mirror), "worktree", "prune"], check=False)
+            run(["git", "-C", str(mirror), "fetch", "--prune", "origin"])
+    return mirror
+
+
+def checkout_worktree(mirror: Path, temp_dir: Path, marketplace_repo: str,
+                      sparse_paths: list[str] | None = None) -> Path:
+    """Check out the mirror's default branch as a detached worktree in temp_dir.
+
+    With `sparse_paths`, only those directories (plus top-level files such as
+    README.md) are checked out. Returns the worktree path.
+    """
+    repo_path = temp_dir / marketplace_repo.split("/")[-1]
+    with _mirror_lock(mirror):
+        if sparse_paths:
+            run(["git", "-C", str(mirror), "worktree", "add", "--detach", "--no-checkout", str(repo_path), "HEAD"])
+            run(["git", "-C", str(repo_path), "sparse-checkout", "set", "--cone", *sparse_paths])
+            run(["git", "-C", str(repo_path), "checkout", "--detach", "HEAD"])
+        else:
+            run(["git", "-C", str(mirror), "worktree", "add", "--detach", str(repo_path), "HEAD"])
+    return repo_path
+
+
+def remove_worktree(mirror: Path, repo_path: Path) -> None:
+    """Detach a publish worktree from the mirror (its directory is removed with temp_dir)."""
+    run(["git", "-C", str(mirror), "worktree", "remove", "--force", str(repo_path)], check=False)
+
+
+def pack_archive(plugin_path: Path, archive_dir: Path, plugin_name: str, version: str, fmt: str = "zip") -> dict | None:
+    """Write <name>-<version>.<fmt> (see plugin_archive.py) from the staged plugin.
+
+    Returns the pack result (archive, sha256, files) or None on failure.
+    """
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    output = archive_dir / f"{plugin_name}-{version}.{fmt}"
+    cmd = [sys.executable, str(ARCHIVE_SCRIPT), "pack", str(plugin_path), str(output), "--format", fmt, "--json"]
+    for pattern in RSYNC_EXCLUDES:
+        cmd.extend(["--exclude", pattern])
+    result = run(cmd, check=False)
+    if result.returncode != 0:
+        print(f"  Error: could not pack {plugin_name}: {result.stderr.strip()}")
+        return None
+    packed = json.loads(result.stdout)
+    print(f"  Archive: {packed['archive']} ({packed['files']} files)")
+    print(f"  sha256: {packed['sha256']}")
+    return packed
+
+
 def copy_plugin(plugin_path: Path, repo_path: Path, plugin_name: str) -> None:
     """Copy plugin files to marketplace repo using rsync."""
     target = repo_path / PLUGINS_DIR / plugin_name
@@ -353,47 +747,148 @@ def copy_plugin(plugin_path: Path, repo_path: Path, plugin_name: str) -> None:
     print(f"Plugin copied to {PLUGINS_DIR}/{plugin_name}/")
 
 
+README_TABLE_SECTION = "## 플러그인 목록"
+README_TABLE_HEADER = [
+    "| 플러그인 | 설명 | 버전 | 작성자 | 배포자 | 배포일 |",
+    "|---------|------|-----|--------|--------|--------|",
+]
+
+
+class Marketplace:
+    """marketplace.json loaded once, with a name -> index map for O(1) upserts.
+
+    Upserted plugin names are recorded in `changed` so the README table can be
+    patched for just those rows.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        if path.exists():
+            self.data = json.loads(path.read_text())
+        else:
+            self.data = {"name": "pb-plugins", "owner": {"name": "rapportlabs-pb-group"}, "plugins": []}
+        self.plugins = self.data.setdefault("plugins", [])
+        self.index = {}
+        for i, p in enumerate(self.plugins):
+            if isinstance(p, dict) and p.get("name") not in self.index:
+                self.index[p.get("name")] = i
+        self.changed: list[str] = []
+
+    @classmethod
+    def load(cls, repo_path: Path) -> "Marketplace":
+        return cls(repo_path / MARKETPLACE_JSON_PATH)
+
+    def get(self, name: str) -> dict | None:
+        i = self.index.get(name)
+        return self.plugins[i] if i is not None else None
+
+    def upsert(self, plugin_data: dict, github_username: str = "", content_hash: str | None = None) -> dict:
+        """Add or replace a plugin's entry. Returns the new entry.
+
+        content_hash (tree_hash of the published files) lets later publishes
+        detect that nothing changed.
+        """
+        from datetime import date
+
+        name = plugin_data["name"]
+        entry = {
+            "name": name,
+            "source": f"./plugins/{name}",
+            "description": plugin_data.get("description", ""),
+            "version": plugin_data.get("version", "1.0.0"),
+            "author": plugin_data.get("author", {"name": "Unknown"}),
+            "keywords": plugin_data.get("keywords", []),
+            "published_by": github_username,
+            "published_at": date.today().isoformat(),
+        }
+        if content_hash:
+            entry["content_hash"] = content_hash
+
+        existing_idx = self.index.get(name)
+        if existing_idx is not None:
+            self.plugins[existing_idx] = entry
+            print(f"Updated existing entry for '{name}' (by @{github_username})")
+        else:
+            self.index[name] = len(self.plugins)
+            self.plugins.append(entry)
+            print(f"Added new entry for '{name}' (by @{github_username})")
+        if name not in self.changed:
+            self.changed.append(name)
+        return entry
+
+    def save(self) -> None:
+        self.path.write_text(json.dumps(self.data, indent=2, ensure_ascii=False) + "\n")
+
+
 def update_marketplace_json(repo_path: Path, plugin_data: dict, github_username: str = "") -> None:
     """Add or update plugin entry in marketplace.json."""
-    mp_path = repo_path / MARKETPLACE_JSON_PATH
-    name = plugin_data["name"]
+    update_marketplace_entries(repo_path, [plugin_data], github_username)
 
-    if mp_path.exists():
-        mp_data = json.loads(mp_path.read_text())
-    else:
-        mp_data = {"name": "pb-plugins", "owner": {"name": "rapportlabs-pb-group"}, "plugins": []}
 
-    # Check for existing entry
-    existing_idx = None
-    for i, p in enumerate(mp_data.get("plugins", [])):
-        if isinstance(p, dict) and p.get("name") == name:
-            existing_idx = i
-            break
+def update_marketplace_entries(repo_path: Path, plugins: list[dict], github_username: str = "", content_hashes: dict[str, str] | None = None) -> Marketplace:
+    """Add or update several plugin entries with a single marketplace.json rewrite."""
+    content_hashes = content_hashes or {}
+    marketplace = Marketplace.load(repo_path)
+    for plugin_data in plugins:
+        marketplace.upsert(plugin_data, github_username, content_hashes.get(plugin_data["name"]))
+    marketplace.save()
+    return marketplace
 
-    from datetime import date
-    entry = {
-        "name": name,
-        "source": f"./plugins/{name}",
-        "description": plugin_data.get("description", ""),
-        "version": plugin_data.get("version", "1.0.0"),
-        "author": plugin_data.get("author", {"name": "Unknown"}),
-        "keywords": plugin_data.get("keywords", []),
-        "published_by": github_username,
-        "published_at": date.today().isoformat(),
-    }
 
-    if existing_idx is not None:
-        mp_data["plugins"][existing_idx] = entry
-        print(f"Updated existing entry for '{name}' (by @{github_username})")
-    else:
-        mp_data.setdefault("plugins", []).append(entry)
-        print(f"Added new entry for '{name}' (by @{github_username})")
+def _readme_row(p: dict) -> str:
+    """README plugin table row for a marketplace entry."""
+    name = p.get("name", "")
+    desc = p.get("description", "")
+    ver = p.get("version", "")
+    author = p.get("author", {})
+    author_name = author.get("name", "") if isinstance(author, dict) else str(author)
+    published_by = p.get("published_by", "")
+    published_at = p.get("published_at", "")
+    gh_link = f"@{published_by}" if published_by else ""
+    return f"| {name} | {desc} | {ver} | {author_name} | {gh_link} | {published_at} |"
+
+
+def _patch_readme_rows(readme: str, marketplace: Marketplace) -> tuple[str, int, int] | None:
+    """Rewrite only the table rows of changed plugins (appending new ones).
+
+    Returns (readme, rows updated, rows added), or None when the table is not
+    in the current format and has to be regenerated.
+    """
+    lines = readme.split("\n")
+    try:
+        start = next(i for i, line in enumerate(lines) if line.strip() == README_TABLE_SECTION) + 1
+    except StopIteration:
+        return None
+    while start < len(lines) and not lines[start].strip():
+        start += 1
+    if lines[start:start + 2] != README_TABLE_HEADER:
+        return None
+
+    rows = {}
+    end = start + 2
+    while end < len(lines) and lines[end].startswith("|"):
+        rows.setdefault(lines[end].split("|")[1].strip(), end)
+        end += 1
+
+    updated, added = 0, []
+    for name in marketplace.changed:
+        row = _readme_row(marketplace.get(name))
+        if name in rows:
+            lines[rows[name]] = row
+            updated += 1
+        else:
+            added.append(row)
+    lines[end:end] = added
+    return "\n".join(lines), updated, len(added)
 
-    mp_path.write_text(json.dumps(mp_data, indent=2, ensure_ascii=False) + "\n")
 
+def update_readme_plugin_table(repo_path: Path, marketplace: Marketplace | None = None) -> None:
+    """Update the plugin list table in the marketplace README.md from marketplace.json.
 
-def update_readme_plugin_table(repo_path: Path) -> None:
-    """Update the plugin list table in the marketplace README.md from marketplace.json."""
+    Given a Marketplace with upserted plugins, only their rows are patched;
+    otherwise (or if the table is missing or in an old format) the whole
+    table is regenerated.
+    """
     readme_path = repo_path / "README.md"
     mp_path = repo_path / MARKETPLACE_JSON_PATH
 
@@ -401,39 +896,36 @@ def update_readme_plugin_table(repo_path: Path) -> None:
         print("  Skipped: README.md or marketplace.json not found")
         return
 
-    mp_data = json.loads(mp_path.read_text())
-    plugins = mp_data.get("plugins", [])
+    if marketplace is None:
+        marketplace = Marketplace(mp_path)
+    plugins = marketplace.plugins
     if not plugins:
         return
 
-    # Build new table with author column
-    header = "| 플러그인 | 설명 | 버전 | 작성자 | 배포자 | 배포일 |\n|---------|------|-----|--------|--------|--------|"
-    rows = []
-    for p in plugins:
-        name = p.get("name", "")
-        desc = p.get("description", "")
-        ver = p.get("version", "")
-        author = p.get("author", {})
-        author_name = author.get("name", "") if isinstance(author, dict) else str(author)
-        published_by = p.get("published_by", "")
-        published_at = p.get("published_at", "")
-        gh_link = f"@{published_by}" if published_by else ""
-        rows.append(f"| {name} | {desc} | {ver} | {author_name} | {gh_link} | {published_at} |")
-    new_table = header + "\n" + "\n".join(rows)
-
     readme = readme_path.read_text()
 
+    if marketplace.changed:
+        patched = _patch_readme_rows(readme, marketplace)
+        if patched:
+            readme, updated, added = patched
+            readme_path.write_text(readme)
+            print(f"  README.md plugin table patched ({updated} updated, {added} added)")
+            return
+
+    # Build new table with author column
+    new_table = "\n".join(README_TABLE_HEADER + [_readme_row(p) for p in plugins])
+
     # Find and replace the existing table after "## 플러그인 목록"
-    import re
-    pattern = r"(## 플러그인 목록\s*\n)(\|.+\|[\s\S]*?)(\n##|\n\Z|\Z)"
+    pattern = rf"({README_TABLE_SECTION}\s*\n)(\|.+\|[\s\S]*?)(\n##|\n\Z|\Z)"
     match = re.search(pattern, readme)
     if match:
-        replacement = match.group(1) + "\n" + new_table + "\n" + (match.group(3) if match.group(3).startswith("\n##") else match.group(3))
+        # Exactly one blank line between heading and table (regenerating used to add one each time)
+        replacement = match.group(1).rstrip() + "\n\n" + new_table + "\n" + match.group(3)
         readme = readme[:match.start()] + replacement + readme[match.end():]
         readme_path.write_text(readme)
         print(f"  README.md plugin table updated ({len(plugins)} plugins)")
     else:
-        print("  Skipped: Could not find '## 플러그인 목록' section in README.md")
+        print(f"  Skipped: Could not find '{README_TABLE_SECTION}' section in README.md")
 
 
 def ensure_changelog(plugin_path: Path, plugin_name: str, version: str, description: str) -> None:
@@ -461,11 +953,21 @@ def ensure_changelog(plugin_path: Path, plugin_name: str, version: str, descript
     print(f"CHANGELOG.md updated with v{version}")
 
 
-def create_pr(repo_path: Path, plugin_name: str, version: str, description: str, is_update: bool, marketplace_repo: str, author_name: str = "", github_username: str = "") -> str:
-    """Create branch, commit, push, and open PR. Returns PR URL."""
-    prefix = "update" if is_update else "add"
-    branch = f"{prefix}/{plugin_name}-v{version}"
+def _pr_head(repo_path: Path, branch: str, marketplace_repo: str) -> str:
+    """`gh pr create --head` value: owner-qualified when origin is a fork."""
+    origin = run(["git", "-C", str(repo_path), "remote", "get-url", "origin"], check=False).stdout.strip()
+    m = re.search(r'github\.com[:/]([^/]+)/', origin)
+    if m and m.group(1).lower() != marketplace_repo.split("/")[0].lower():
+        return f"{m.group(1)}:{branch}"
+    return branch
+
 
+def _open_pr(repo_path: Path, branch: str, commit_msg: str, pr_title: str, pr_body: str, marketplace_repo: str) -> str:
+    """Commit everything, push it to a new remote branch and open a PR. Returns PR URL.
+
+    The commit is made on a detached HEAD and pushed as refs/heads/<branch>, so
+    no local branch is left in the (possibly shared) mirror.
+    """
     # Handle branch collision: delete existing remote branch
     check_branch = run(
         ["git", "-C", str(repo_path), "ls-remote", "--heads", "origin", branch],
@@ -473,33 +975,18 @@ def create_pr(repo_path: Path, plugin_name: str, version: str, description: str,
     )
     if check_branch.returncode == 0 and check_branch.stdout.strip():
         print(f"  Branch '{branch}' already exists on remote, using versioned name...")
-        branch = f"{prefix}/{plugin_name}-v{version}-{os.getpid()}"
+        branch = f"{branch}-{os.getpid()}"
 
-    run(["git", "-C", str(repo_path), "checkout", "-b", branch])
+    run(["git", "-C", str(repo_path), "checkout", "--detach"])
     run(["git", "-C", str(repo_path), "add", "."])
-
-    action = "Update" if is_update else "Add"
-    commit_msg = f"{action} {plugin_name} v{version}\n\nAuthor: {author_name} (@{github_username})\n{description}"
     run(["git", "-C", str(repo_path), "commit", "-m", commit_msg])
-    run(["git", "-C", str(repo_path), "push", "-u", "origin", branch])
-
-    pr_title = f"{action} {plugin_name} v{version}"
-    pr_body = (
-        f"## Summary\n"
-        f"- {action}: **{plugin_name}**\n"
-        f"- Version: {version}\n"
-        f"- Author: **{author_name}** (@{github_username})\n"
-        f"- {description}\n\n"
-        f"## Test plan\n"
-        f"- [ ] `node scripts/validate-plugins.js` passes\n"
-        f"- [ ] `node scripts/validate-marketplace.js` passes\n"
-        f"- [ ] Local test with `claude --plugin-dir`"
-    )
+    run(["git", "-C", str(repo_path), "push", "origin", f"HEAD:refs/heads/{branch}"])
 
     result = run(
         ["gh", "pr", "create",
          "--title", pr_title,
          "--body", pr_body,
+         "--head", _pr_head(repo_path, branch, marketplace_repo),
          "--repo", marketplace_repo],
         check=False,
         cwd=repo_path,
@@ -516,65 +1003,111 @@ def create_pr(repo_path: Path, plugin_name: str, version: str, description: str,
         return ""
 
 
-def publish(plugin_path: Path, dry_run: bool = False, version_bump: str | None = None, marketplace_repo: str = DEFAULT_MARKETPLACE_REPO, use_staging: bool = True) -> bool:
-    """Main publish flow.
+PR_TEST_PLAN = (
+    "## Test plan\n"
+    "- [ ] `node scripts/validate-plugins.js` passes\n"
+    "- [ ] `node scripts/validate-marketplace.js` passes\n"
+    "- [ ] Local test with `claude --plugin-dir`"
+)
 
-    Args:
-        use_staging: If True (default), copies source to staging dir first.
-            Secrets are auto-sanitized on the staging copy.
-            Source files are NEVER modified.
+
+def create_pr(repo_path: Path, plugin_name: str, version: str, description: str, is_update: bool, marketplace_repo: str, author_name: str = "", github_username: str = "") -> str:
+    """Create branch, commit, push, and open PR. Returns PR URL."""
+    prefix = "update" if is_update else "add"
+    branch = f"{prefix}/{plugin_name}-v{version}"
+
+    action = "Update" if is_update else "Add"
+    commit_msg = f"{action} {plugin_name} v{version}\n\nAuthor: {author_name} (@{github_username})\n{description}"
+
+    pr_title = f"{action} {plugin_name} v{version}"
+    pr_body = (
+        f"## Summary\n"
+        f"- {action}: **{plugin_name}**\n"
+        f"- Version: {version}\n"
+        f"- Author: **{author_name}** (@{github_username})\n"
+        f"- {description}\n\n"
+        + PR_TEST_PLAN
+    )
+    return _open_pr(repo_path, branch, commit_msg, pr_title, pr_body, marketplace_repo)
+
+
+def create_batch_pr(repo_path: Path, plugins: list[dict], marketplace_repo: str, github_username: str = "") -> str:
+    """Create one branch, commit and PR for several prepared plugins. Returns PR URL."""
+    from datetime import date
+
+    names = [p["name"] for p in plugins]
+    branch = f"batch/{names[0]}-and-{len(names) - 1}-more-{date.today().isoformat()}"
+
+    lines = [
+        f"- {'Update' if p['is_update'] else 'Add'} {p['name']} v{p['version']} "
+        f"(Author: {p['author_name']})"
+        for p in plugins
+    ]
+    commit_msg = f"Publish {len(plugins)} plugins: {', '.join(names)}\n\nPublisher: @{github_username}\n" + "\n".join(lines)
+
+    pr_title = f"Publish {len(plugins)} plugins: {', '.join(names)}"
+    if len(pr_title) > 100:
+        pr_title = f"Publish {len(plugins)} plugins ({names[0]}, ...)"
+    rows = "\n".join(
+        f"| {p['name']} | {'Update' if p['is_update'] else 'Add'} | {p['version']} | {p['author_name']} | {p['description']} |"
+        for p in plugins
+    )
+    pr_body = (
+        f"## Summary\n"
+        f"- Publisher: @{github_username}\n\n"
+        f"| Plugin | Action | Version | Author | Description |\n"
+        f"|--------|--------|---------|--------|-------------|\n"
+        f"{rows}\n\n"
+        + PR_TEST_PLAN
+    )
+    return _open_pr(repo_path, branch, commit_msg, pr_title, pr_body, marketplace_repo)
+
+
+def prepare_plugin(plugin_path: Path, dry_run: bool = False, version_bump: str | None = None, use_staging: bool = True, jobs: int = 1, link_staging: bool = True, marketplace_repo: str | None = None, force: bool = False) -> dict | None:
+    """Validate one plugin and build its (sanitized) staging copy.
+
+    Covers publish steps 2-3. Returns a record with the plugin's name, data,
+    version, description, author_name, source (directory to copy into the
+    marketplace), staging_temp (to remove afterwards) and content_hash, or
+    None on failure.
+
+    With `marketplace_repo`, a plugin whose files match the content_hash
+    published there is not bumped or staged further: the record comes back
+    with unchanged=True (unless `force`).
     """
     plugin_path = plugin_path.resolve()
-    marketplace_name = marketplace_repo.split("/")[-1]
-
-    # 1. Prerequisites
-    print("=== Step 1: Check Prerequisites ===")
-    errors = check_prerequisites()
-    if errors:
-        for e in errors:
-            print(f"  Error: {e}")
-        if not dry_run:
-            return False
-        print("  (dry-run: continuing despite errors)")
 
     # 2. Validate structure (on SOURCE - structure must be valid regardless)
     print("\n=== Step 2: Validate Plugin Structure ===")
     valid, plugin_data = validate_plugin_structure(plugin_path)
     if not valid:
-        return False
+        return None
 
     plugin_name = plugin_data["name"]
     author_name = plugin_data.get("author", {}).get("name", "Unknown")
     print(f"  Plugin: {plugin_name}")
     print(f"  Author: {author_name}")
 
-    # Resolve GitHub username (REQUIRED for author tracking)
-    github_username = get_github_username()
-    if not github_username:
-        print("Error: Could not detect GitHub username. Run: gh auth login")
-        return False
-    print(f"  Publisher: @{github_username}")
-
-    # Version bump if requested (applied to SOURCE - this is intentional)
-    if version_bump:
-        plugin_data["version"] = bump_version(plugin_path, version_bump)
-
     version = plugin_data.get("version", "1.0.0")
     description = plugin_data.get("description", "")
     print(f"  Version: {version}")
 
-    # 2.5. Update CHANGELOG (on SOURCE - this is intentional)
-    ensure_changelog(plugin_path, plugin_name, version, description)
+    prepared = {
+        "path": plugin_path,
+        "name": plugin_name,
+        "data": plugin_data,
+        "version": version,
+        "description": description,
+        "author_name": author_name,
+        "source": plugin_path,  # what we copy to marketplace
+        "staging_temp": None,
+    }
 
     # 3. Staging + Secrets (the key difference)
-    staging_path = None
-    staging_temp = None
-    publish_source = plugin_path  # what we copy to marketplace
-
     if use_staging:
         print("\n=== Step 3: Create Staging Copy ===")
         print(f"  Source: {plugin_path}")
-        staging_path = create_staging_copy(plugin_path)
+        staging_path = create_staging_copy(plugin_path, link=link_staging)
         staging_temp = staging_path.parent
         print(f"  Staging: {staging_path}")
         print("  Source files will NOT be modified.")
@@ -582,8 +1115,9 @@ def publish(plugin_path: Path, dry_run: bool = False, version_bump: str | None =
         # 3.5. Scan staging for secrets
         print("\n=== Step 3.5: Secrets Scan (on staging) ===")
         if not dry_run:
+            cache_args = ["--cache-file", str(plugin_path / SECRETS_CACHE), "--jobs", str(jobs)]
             scan_result = run(
-                [sys.executable, str(SECRETS_SCRIPT), str(staging_path), "--json"],
+                [sys.executable, str(SECRETS_SCRIPT), str(staging_path), "--json", *cache_args],
                 check=False,
             )
             try:
@@ -599,7 +1133,13 @@ def publish(plugin_path: Path, dry_run: bool = False, version_bump: str | None =
 
                 # Auto-sanitize the staging copy
                 print("\n=== Step 3.6: Auto-Sanitize Staging ===")
-                actions = sanitize_secrets_in_staging(staging_path)
+                actions = sanitize_secrets_in_staging(staging_path, jobs)
+                errors = [a for a in actions if a["type"] == "error"]
+                actions = [a for a in actions if a["type"] != "error"]
+                if errors:
+                    print(f"  Could not sanitize {len(errors)} file(s):")
+                    for a in errors:
+                        print(f"    [error] {a['file']}: {a['original']}")
                 if actions:
                     print(f"  Sanitized {len(actions)} items:")
                     for a in actions[:10]:
@@ -610,126 +1150,370 @@ def publish(plugin_path: Path, dry_run: bool = False, version_bump: str | None =
                 # Re-scan after sanitization
                 print("\n=== Step 3.7: Re-scan After Sanitization ===")
                 rescan = run(
-                    [sys.executable, str(SECRETS_SCRIPT), str(staging_path)],
+                    [sys.executable, str(SECRETS_SCRIPT), str(staging_path), *cache_args],
                     check=False,
                 )
                 print(rescan.stdout)
                 if rescan.returncode != 0:
                     print("BLOCKED: Secrets still detected after auto-sanitization.")
                     print("Fix remaining issues manually in source and re-run.")
-                    if staging_temp:
-                        shutil.rmtree(staging_temp, ignore_errors=True)
-                    return False
+                    shutil.rmtree(staging_temp, ignore_errors=True)
+                    return None
                 print("  Staging copy is clean after sanitization.")
             else:
                 print("  No secrets detected. Staging copy is clean.")
         else:
             print("  (dry-run: skipping secrets scan)")
 
-        publish_source = staging_path
+        prepared["source"] = staging_path
+        prepared["staging_temp"] = staging_temp
     else:
         # Legacy mode: scan source directly (HARD GATE)
         print("\n=== Step 3: Secrets Gate (legacy mode) ===")
         if not dry_run:
             if not run_secrets_check(plugin_path):
-                return False
+                return None
         else:
             print("  (dry-run: skipping secrets scan)")
 
-    # 4. Detect access level
-    print("\n=== Step 4: Detect Access Level ===")
-    if not dry_run:
-        access = detect_access_level(marketplace_repo)
-        print(f"  Access: {access} ({'org member' if access == 'direct' else 'fork required'})")
-    else:
-        access = "direct"
-        print("  (dry-run: assuming direct access)")
-
-    if dry_run:
-        print("\n=== DRY RUN SUMMARY ===")
-        print(f"  Plugin: {plugin_name} v{version}")
-        print(f"  Mode: {'staging (source untouched)' if use_staging else 'legacy (source scanned directly)'}")
-        print(f"  Target: {marketplace_repo}/{PLUGINS_DIR}/{plugin_name}/")
-        print(f"  Access: {access}")
-        print("  Actions that would be taken:")
-        if use_staging:
-            print(f"    1. Create staging copy of {plugin_path}")
-            print("    2. Scan staging for secrets, auto-sanitize if needed")
-        print(f"    3. Clone {marketplace_repo}")
-        print(f"    4. Copy {'staging' if use_staging else str(plugin_path)} -> {PLUGINS_DIR}/{plugin_name}/")
-        print(f"    5. Update {MARKETPLACE_JSON_PATH}")
-        print("    6. Run validation scripts")
-        print(f"    7. Create PR: 'Add {plugin_name} v{version}'")
-        print("\n  No changes were made.")
-        if staging_temp:
-            shutil.rmtree(staging_temp, ignore_errors=True)
-        return True
+    # 3.8. Skip plugins whose files are already published as-is
+    if marketplace_repo and not force:
+        content_hash = tree_hash(prepared["source"])
+        if get_published_hash(marketplace_repo, plugin_name) == content_hash:
+            print(f"\n  Already published: {plugin_name} v{version} matches {marketplace_repo} ({content_hash[:19]})")
+            print("  Nothing to do. Use --force to publish anyway.")
+            if prepared["staging_temp"]:
+                shutil.rmtree(prepared["staging_temp"], ignore_errors=True)
+                prepared["staging_temp"] = None
+            prepared["content_hash"] = content_hash
+            prepared["unchanged"] = True
+            return prepared
+
+    # 3.9. Version bump + CHANGELOG (on SOURCE - this is intentional)
+    print("\n=== Step 3.9: Version & CHANGELOG ===")
+    if version_bump:
+        plugin_data["version"] = version = bump_version(plugin_path, version_bump)
+        prepared["version"] = version
+    ensure_changelog(plugin_path, plugin_name, version, description)
+    if use_staging:
+        _restage_files(plugin_path, prepared["source"], [Path(".claude-plugin") / "plugin.json", Path("CHANGELOG.md")])
+
+    prepared["content_hash"] = tree_hash(prepared["source"])
+    return prepared
+
+
+def _restage_files(plugin_path: Path, staging_path: Path, rel_paths: list[Path]) -> None:
+    """Copy files changed in the source after staging into the staging copy (sanitized)."""
+    for rel in rel_paths:
+        src, dst = plugin_path / rel, staging_path / rel
+        if not src.is_file():
+            continue
+        dst.unlink(missing_ok=True)
+        shutil.copy2(src, dst)
+        for a in sanitize_file(dst, staging_path):
+            if a["type"] == "error":
+                print(f"    [error] {a['file']}: {a['original']}")
+            else:
+                print(f"    [{a['type']}] {a['file']}: {a['original']} -> {a['replacement']}")
+
+
+class _ThreadLocalStdout:
+    """sys.stdout stand-in that diverts writes from threads with a capture buffer."""
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
 
-    # 5. Clone repo
-    print("\n=== Step 5: Clone Repository ===")
-    temp_dir = Path(tempfile.mkdtemp())
+    def capture(self) -> io.StringIO:
+        self._local.buffer = io.StringIO()
+        return self._local.buffer
+
+    def write(self, text: str) -> int:
+        return (getattr(self._local, "buffer", None) or self._stream).write(text)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+
+def prepare_plugins(plugin_paths: list[Path], jobs: int = 1, **kwargs) -> list[dict | None]:
+    """Run prepare_plugin for several plugins concurrently.
+
+    Each plugin's output is buffered and printed in argument order once all
+    are done. kwargs are passed through to prepare_plugin.
+    """
+    stdout = _ThreadLocalStdout(sys.stdout)
+
+    def prepare(plugin_path: Path) -> tuple[dict | None, str]:
+        buffer = stdout.capture()
+        try:
+            return prepare_plugin(plugin_path, jobs=jobs, **kwargs), buffer.getvalue()
+        except Exception as e:
+            return None, buffer.getvalue() + f"Error: {type(e).__name__}: {e}\n"
+
+    sys.stdout = stdout
     try:
-        repo_path = clone_repo(temp_dir, access, marketplace_repo)
-
-        # Check if update
-        is_update = (repo_path / PLUGINS_DIR / plugin_name).exists()
-        if is_update:
-            print(f"  Plugin '{plugin_name}' already exists - treating as update")
-
-        # 6. Copy plugin (from staging if available, otherwise source)
-        print("\n=== Step 6: Copy Plugin ===")
-        copy_plugin(publish_source, repo_path, plugin_name)
-        if use_staging:
-            print("  (copied from sanitized staging copy)")
-
-        # 7. Register in marketplace.json
-        print("\n=== Step 7: Update marketplace.json ===")
-        update_marketplace_json(repo_path, plugin_data, github_username)
-
-        # 7.5. Update README plugin table
-        print("\n=== Step 7.5: Update README Plugin Table ===")
-        update_readme_plugin_table(repo_path)
-
-        # 8. Run validation
-        print("\n=== Step 8: Validate ===")
-        validate_script = repo_path / "scripts" / "validate-plugins.js"
-        if validate_script.exists():
-            result = run(["node", str(validate_script)], check=False)
-            if result.returncode != 0:
-                print(f"Validation failed: {result.stdout}")
-                return False
+        with ThreadPoolExecutor(max_workers=min(len(plugin_paths), BATCH_MAX_WORKERS)) as pool:
+            outcomes = list(pool.map(prepare, plugin_paths))
+    finally:
+        sys.stdout = stdout._stream
+
+    for plugin_path, (_, log) in zip(plugin_paths, outcomes):
+        print(f"\n##### {plugin_path} #####")
+        print(log, end="")
+    return [prepared for prepared, _ in outcomes]
+
+
+def _resolve_publisher(dry_run: bool, marketplace_repo: str) -> str | None:
+    """Step 1: check prerequisites and resolve the GitHub username (None = abort).
+
+    The access level for marketplace_repo is probed at the same time (not in dry-run).
+    """
+    print("=== Step 1: Check Prerequisites ===")
+    errors, github_username = run_preflight(None if dry_run else marketplace_repo)
+    if errors:
+        for e in errors:
+            print(f"  Error: {e}")
+        if not dry_run:
+            return None
+        print("  (dry-run: continuing despite errors)")
+
+    # GitHub username is REQUIRED for author tracking
+    if not github_username:
+        print("Error: Could not detect GitHub username. Run: gh auth login")
+        return None
+    print(f"  Publisher: @{github_username}")
+    return github_username
 
-        # 9. Create PR
-        print("\n=== Step 9: Create PR ===")
-        pr_url = create_pr(repo_path, plugin_name, version, description, is_update, marketplace_repo, author_name, github_username)
 
-        if pr_url:
-            print(f"\nDone! PR created: {pr_url}")
+def publish_prepared(prepared: list[dict], github_username: str, dry_run: bool = False, marketplace_repo: str = DEFAULT_MARKETPLACE_REPO, use_staging: bool = True, mirror: bool = True, partial_clone: bool = False, sparse: bool = False, archive_dir: Path | None = None, archive_format: str = "zip") -> bool:
+    """Publish steps 4-9 for prepared plugins: one clone, one commit, one PR.
+
+    Removes the plugins' staging directories when done.
+    """
+    marketplace_name = marketplace_repo.split("/")[-1]
+    batch = len(prepared) > 1
+    try:
+        # 4. Detect access level
+        print("\n=== Step 4: Detect Access Level ===")
+        if not dry_run:
+            access = detect_access_level(marketplace_repo)
+            print(f"  Access: {access} ({'org member' if access == 'direct' else 'fork required'})")
+        else:
+            access = "direct"
+            print("  (dry-run: assuming direct access)")
+
+        if dry_run:
+            print("\n=== DRY RUN SUMMARY ===")
+            for p in prepared:
+                print(f"  Plugin: {p['name']} v{p['version']}")
+            print(f"  Mode: {'staging (source untouched)' if use_staging else 'legacy (source scanned directly)'}")
+            for p in prepared:
+                print(f"  Target: {marketplace_repo}/{PLUGINS_DIR}/{p['name']}/")
+            print(f"  Access: {access}")
+            print("  Actions that would be taken:")
             if use_staging:
-                print("\nSource files were NOT modified. No restoration needed.")
-            print(f"\nAfter merge, install with:")
-            print(f"  /plugin marketplace add {marketplace_repo}")
-            print(f"  /plugin install {plugin_name}@{marketplace_name}")
+                print(f"    1. Create staging copy of {', '.join(str(p['path']) for p in prepared)}")
+                print("    2. Scan staging for secrets, auto-sanitize if needed")
+            print(f"    3. Clone {marketplace_repo}")
+            for p in prepared:
+                print(f"    4. Copy {'staging' if use_staging else str(p['path'])} -> {PLUGINS_DIR}/{p['name']}/")
+            if archive_dir:
+                for p in prepared:
+                    print(f"    4. Pack {archive_dir / (p['name'] + '-' + p['version'] + '.' + archive_format)}")
+            print(f"    5. Update {MARKETPLACE_JSON_PATH}")
+            print("    6. Run validation scripts")
+            if batch:
+                print(f"    7. Create one PR: 'Publish {len(prepared)} plugins'")
+            else:
+                print(f"    7. Create PR: 'Add {prepared[0]['name']} v{prepared[0]['version']}'")
+            print("\n  No changes were made.")
             return True
-        else:
-            print("\nPR creation may have had issues. Check GitHub manually.")
-            return False
+
+        # 5. Clone repo (or check out a worktree of the cached mirror)
+        print("\n=== Step 5: Clone Repository ===")
+        temp_dir = Path(tempfile.mkdtemp())
+        mirror_path = None
+        repo_path = None
+        try:
+            if mirror:
+                mirror_path = ensure_mirror(access, marketplace_repo, partial=partial_clone)
+                sparse_paths = None
+                if sparse:
+                    sparse_paths = [f"{PLUGINS_DIR}/{p['name']}" for p in prepared]
+                    sparse_paths += [MARKETPLACE_JSON_PATH.split("/")[0], "scripts"]
+                repo_path = checkout_worktree(mirror_path, temp_dir, marketplace_repo, sparse_paths)
+            else:
+                repo_path = clone_repo(temp_dir, access, marketplace_repo)
+
+            # Check if update
+            for p in prepared:
+                p["is_update"] = (repo_path / PLUGINS_DIR / p["name"]).exists()
+                if p["is_update"]:
+                    print(f"  Plugin '{p['name']}' already exists - treating as update")
+
+            # 6. Copy plugin (from staging if available, otherwise source)
+            print("\n=== Step 6: Copy Plugin ===")
+            for p in prepared:
+                copy_plugin(p["source"], repo_path, p["name"])
+            if use_staging:
+                print("  (copied from sanitized staging copy)")
+
+            # 6.5. Pack reproducible archives
+            if archive_dir:
+                print("\n=== Step 6.5: Pack Archive ===")
+                for p in prepared:
+                    if not pack_archive(p["source"], archive_dir, p["name"], p["version"], archive_format):
+                        return False
+
+            # 7. Register in marketplace.json
+            print("\n=== Step 7: Update marketplace.json ===")
+            marketplace = update_marketplace_entries(repo_path, [p["data"] for p in prepared], github_username,
+                                                     {p["name"]: p["content_hash"] for p in prepared})
+
+            # 7.5. Update README plugin table
+            print("\n=== Step 7.5: Update README Plugin Table ===")
+            update_readme_plugin_table(repo_path, marketplace)
+
+            # 8. Run validation
+            print("\n=== Step 8: Validate ===")
+            validate_script = repo_path / "scripts" / "validate-plugins.js"
+            if validate_script.exists():
+                result = run(["node", str(validate_script)], check=False)
+                if result.returncode != 0:
+                    print(f"Validation failed: {result.stdout}")
+                    return False
+
+            # 9. Create PR
+            print("\n=== Step 9: Create PR ===")
+            if batch:
+                pr_url = create_batch_pr(repo_path, prepared, marketplace_repo, github_username)
+            else:
+                p = prepared[0]
+                pr_url = create_pr(repo_path, p["name"], p["version"], p["description"], p["is_update"],
+                                   marketplace_repo, p["author_name"], github_username)
+
+            if pr_url:
+                print(f"\nDone! PR created: {pr_url}")
+                if use_staging:
+                    print("\nSource files were NOT modified. No restoration needed.")
+                print("\nAfter merge, install with:")
+                print(f"  /plugin marketplace add {marketplace_repo}")
+                for p in prepared:
+                    print(f"  /plugin install {p['name']}@{marketplace_name}")
+                return True
+            else:
+                print("\nPR creation may have had issues. Check GitHub manually.")
+                return False
+
+        finally:
+            if mirror_path and repo_path:
+                remove_worktree(mirror_path, repo_path)
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
     finally:
         # Cleanup
-        shutil.rmtree(temp_dir, ignore_errors=True)
-        if staging_temp:
-            shutil.rmtree(staging_temp, ignore_errors=True)
+        for p in prepared:
+            if p["staging_temp"]:
+                shutil.rmtree(p["staging_temp"], ignore_errors=True)
+
+
+def publish(plugin_path: Path, dry_run: bool = False, version_bump: str | None = None, marketplace_repo: str = DEFAULT_MARKETPLACE_REPO, use_staging: bool = True, jobs: int = 1, link_staging: bool = True, mirror: bool = True, partial_clone: bool = False, sparse: bool = False, force: bool = False, archive_dir: Path | None = None, archive_format: str = "zip") -> bool:
+    """Main publish flow.
+
+    Args:
+        use_staging: If True (default), copies source to staging dir first.
+            Secrets are auto-sanitized on the staging copy.
+            Source files are NEVER modified.
+        jobs: Worker processes for the staging secrets scan and sanitization
+            (0 = one per CPU).
+        link_staging: Build staging with reflinks/hardlinks (default) instead
+            of a full rsync copy.
+        mirror: Check out the marketplace from a cached bare mirror (default)
+            instead of cloning it from scratch.
+        partial_clone: Create the mirror with --filter=blob:none.
+        sparse: Only check out plugins/<name>, .claude-plugin and scripts.
+        force: Publish even if the staged files match the content_hash
+            already recorded in the marketplace.
+        archive_dir: Also write a reproducible <name>-<version> archive of
+            the published files here.
+        archive_format: "zip" or "tar.gz".
+    """
+    # 1. Prerequisites
+    github_username = _resolve_publisher(dry_run, marketplace_repo)
+    if not github_username:
+        return False
+
+    prepared = prepare_plugin(plugin_path, dry_run, version_bump, use_staging, jobs, link_staging,
+                              marketplace_repo, force)
+    if not prepared:
+        return False
+    if prepared.get("unchanged"):
+        return True
+
+    return publish_prepared([prepared], github_username, dry_run, marketplace_repo, use_staging,
+                            mirror, partial_clone, sparse, archive_dir, archive_format)
+
+
+def publish_batch(plugin_paths: list[Path], dry_run: bool = False, version_bump: str | None = None, marketplace_repo: str = DEFAULT_MARKETPLACE_REPO, use_staging: bool = True, jobs: int = 1, link_staging: bool = True, mirror: bool = True, partial_clone: bool = False, sparse: bool = False, force: bool = False, archive_dir: Path | None = None, archive_format: str = "zip") -> bool:
+    """Publish several plugins in one marketplace commit and PR.
+
+    Plugins are validated and staged concurrently; if any of them fails, nothing
+    is published. Plugins already published unchanged are left out of the PR.
+    Arguments are as for publish().
+    """
+    # 1. Prerequisites
+    github_username = _resolve_publisher(dry_run, marketplace_repo)
+    if not github_username:
+        return False
+
+    print(f"\n=== Steps 2-3: Prepare {len(plugin_paths)} Plugins ===")
+    prepared = prepare_plugins(plugin_paths, jobs, dry_run=dry_run, version_bump=version_bump,
+                               use_staging=use_staging, link_staging=link_staging,
+                               marketplace_repo=marketplace_repo, force=force)
+
+    failed = [str(path) for path, p in zip(plugin_paths, prepared) if p is None]
+    names = [p["name"] for p in prepared if p]
+    duplicates = sorted({n for n in names if names.count(n) > 1})
+    if failed or duplicates:
+        print("\n=== BATCH ABORTED ===")
+        for path in failed:
+            print(f"  Failed: {path}")
+        for name in duplicates:
+            print(f"  Duplicate plugin name: {name}")
+        print("  Nothing was published.")
+        for p in prepared:
+            if p and p["staging_temp"]:
+                shutil.rmtree(p["staging_temp"], ignore_errors=True)
+        return False
+
+    unchanged = [p["name"] for p in prepared if p.get("unchanged")]
+    prepared = [p for p in prepared if not p.get("unchanged")]
+    if unchanged:
+        print(f"\n  Already published (skipped): {', '.join(unchanged)}")
+    if not prepared:
+        print("  Nothing to publish.")
+        return True
+
+    return publish_prepared(prepared, github_username, dry_run, marketplace_repo, use_staging,
+                            mirror, partial_clone, sparse, archive_dir, archive_format)
 
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Publish a plugin to the PB marketplace"
+        description="Publish a plugin to the PB marketplace",
+        fromfile_prefix_chars="@",
     )
     parser.add_argument(
         "plugin_path",
+        nargs="?",
         help="Path to the plugin directory",
     )
+    parser.add_argument(
+        "--batch",
+        nargs="+",
+        metavar="PLUGIN_PATH",
+        help="Publish several plugins in one PR (use @FILE to read paths from a manifest, one per line)",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -750,19 +1534,74 @@ def main():
         action="store_true",
         help="Skip staging mode (legacy: scan source directly, may require manual restoration)",
     )
+    parser.add_argument(
+        "--full-copy",
+        action="store_true",
+        help="Stage with a full rsync copy instead of reflinks/hardlinks",
+    )
+    parser.add_argument(
+        "--fresh-clone",
+        action="store_true",
+        help=f"Clone the marketplace from scratch instead of using the cached mirror in {MIRROR_CACHE_DIR}",
+    )
+    parser.add_argument(
+        "--partial-clone",
+        action="store_true",
+        help="Create the cached mirror as a blobless partial clone (--filter=blob:none)",
+    )
+    parser.add_argument(
+        "--sparse",
+        action="store_true",
+        help="Sparse-check out only the published plugin(s), .claude-plugin and scripts",
+    )
+    parser.add_argument(
+        "--jobs", "-j",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Worker processes for scanning and sanitizing staging (0 = all CPUs, default: 1)",
+    )
+    parser.add_argument(
+        "--archive",
+        metavar="DIR",
+        help="Also write a reproducible archive of each published plugin (with a per-file hash manifest) to DIR",
+    )
+    parser.add_argument(
+        "--archive-format",
+        choices=["zip", "tar.gz"],
+        default="zip",
+        help="Archive format for --archive (default: zip)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Publish even if the plugin's files match what the marketplace already has",
+    )
 
     args = parser.parse_args()
-    plugin_path = Path(args.plugin_path)
+    if bool(args.plugin_path) == bool(args.batch):
+        parser.error("give either a plugin path or --batch PLUGIN_PATH ...")
+    plugin_paths = [Path(p) for p in (args.batch or [args.plugin_path])]
 
-    if not plugin_path.exists():
-        print(f"Error: Path not found: {plugin_path}", file=sys.stderr)
-        sys.exit(1)
+    for plugin_path in plugin_paths:
+        if not plugin_path.exists():
+            print(f"Error: Path not found: {plugin_path}", file=sys.stderr)
+            sys.exit(1)
 
-    if not plugin_path.is_dir():
-        print(f"Error: Not a directory: {plugin_path}", file=sys.stderr)
-        sys.exit(1)
+        if not plugin_path.is_dir():
+            print(f"Error: Not a directory: {plugin_path}", file=sys.stderr)
+            sys.exit(1)
 
-    success = publish(plugin_path, args.dry_run, args.version_bump, args.repo, use_staging=not args.no_stage)
+    options = dict(
+        use_staging=not args.no_stage, jobs=args.jobs, link_staging=not args.full_copy,
+        mirror=not args.fresh_clone, partial_clone=args.partial_clone, sparse=args.sparse,
+        force=args.force, archive_dir=Path(args.archive) if args.archive else None,
+        archive_format=args.archive_format,
+    )
+    if args.batch:
+        success = publish_batch(plugin_paths, args.dry_run, args.version_bump, args.repo, **options)
+    else:
+        success = publish(plugin_paths[0], args.dry_run, args.version_bump, args.repo, **options)
     sys.exit(0 if success else 1)
 
 
@@ -0,0 +1,115 @@
+"""
+plugin_archive.py pack / verify / extract tests
+"""
+
+import hashlib
+import json
+import os
+import stat
+import sys
+import zipfile
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import plugin_archive
+
+
+def write_zip(path, members):
+    """Hand-built archive: members are (name, 'file', bytes) or (name, 'symlink', target)."""
+    files = []
+    for name, kind, data in members:
+        if kind == 'symlink':
+            files.append({'path': name, 'type': 'symlink', 'target': data})
+        else:
+            files.append({'path': name, 'type': 'file', 'sha256': hashlib.sha256(data).hexdigest(),
+                          'size': len(data), 'mode': 0o644})
+    manifest = {'manifest_version': 1, 'name': 'evil', 'version': None, 'files': files}
+    with zipfile.ZipFile(path, 'w') as zf:
+        zf.writestr(plugin_archive.MANIFEST_NAME, json.dumps(manifest))
+        for name, kind, data in members:
+            zinfo = zipfile.ZipInfo(name)
+            zinfo.create_system = 3
+            if kind == 'symlink':
+                zinfo.external_attr = (stat.S_IFLNK | 0o777) << 16
+                zf.writestr(zinfo, data)
+            else:
+                zinfo.external_attr = (stat.S_IFREG | 0o644) << 16
+                zf.writestr(zinfo, data)
+
+
+@pytest.fixture
+def plugin(tmp_path):
+    root = tmp_path / 'my-plugin'
+    (root / '.claude-plugin').mkdir(parents=True)
+    (root / '.claude-plugin' / 'plugin.json').write_text('{"name": "my-plugin", "version": "1.2.0"}')
+    (root / 'scripts').mkdir()
+    (root / 'scripts' / 'run.sh').write_text('#!/bin/sh\necho hi\n')
+    os.chmod(root / 'scripts' / 'run.sh', 0o755)
+    os.symlink('scripts/run.sh', root / 'run')
+    return root
+
+
+class TestRoundTrip:
+    @pytest.mark.parametrize('fmt', plugin_archive.FORMATS)
+    def test_pack_is_reproducible(self, plugin, tmp_path, fmt):
+        first, second = tmp_path / f'a.{fmt}', tmp_path / f'b.{fmt}'
+        plugin_archive.pack(plugin, first, fmt)
+        os.utime(plugin / 'scripts' / 'run.sh', (0, 0))
+        plugin_archive.pack(plugin, second, fmt)
+        assert first.read_bytes() == second.read_bytes()
+
+    @pytest.mark.parametrize('fmt', plugin_archive.FORMATS)
+    def test_extract(self, plugin, tmp_path, fmt):
+        archive = tmp_path / f'my-plugin.{fmt}'
+        plugin_archive.pack(plugin, archive, fmt)
+        manifest, errors = plugin_archive.verify(archive, tmp_path / 'out')
+        assert errors == []
+        assert manifest['version'] == '1.2.0'
+        assert os.readlink(tmp_path / 'out' / 'run') == 'scripts/run.sh'
+        assert os.access(tmp_path / 'out' / 'scripts' / 'run.sh', os.X_OK)
+
+
+class TestUnsafeArchives:
+    def test_chained_symlinks_escape(self, tmp_path):
+        # sub/l2 and l1 resolve to dest itself; l3 -> l1/.. is one level above it
+        archive = tmp_path / 'evil.zip'
+        write_zip(archive, [
+            ('l1', 'symlink', 'sub/l2'),
+            ('l3', 'symlink', 'l1/..'),
+            ('l3/evil.txt', 'file', b'pwned'),
+            ('sub/l2', 'symlink', '..'),
+        ])
+        dest = tmp_path / 'out' / 'dest'
+
+        _, errors = plugin_archive.verify(archive)
+        assert [e for e in errors if 'symlink points outside' in e] == [
+            'l3: symlink points outside the plugin (l1/..)',
+        ]
+        assert any('l3/evil.txt: path goes through symlink l3' in e for e in errors)
+
+        _, errors = plugin_archive.verify(archive, dest)
+        assert errors
+        assert not (tmp_path / 'out' / 'evil.txt').exists()
+        assert not any(p.name == 'evil.txt' for p in tmp_path.rglob('*'))
+
+    def test_existing_symlink_in_dest(self, tmp_path):
+        archive = tmp_path / 'plain.zip'
+        write_zip(archive, [('docs/readme.md', 'file', b'hello')])
+        dest = tmp_path / 'dest'
+        dest.mkdir()
+        (tmp_path / 'elsewhere').mkdir()
+        os.symlink(tmp_path / 'elsewhere', dest / 'docs')
+
+        _, errors = plugin_archive.verify(archive, dest)
+        assert any('would be written outside' in e for e in errors)
+        assert not (tmp_path / 'elsewhere' / 'readme.md').exists()
+
+    def test_dotdot_path(self, tmp_path):
+        archive = tmp_path / 'dotdot.zip'
+        write_zip(archive, [('../evil.txt', 'file', b'pwned')])
+        _, errors = plugin_archive.verify(archive, tmp_path / 'dest')
+        assert any('unsafe path' in e for e in errors)
+        assert not (tmp_path / 'evil.txt').exists()
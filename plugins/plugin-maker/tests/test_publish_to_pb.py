@@ -0,0 +1,54 @@
+"""
+publish_to_pb.py sanitization tests
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import publish_to_pb
+
+
+class TestUserPathSanitize:
+    def test_windows_path(self):
+        actions = []
+        content = publish_to_pb.sanitize_text('cfg = r"C:\\Users\\alice\\.claude\\settings.json"\n', 'a.py', actions)
+        assert content == 'cfg = r"${HOME}\\.claude\\settings.json"\n'
+        assert actions == [{
+            'file': 'a.py',
+            'type': 'path',
+            'original': 'C:\\Users\\alice\\',
+            'replacement': '${HOME}\\',
+        }]
+
+    def test_posix_paths(self):
+        actions = []
+        content = publish_to_pb.sanitize_text('/Users/alice/.claude/x\n/home/bob/.config/y\n', 'a.md', actions)
+        assert content == '${HOME}/.claude/x\n${HOME}/.config/y\n'
+        assert [a['replacement'] for a in actions] == ['${HOME}/', '${HOME}/']
+
+    def test_windows_path_in_file(self, tmp_path):
+        (tmp_path / 'run.ps1').write_text('cd C:\\Users\\alice\\work\n', encoding='utf-8')
+        actions = publish_to_pb.sanitize_file(tmp_path / 'run.ps1', tmp_path)
+        assert [a['type'] for a in actions] == ['path']
+        assert (tmp_path / 'run.ps1').read_text(encoding='utf-8') == 'cd ${HOME}\\work\n'
+
+
+class TestStagingCopy:
+    def test_staged_outside_source(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(publish_to_pb, 'STAGING_CACHE_DIR', tmp_path / 'cache')
+        source = tmp_path / 'my-plugin'
+        (source / 'assets').mkdir(parents=True)
+        (source / 'README.md').write_text('# my-plugin\n')
+        (source / 'assets' / 'logo.png').write_bytes(b'\x89PNG')
+
+        staging = publish_to_pb.create_staging_copy(source)
+
+        assert staging.is_relative_to(tmp_path / 'cache')
+        assert sorted(p.name for p in source.iterdir()) == ['README.md', 'assets']
+        # Files the sanitizer may rewrite never share an inode with the source
+        assert not (staging / 'README.md').samefile(source / 'README.md')
+        (source / 'README.md').write_text('# changed\n')
+        assert (staging / 'README.md').read_text() == '# my-plugin\n'
+        assert (staging / 'assets' / 'logo.png').read_bytes() == b'\x89PNG'